@@ -0,0 +1,302 @@
+import sys
+
+from array import array
+
+from collections.abc import Iterable, Iterator
+
+from typing import NamedTuple
+
+
+#: Types d'événements d'un match : touche, touche de pénalité, coup double, annulation et fin de période
+EVENT_KINDS: tuple[str, ...] = ("touch", "penalty", "double", "annulment", "period")
+#: Types d'événements qui donnent des touches
+SCORING_KINDS: frozenset[str] = frozenset(("touch", "penalty", "double"))
+
+#: Bits du côté, ``1`` ou ``2``, ou ``0`` pour les deux côtés
+SIDE_BITS: int = 2
+#: Bits du type d'événement
+KIND_BITS: int = 3
+#: Décalage de l'instant de l'événement
+TIME_SHIFT: int = SIDE_BITS + KIND_BITS
+#: Instant maximal d'un événement, en dixièmes de seconde depuis le début du match
+MAX_TIME: int = (1 << (32 - TIME_SHIFT)) - 1
+
+
+class BoutEvent(NamedTuple):
+    """
+    Événement d'un match.
+
+    :param float time: Instant de l'événement, en secondes depuis le début du match, au dixième de seconde.
+    :param int side: Côté concerné, ``1`` ou ``2``, ou ``0`` pour les deux côtés.
+    :param str kind: Type d'événement, parmi `EVENT_KINDS`.
+    """
+    #: Instant de l'événement, en secondes depuis le début du match, au dixième de seconde
+    time: float
+    #: Côté concerné, ``1`` ou ``2``, ou ``0`` pour les deux côtés
+    side: int
+    #: Type d'événement, parmi `EVENT_KINDS`
+    kind: str
+
+
+def encode_event(time: float, side: int, kind: str) -> int:
+    """
+    Encode un événement dans un entier de 32 bits : instant en dixièmes de seconde, type et côté.
+
+    :param time: Instant de l'événement, en secondes depuis le début du match.
+    :param side: Côté concerné, ``1`` ou ``2``, ou ``0`` pour les deux côtés.
+    :param kind: Type d'événement, parmi `EVENT_KINDS`.
+    :return: Événement encodé.
+    """
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"Le paramètre `kind` doit être parmi `{EVENT_KINDS}`.")
+    if (side not in (0, 1, 2)) or ((side == 0) != (kind in ("double", "period"))):
+        raise ValueError("Le paramètre `side` doit être `1` ou `2`, ou `0` pour un coup double ou une fin de période.")
+    tenths: int = round(time * 10)
+    if not 0 <= tenths <= MAX_TIME:
+        raise ValueError(f"Le paramètre `time` doit être compris entre `0` et `{MAX_TIME / 10}`.")
+    return (tenths << TIME_SHIFT) | (EVENT_KINDS.index(kind) << SIDE_BITS) | side
+
+
+def decode_event(word: int) -> BoutEvent:
+    """
+    Décode un événement.
+
+    :param word: Événement encodé.
+    :return: Événement.
+    """
+    side: int = word & ((1 << SIDE_BITS) - 1)
+    kind_index: int = (word >> SIDE_BITS) & ((1 << KIND_BITS) - 1)
+    if kind_index >= len(EVENT_KINDS):
+        raise ValueError(f"Type d'événement `{kind_index}` inconnu dans l'événement encodé `{word:#010x}`.")
+    kind: str = EVENT_KINDS[kind_index]
+    if (side == 3) or ((side == 0) != (kind in ("double", "period"))):
+        raise ValueError(f"Côté `{side}` incohérent avec le type `{kind}` dans l'événement encodé `{word:#010x}`.")
+    return BoutEvent((word >> TIME_SHIFT) / 10, side, kind)
+
+
+class BoutLog:
+    """
+    Classe représentant le déroulé d'un match, touche par touche.
+
+    Chaque événement tient dans un entier de 32 bits d'un tableau : quatre octets par touche, pour garder les matchs
+    d'une saison en mémoire. Les statistiques du match sont tenues à jour à chaque événement, sans relire le déroulé,
+    sauf après l'annulation d'une touche, rare, qui rejoue le déroulé sans elle.
+
+    :param Iterable[BoutEvent] events: Événements du match, dans l'ordre.
+    """
+    # Un déroulé par match : attributs fixes, sans dictionnaire par instance
+    __slots__ = ("_events", "_touches", "_periods", "_streak_side", "_streak", "_longest_streaks", "_leader",
+                 "_lead_changes", "_largest_leads")
+
+    #: Événements encodés
+    _events: array
+    #: Touches de chaque côté
+    _touches: list[int]
+    #: Touches de chaque côté à la fin de chaque période terminée
+    _periods: tuple[tuple[int, int], ...]
+    #: Côté de la série de touches en cours, ou ``0``
+    _streak_side: int
+    #: Longueur de la série de touches en cours
+    _streak: int
+    #: Plus longue série de touches de chaque côté
+    _longest_streaks: list[int]
+    #: Dernier côté à avoir mené, ou ``0``
+    _leader: int
+    #: Nombre de changements de meneur
+    _lead_changes: int
+    #: Plus grand écart en faveur de chaque côté
+    _largest_leads: list[int]
+
+    def __init__(self, events: Iterable[BoutEvent] = ()) -> None:
+        """
+        Initialise un nouveau déroulé.
+        """
+        self._events = array("I")
+        self._reset()
+        for event in events:
+            self.record(*event)
+
+    @classmethod
+    def from_bytes(cls, content: bytes) -> "BoutLog":
+        """
+        Reconstruit un déroulé encodé par `to_bytes`.
+
+        :param content: Événements encodés, en petit-boutiste.
+        :return: Déroulé.
+        """
+        events: array = array("I")
+        if len(content) % events.itemsize:
+            raise ValueError(f"Le paramètre `content` doit contenir des événements de {events.itemsize} octets.")
+        events.frombytes(content)
+        if sys.byteorder != "little":
+            events.byteswap()
+        log: BoutLog = cls()
+        log._events = events
+        log._replay()
+        return log
+
+    @property
+    def touches(self) -> tuple[int, int]:
+        return self._touches[0], self._touches[1]
+
+    @property
+    def periods(self) -> list[tuple[int, int]]:
+        """
+        Touches de chaque côté pendant chaque période, la dernière étant en cours.
+        """
+        periods: list[tuple[int, int]] = list()
+        previous: tuple[int, int] = (0, 0)
+        for end in self._periods + (self.touches,):
+            periods.append((end[0] - previous[0], end[1] - previous[1]))
+            previous = end
+        return periods
+
+    @property
+    def longest_streaks(self) -> tuple[int, int]:
+        return self._longest_streaks[0], self._longest_streaks[1]
+
+    @property
+    def lead_changes(self) -> int:
+        return self._lead_changes
+
+    @property
+    def largest_leads(self) -> tuple[int, int]:
+        """
+        Plus grand écart en faveur de chaque côté : celui du perdant mesure la remontée du vainqueur.
+        """
+        return self._largest_leads[0], self._largest_leads[1]
+
+    @property
+    def duration(self) -> float:
+        """
+        Instant du dernier événement, en secondes.
+        """
+        return (self._events[-1] >> TIME_SHIFT) / 10 if self._events else 0.0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[BoutEvent]:
+        return map(decode_event, self._events)
+
+    def __getitem__(self, index: int) -> BoutEvent:
+        return decode_event(self._events[index])
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self._events.__sizeof__()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(events={len(self._events)}, touches={self.touches}, "\
+               f"longest_streaks={self.longest_streaks}, lead_changes={self._lead_changes})"
+
+    def record(self, time: float, side: int, kind: str = "touch") -> None:
+        """
+        Ajoute un événement au déroulé et met à jour les statistiques.
+
+        :param time: Instant de l'événement, en secondes depuis le début du match.
+        :param side: Côté concerné, ``1`` ou ``2``, ou ``0`` pour un coup double ou une fin de période.
+        :param kind: Type d'événement, parmi `EVENT_KINDS`.
+        """
+        word: int = encode_event(time, side, kind)
+        if (kind == "annulment") and (self._touches[side - 1] == 0):
+            raise ValueError(f"Aucune touche à annuler du côté `{side}`.")
+        self._events.append(word)
+        if kind == "annulment":
+            self._replay()
+        else:
+            self._apply(side, kind)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode le déroulé : quatre octets par événement, en petit-boutiste.
+
+        :return: Événements encodés.
+        """
+        if sys.byteorder == "little":
+            return self._events.tobytes()
+        events: array = array("I", self._events)
+        events.byteswap()
+        return events.tobytes()
+
+    # Statistiques
+
+    def _reset(self) -> None:
+        """
+        Remet à zéro les statistiques.
+        """
+        self._touches = [0, 0]
+        self._periods = ()
+        self._streak_side = 0
+        self._streak = 0
+        self._longest_streaks = [0, 0]
+        self._leader = 0
+        self._lead_changes = 0
+        self._largest_leads = [0, 0]
+
+    def _apply(self, side: int, kind: str) -> None:
+        """
+        Met à jour les statistiques après un événement, hors annulation.
+        """
+        # Fin de période
+        if kind == "period":
+            self._periods += (self.touches,)
+            return
+
+        # Coup double : une touche de chaque côté, qui interrompt les séries
+        if kind == "double":
+            self._touches[0] += 1
+            self._touches[1] += 1
+            self._streak_side = 0
+            self._streak = 0
+            return
+
+        # Touche
+        self._touches[side - 1] += 1
+        if self._streak_side == side:
+            self._streak += 1
+        else:
+            self._streak_side = side
+            self._streak = 1
+        self._longest_streaks[side - 1] = max(self._longest_streaks[side - 1], self._streak)
+
+        # Meneur et écart
+        lead: int = self._touches[side - 1] - self._touches[2 - side]
+        if lead > 0:
+            if self._leader not in (0, side):
+                self._lead_changes += 1
+            self._leader = side
+            self._largest_leads[side - 1] = max(self._largest_leads[side - 1], lead)
+
+    def _replay(self) -> None:
+        """
+        Recalcule les statistiques en rejouant le déroulé, chaque annulation retirant la dernière touche de son côté.
+
+        L'annulation d'un coup double d'un seul côté n'en retire que la touche de ce côté : il reste une touche de
+        l'autre côté, comme sur le score affiché par l'appareil.
+        """
+        # Touches annulées, par côté : les coups doubles figurent dans les deux piles
+        scoring: tuple[list[int], list[int]] = (list(), list())
+        annulled: tuple[set[int], set[int]] = (set(), set())
+        for i, event in enumerate(self):
+            if event.kind == "double":
+                scoring[0].append(i)
+                scoring[1].append(i)
+            elif event.kind in SCORING_KINDS:
+                scoring[event.side - 1].append(i)
+            elif event.kind == "annulment":
+                if not scoring[event.side - 1]:
+                    raise ValueError(f"Aucune touche à annuler du côté `{event.side}`.")
+                annulled[event.side - 1].add(scoring[event.side - 1].pop())
+
+        self._reset()
+        for i, event in enumerate(self):
+            if event.kind == "annulment":
+                continue
+            sides: list[int] = [side for side in (1, 2) if i not in annulled[side - 1]]
+            if event.kind != "double":
+                if (event.kind == "period") or (event.side in sides):
+                    self._apply(event.side, event.kind)
+            elif len(sides) == 2:
+                self._apply(0, "double")
+            elif sides:
+                self._apply(sides[0], "touch")
@@ -1,19 +1,46 @@
+from assault.boutlog import BoutLog
 from assault.score import Score
 
 from competition.fencer import Fencer
 from competition.team import Team
 
 
+class MatchConflictError(Exception):
+    """
+    Exception levée lorsqu'un résultat est soumis pour une version périmée d'un match.
+
+    :param Match match: Match concerné.
+    :param int expected: Version du match connue de l'auteur du résultat.
+    """
+    #: Match concerné
+    match: "Match"
+    #: Version du match connue de l'auteur du résultat
+    expected: int
+    #: Version actuelle du match
+    actual: int
+
+    def __init__(self, match: "Match", expected: int) -> None:
+        super().__init__(f"Le match a été modifié depuis la version `{expected}` (version actuelle `{match.version}`).")
+        self.match = match
+        self.expected = expected
+        self.actual = match.version
+
+
 class Match:
     """
     Classe représentant un match.
 
+    Chaque modification des scores ou de la validation incrémente la version du match, qui permet de soumettre un
+    résultat par comparaison et échange : voir `Tournament.submit_result`. Le déroulé touche par touche éventuel, reçu
+    des appareils de signalisation, n'intervient pas dans le résultat.
+
     :param int max_score: Score maximum du match.
     :param bool draw_is_allowed: Autorisation du match nul.
     :param Fencer|Team|None participant1: Premier.ère tireur/équipe du match.
     :param Score|None score1: Score du premier.ère tireur/équipe.
     :param Fencer|Team|None participant2: Second.e tireur/équipe du match.
     :param Score|None score2: Score du second.e tireur/équipe.
+    :param bool is_validated: Validation du match, dont le résultat est déjà appliqué aux tireurs/équipes.
     """
     #: Score maximum du match
     _max_score: int
@@ -27,10 +54,17 @@ class Match:
     _participant2: Fencer | Team | None
     #: Score du second.e tireur/équipe
     _score2: Score | None
+    #: Validation du match
+    _is_validated: bool
+    #: Version du match, incrémentée à chaque modification des scores ou de la validation
+    _version: int
+    #: Déroulé du match, touche par touche, s'il a été enregistré
+    _log: BoutLog | None
 
     def __init__(self, max_score: int, draw_is_allowed: bool, *,
                  participant1: Fencer | Team | None = None, score1: Score | None = None,
-                 participant2: Fencer | Team | None = None, score2: Score | None = None) -> None:
+                 participant2: Fencer | Team | None = None, score2: Score | None = None,
+                 is_validated: bool = False) -> None:
         """
         Initialise un nouveau match.
         """
@@ -52,6 +86,13 @@ class Match:
         self._participant2: Fencer | Team | None = participant2
         self._score2: Score | None = score2
 
+        # Validation
+        self._is_validated = is_validated
+        self._version = 0
+
+        # Déroulé
+        self._log = None
+
     @property
     def participant1(self) -> Fencer | Team | None:
         return self._participant1
@@ -71,6 +112,7 @@ class Match:
     @score1.setter
     def score1(self, new_score: Score | None) -> None:
         self._score1 = new_score
+        self._version += 1
 
     @property
     def participant2(self) -> Fencer | Team | None:
@@ -91,6 +133,23 @@ class Match:
     @score2.setter
     def score2(self, new_score: Score | None) -> None:
         self._score2 = new_score
+        self._version += 1
+
+    @property
+    def is_validated(self) -> bool:
+        return self._is_validated
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def log(self) -> BoutLog | None:
+        return self._log
+
+    @log.setter
+    def log(self, new_log: BoutLog | None) -> None:
+        self._log = new_log
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(max_score={self._max_score}, draw_is_allowed={self._draw_is_allowed}, "\
@@ -117,3 +176,14 @@ class Match:
                                        self_touches=self._score2.touches, opponent_touches=self._score1.touches)
             elif self._score1 == self._score2:
                 self._participant1.draw(self._participant2, touches=self._score1.touches)
+
+        # Validation
+        self._is_validated = True
+        self._version += 1
+
+    def invalidate(self) -> None:
+        """
+        Annule la validation du match, sans modifier les tireurs/équipes.
+        """
+        self._is_validated = False
+        self._version += 1
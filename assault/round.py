@@ -1,4 +1,7 @@
 from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+from typing import Any
 
 from itertools import combinations
 
@@ -19,6 +22,7 @@ class Round:
     :param int max_score: Score maximum des matchs.
     :param bool draw_is_allowed: Autorisation du match nul.
     :param set[Fencer]|set[Team] participants: Tireurs/Équipes de la ronde.
+    :param list[Match]|None matches: Matchs de la ronde, s'ils sont déjà appariés.
     """
     #: Numéro de la ronde
     _number: int
@@ -28,9 +32,12 @@ class Round:
     _draw_is_allowed: bool
     #: Tireurs/Équipes de la ronde.
     _participants: set[Fencer] | set[Team]
+    #: Matchs de la ronde
+    _matches: list[Match] | None
 
     def __init__(self, number: int, max_score: int, draw_is_allowed: bool,
-                 participants: set[Fencer] | set[Team]) -> None:
+                 participants: set[Fencer] | set[Team], *,
+                 matches: list[Match] | None = None) -> None:
         """
         Initialise une nouvelle ronde.
         """
@@ -48,6 +55,21 @@ class Round:
         # Tireurs/Équipes
         self._participants = participants
 
+        # Matchs
+        self._matches = matches
+
+    @property
+    def number(self) -> int:
+        return self._number
+
+    @property
+    def max_score(self) -> int:
+        return self._max_score
+
+    @property
+    def draw_is_allowed(self) -> bool:
+        return self._draw_is_allowed
+
     @property
     def participants(self) -> set[Fencer] | set[Team]:
         return self._participants
@@ -56,90 +78,142 @@ class Round:
     def participants(self, new_participants: set[Fencer] | set[Team]) -> None:
         self._participants = new_participants
 
+    @property
+    def is_paired(self) -> bool:
+        """
+        Appariement de la ronde.
+        """
+        return self._matches is not None
+
     @property
     def matches(self) -> list[Match]:
         """
-        Matchs de la ronde
+        Matchs de la ronde, appariés au premier accès.
         """
+        if self._matches is None:
+            self._matches = self._pair()
+        return self._matches
 
-        def matching(participants: defaultdict[float, list[Fencer]] | defaultdict[float, list[Team]]) -> tuple[set[tuple[Fencer, Fencer]] | set[tuple[Team, Team]], bool]:
-            """
-            ...
-
-            :param participants: ...
-            :return: ...
-            """
-            pairs: set[tuple[Fencer, Fencer, float]] | set[tuple[Team, Team, float]] = set()
-            half: int = len(participants) // 2
-            for (i, participant1), (j, participant2) in combinations(enumerate(participants), 2):
-                if (participant2 not in participant1.opponents_encountered) and (participant1 not in participant2.opponents_encountered):
-                    distance: int = abs(i - j - half)
-                    if (i < half <= j) or (i >= half > j):
-                        weight: float = 1 / (distance + 1) + 1.0
-                    else:
-                        weight: float = 1 / (distance + 1)
-                    pairs.add((participant1, participant2, weight))
-            pairing: set[tuple[Fencer, Fencer]] | set[tuple[Team, Team]] = max_weighted_matching(participants, pairs)
-            return pairing, len(pairing) == half
-
-        # Classement
-        sorted_participants: list[Fencer] | list[Team] = sorted(self._participants, reverse=True)
-
-        # Participant exempté
-        exempted: Fencer | Team | None = None
-        if len(sorted_participants) % 2 != 0:
-            for i, participant in reversed_enumerate(sorted_participants):
-                if not participant.has_been_exempted:
-                    exempted = sorted_participants.pop(i)
-
-        # Groupement
-        groups: defaultdict[float, list[Fencer]] | defaultdict[float, list[Team]] = defaultdict(list)
-        for participant in sorted_participants:
-            groups[participant.victories].append(participant)
-
-        # Regroupement
-        victories: list[float] = sorted(groups.keys(), reverse=True)
-        for i, victory in enumerate(victories):
-            group: list[Fencer] | list[Team] = groups[victory]
-            if len(group) % 2 != 0:
-                groups[victories[i + 1]].insert(0, group.pop())
-        # TODO : régler les problèmes potentiels
-
-        # Appariement
-        dict_couples: dict[list[float], set[tuple[Fencer, Fencer]]] | dict[list[float], set[tuple[Team, Team]]] = dict()
-        wins: list[float] = list()
-        group: list[Fencer] | list[Team] = list()
-        coupling_is_total: bool = True
-        for victory in victories:
-            wins.append(victory)
-            group.extend(groups[victory])
-            coupling_group: set[tuple[Fencer, Fencer]] | set[tuple[Team, Team]]
-            coupling_group, coupling_is_total = matching(group)
-            if coupling_is_total:
-                dict_couples[wins] = coupling_group
-                wins = list()
-                group = list()
-
-        # Ré-appariement
-        if not coupling_is_total:
-            for list_victory in sorted_iterate(dict_couples.keys()):
-                dict_couples.pop(list_victory)
-                wins.extend(list_victory)
-                for victory in list_victory:
-                    group.extend(groups[victory])
-                coupling_group, coupling_is_total = matching(group)
-                if coupling_is_total:
-                    dict_couples[wins] = coupling_group
-                    break
+    def _pair(self) -> list[Match]:
+        """
+        Apparie les tireurs/équipes de la ronde.
 
-        # Matchs
-        matches: list[Match] = list()
-        for couples in dict_couples.values():
-            for couple in couples:
-                matches.append(Match(self._max_score, self._draw_is_allowed,
-                                     participant1=couple[0], participant2=couple[1]))
+        :return: Matchs de la ronde.
+        """
+        couples, exempted = pair(self._participants, lambda participant: participant.opponents_encountered)
+        matches: list[Match] = [Match(self._max_score, self._draw_is_allowed,
+                                      participant1=couple[0], participant2=couple[1])
+                                for couple in couples]
         if exempted:
             matches.append(Match(self._max_score, self._draw_is_allowed,
                                  participant1=exempted))
 
         return matches
+
+
+def pair(participants: Iterable, opponents: Callable[[Any], Iterable]) -> tuple[list[tuple[Any, Any]], Any | None]:
+    """
+    Apparie des tireurs/équipes par groupes de victoires, sans rematch, en exemptant au plus un.e tireur/équipe qui ne
+    l'a pas encore été.
+
+    Les tireurs/équipes sont des `Fencer`, des `Team` ou leurs instantanés : seuls leurs attributs ``victories``,
+    ``score`` et ``has_been_exempted`` sont lus, si bien que l'appariement peut se faire hors du fil de la compétition.
+
+    :param participants: Tireurs/Équipes à apparier.
+    :param opponents: Adversaires déjà rencontré.e.s d'un.e tireur/équipe, parmi les objets de `participants` ; les
+        autres sont ignoré.e.s.
+    :return: Couples de tireurs/équipes, et tireur/équipe exempté.e, ou `None`.
+    """
+
+    def matching(participants: list) -> tuple[list[tuple[Any, Any]], bool]:
+        """
+        Apparie un groupe de tireurs/équipes classé.e.s, le premier de la moitié haute contre le premier de la moitié
+        basse, en évitant les rematchs.
+
+        :param participants: Tireurs/Équipes du groupe, dans l'ordre du classement.
+        :return: Couples de tireurs/équipes, et appariement de tout le groupe.
+        """
+        half: int = len(participants) // 2
+
+        # Rematchs, par couple de rangs : les tireurs/équipes sont identifié.e.s par leur identité, sans hachage
+        ranks_by_id: dict[int, int] = {id(participant): i for i, participant in enumerate(participants)}
+        rematches: set[tuple[int, int]] = set()
+        for i, participant in enumerate(participants):
+            for opponent in opponents(participant):
+                j: int | None = ranks_by_id.get(id(opponent))
+                if j is not None:
+                    rematches.add((min(i, j), max(i, j)))
+
+        # Appariement « plié » (premier de la moitié haute contre premier de la moitié basse, etc.) : seul
+        # appariement de poids maximal lorsqu'il ne contient aucun rematch, le graphe est alors inutile
+        if all((i, i + half) not in rematches for i in range(half)):
+            return [(participants[i], participants[i + half]) for i in range(half)], True
+
+        # Les sommets du graphe sont les rangs : l'égalité des tireurs/équipes porte sur leurs scores
+        pairs: set[tuple[int, int, float]] = set()
+        for i, j in combinations(range(len(participants)), 2):
+            if (i, j) not in rematches:
+                distance: int = abs(j - i - half)
+                if (i < half <= j) or (i >= half > j):
+                    weight: float = 1 / (distance + 1) + 1.0
+                else:
+                    weight: float = 1 / (distance + 1)
+                pairs.add((i, j, weight))
+        ranks: list[tuple[int, int]] = sorted((min(i, j), max(i, j))
+                                              for i, j in max_weighted_matching(range(len(participants)), pairs))
+        pairing: list[tuple[Fencer, Fencer]] | list[tuple[Team, Team]] = [(participants[i], participants[j])
+                                                                           for i, j in ranks]
+        return pairing, len(pairing) == half
+
+    # Classement
+    sorted_participants: list = sorted(participants, key=lambda participant: participant.score, reverse=True)
+
+    # Participant exempté
+    exempted: Any | None = None
+    if len(sorted_participants) % 2 != 0:
+        for i, participant in reversed_enumerate(sorted_participants):
+            if not participant.has_been_exempted:
+                exempted = sorted_participants.pop(i)
+                break
+
+    # Groupement
+    groups: defaultdict[float, list[Fencer]] | defaultdict[float, list[Team]] = defaultdict(list)
+    for participant in sorted_participants:
+        groups[participant.victories].append(participant)
+
+    # Regroupement
+    victories: list[float] = sorted(groups.keys(), reverse=True)
+    for i, victory in enumerate(victories):
+        group: list[Fencer] | list[Team] = groups[victory]
+        if len(group) % 2 != 0:
+            groups[victories[i + 1]].insert(0, group.pop())
+    # TODO : régler les problèmes potentiels
+
+    # Appariement
+    dict_couples: dict[tuple[float, ...], list[tuple[Fencer, Fencer]]] | dict[tuple[float, ...], list[tuple[Team, Team]]] = dict()
+    wins: list[float] = list()
+    group: list[Fencer] | list[Team] = list()
+    coupling_is_total: bool = True
+    for victory in victories:
+        wins.append(victory)
+        group.extend(groups[victory])
+        coupling_group: list[tuple[Fencer, Fencer]] | list[tuple[Team, Team]]
+        coupling_group, coupling_is_total = matching(group)
+        if coupling_is_total:
+            dict_couples[tuple(wins)] = coupling_group
+            wins = list()
+            group = list()
+
+    # Ré-appariement
+    if not coupling_is_total:
+        for list_victory in sorted_iterate(dict_couples.keys()):
+            dict_couples.pop(list_victory)
+            wins.extend(list_victory)
+            for victory in list_victory:
+                group.extend(groups[victory])
+            coupling_group, coupling_is_total = matching(group)
+            if coupling_is_total:
+                dict_couples[tuple(wins)] = coupling_group
+                break
+
+    return [couple for couples in dict_couples.values() for couple in couples], exempted
@@ -1,6 +1,12 @@
 import re
 from re import Pattern
 
+from collections.abc import Iterable
+
+
+#: Séparateurs des champs d'une ligne de feuille de scores
+SHEET_SEPARATORS: Pattern = re.compile(r"[\s;,/-]+")
+
 
 class Score:
     """
@@ -103,3 +109,83 @@ class Score:
         if self._touches == other_score._touches:
             return (self._status == other_score._status) or ((self._status, other_score._status) == ("V", "D"))
         return self._touches > other_score._touches
+
+
+def parse_bout(str_score1: str, str_score2: str) -> tuple[Score, Score]:
+    """
+    Interprète les scores d'un match et vérifie qu'ils désignent un vainqueur ou un match nul, et que les statuts
+    s'accordent avec les touches : à égalité de touches, ils désignent le vainqueur.
+
+    :param str_score1: Score du premier tireur/équipe.
+    :param str_score2: Score du second tireur/équipe.
+    :return: Scores du match.
+    """
+    scores: list[Score] = list()
+    for str_score in (str_score1.strip().upper(), str_score2.strip().upper()):
+        try:
+            scores.append(Score.from_str_score(str_score))
+        except ValueError:
+            raise ValueError(f"score `{str_score}` invalide" if str_score else "score manquant") from None
+    score1, score2 = scores
+    if score1.status == score2.status == "V":
+        raise ValueError(f"scores `{str_score1.strip()}` et `{str_score2.strip()}` : deux vainqueurs")
+    if score1.status == score2.status == "D":
+        raise ValueError(f"scores `{str_score1.strip()}` et `{str_score2.strip()}` : aucun vainqueur")
+    if not ((score1 > score2) or (score1 < score2) or (score1 == score2)):
+        raise ValueError(f"scores `{str_score1.strip()}` et `{str_score2.strip()}` incohérents")
+
+    # Statuts contraires aux touches : seul le score le plus haut peut être vainqueur, et le plus bas vaincu
+    if score1.touches != score2.touches:
+        winner, loser = (score1, score2) if score1.touches > score2.touches else (score2, score1)
+        if (winner.status not in (None, "V")) or (loser.status not in (None, "D")):
+            raise ValueError(f"scores `{str_score1.strip()}` et `{str_score2.strip()}` incohérents")
+    return score1, score2
+
+
+def parse_sheet(sheet: str | Iterable[str], tables: int) -> tuple[dict[int, tuple[Score, Score]], list[str]]:
+    """
+    Interprète la feuille de scores d'une ronde, en signalant toutes les erreurs.
+
+    Chaque ligne contient les deux scores d'un match, éventuellement précédés du numéro de table : une ligne sans
+    numéro correspond à la table suivant celle de la ligne précédente. Les lignes vides ou commençant par ``#`` sont
+    ignorées.
+
+    :param sheet: Feuille de scores, ou ses lignes.
+    :param tables: Nombre de tables de la ronde.
+    :return: Scores par numéro de table, à partir de ``1``, et erreurs par numéro de ligne.
+    """
+    lines: Iterable[str] = sheet.splitlines() if isinstance(sheet, str) else sheet
+    scores: dict[int, tuple[Score, Score]] = dict()
+    errors: list[str] = list()
+    table: int = 0
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if (not line) or line.startswith("#"):
+            continue
+        fields: list[str] = [field for field in SHEET_SEPARATORS.split(line) if field]
+
+        # Numéro de table
+        if len(fields) == 3:
+            number: str = fields.pop(0).rstrip(".:)")
+            if not number.isdecimal():
+                errors.append(f"Ligne {line_number} : numéro de table invalide `{number}`.")
+                continue
+            table = int(number)
+        elif len(fields) == 2:
+            table += 1
+        else:
+            errors.append(f"Ligne {line_number} : deux scores attendus.")
+            continue
+        if not 1 <= table <= tables:
+            errors.append(f"Ligne {line_number} : table `{table}` inexistante.")
+            continue
+        if table in scores:
+            errors.append(f"Ligne {line_number} : table `{table}` déjà saisie.")
+            continue
+
+        # Scores
+        try:
+            scores[table] = parse_bout(*fields)
+        except ValueError as error:
+            errors.append(f"Ligne {line_number} : {error}.")
+    return scores, errors
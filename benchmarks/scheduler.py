@@ -0,0 +1,130 @@
+"""
+Mesure de l'appariement simultané de plusieurs compétitions : l'une après l'autre dans un même interpréteur, puis en
+parallèle avec l'ordonnanceur, chaque compétition étant hébergée dans son propre processus.
+
+Les compétitions sont simulées dans un dossier temporaire, puis appariées sur plusieurs rondes, depuis la racine du
+projet ::
+
+    python benchmarks/scheduler.py --tournaments 12 --fencers 400 --rounds 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assault.score import Score  # noqa: E402
+
+from competition.fencer import Fencer  # noqa: E402
+from competition.tournament import Tournament  # noqa: E402
+
+from service.scheduler import TournamentScheduler  # noqa: E402
+
+from storage import autosave, tournamentfile  # noqa: E402
+
+
+def create(path: str, fencers: int, seed: int) -> None:
+    """
+    Crée le fichier d'une compétition simulée, sans ronde.
+
+    :param path: Chemin du fichier de compétition.
+    :param fencers: Nombre de tireurs.
+    :param seed: Graine des tireurs.
+    """
+    generator: random.Random = random.Random(seed)
+    tournament: Tournament = Tournament(f"Catégorie {seed}", "Épée", "Mixte", "Senior", "Individuelle", 15, True,
+                                        False)
+    tournament.add_participants(Fencer(f"TIREUR{i:05d}", "Simulé", generator.choice(("Masculin", "Féminin")),
+                                       generator.randint(15, 60), club=f"Club {i % 97}", licence=100000 + i)
+                                for i in range(fencers))
+    tournamentfile.save(tournament, path)
+
+
+def sheet(matches, generator: random.Random) -> list[tuple[int, str, str]]:
+    """
+    Résultats aléatoires d'une ronde.
+
+    :param matches: Instantanés des matchs de la ronde.
+    :param generator: Générateur aléatoire.
+    :return: Numéro de table et scores de chaque match, exemptions comprises.
+    """
+    results: list[tuple[int, str, str]] = list()
+    for table, match in enumerate(matches, start=1):
+        if match.participant2 is not None:
+            loser: str = str(generator.randrange(15))
+            results.append((table, "15", loser) if generator.random() < 0.5 else (table, loser, "15"))
+    return results
+
+
+def sequential(paths: list[str], rounds: int, seed: int) -> float:
+    """
+    Apparie les compétitions l'une après l'autre, dans cet interpréteur.
+
+    :return: Temps écoulé, en secondes.
+    """
+    generator: random.Random = random.Random(seed)
+    start: float = time.perf_counter()
+    tournaments: list[Tournament] = [autosave.recover(path) for path in paths]
+    for _ in range(rounds):
+        for tournament in tournaments:
+            tournament.new_round()
+            matches = tournament.snapshot.rounds[-1].matches
+            for table, score1, score2 in sheet(matches, generator):
+                match = tournament.rounds[-1].matches[table - 1]
+                tournament.submit_result(match, Score.from_str_score(score1), Score.from_str_score(score2),
+                                         version=match.version)
+            for match in tournament.rounds[-1].matches:
+                if not match.is_validated:
+                    tournament.validate_match(match)
+    return time.perf_counter() - start
+
+
+def parallel(paths: list[str], rounds: int, seed: int) -> float:
+    """
+    Apparie les compétitions en parallèle, chacune dans son processus.
+
+    :return: Temps écoulé, en secondes, démarrage des processus compris.
+    """
+    generator: random.Random = random.Random(seed)
+    start: float = time.perf_counter()
+    with TournamentScheduler() as scheduler:
+        for path in paths:
+            scheduler.open(os.path.basename(path), path)
+        for worker in scheduler.workers.values():
+            worker.ready.result()
+        for _ in range(rounds):
+            paired = {name: future.result() for name, future in scheduler.broadcast("pair").items()}
+            submissions = [scheduler[name].submit(table, score1, score2)
+                           for name, played_round in paired.items()
+                           for table, score1, score2 in sheet(played_round.matches, generator)]
+            for submission in submissions:
+                submission.result()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mesure de l'appariement simultané de plusieurs compétitions.")
+    parser.add_argument("--tournaments", type=int, default=12, help="nombre de compétitions (par défaut : 12)")
+    parser.add_argument("--fencers", type=int, default=400, help="tireurs par compétition (par défaut : 400)")
+    parser.add_argument("--rounds", type=int, default=3, help="nombre de rondes (par défaut : 3)")
+    parser.add_argument("--seed", type=int, default=0, help="graine des simulations")
+    arguments = parser.parse_args()
+    if arguments.tournaments <= 0:
+        parser.error("Le paramètre `--tournaments` doit être strictement supérieur à `0`.")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, run in (("L'une après l'autre", sequential), ("En parallèle", parallel)):
+            paths: list[str] = [os.path.join(directory, f"{mode[:2]}-{i:02d}.lft")
+                                for i in range(arguments.tournaments)]
+            for i, path in enumerate(paths):
+                create(path, arguments.fencers, arguments.seed + i)
+            print(f"{mode} : {run(paths, arguments.rounds, arguments.seed):.2f} s "
+                  f"({arguments.tournaments} compétitions, {arguments.fencers} tireurs, {arguments.rounds} rondes, "
+                  f"{os.cpu_count()} cœurs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Mesure du temps de démarrage de l'application : temps d'importation de chaque module, et temps d'affichage de la
+fenêtre principale.
+
+Chaque mesure est faite dans un nouvel interpréteur, lancé depuis la racine du projet ::
+
+    python benchmarks/startup.py --runs 5 --top 20
+    python benchmarks/startup.py --window
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from typing import NamedTuple
+
+
+#: Racine du projet
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: Modules lourds, qui ne doivent être chargés qu'à leur première utilisation
+HEAVY_MODULES: tuple[str, ...] = ("PIL", "networkx")
+
+#: Script d'affichage de la fenêtre principale, qui écrit le temps écoulé en secondes
+WINDOW_SCRIPT: str = """
+import time
+start = time.perf_counter()
+import main
+app = main.App()
+app.update()
+print(time.perf_counter() - start)
+app.destroy()
+"""
+
+
+class ImportTime(NamedTuple):
+    """
+    Temps d'importation d'un module, en microsecondes.
+
+    :param str module: Nom du module.
+    :param int self_time: Temps propre au module.
+    :param int cumulative: Temps cumulé avec les modules qu'il importe.
+    """
+    #: Nom du module
+    module: str
+    #: Temps propre au module
+    self_time: int
+    #: Temps cumulé avec les modules qu'il importe
+    cumulative: int
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """
+    Mesure le temps d'importation d'un module et de ses dépendances, avec ``-X importtime``.
+
+    :param module: Nom du module importé.
+    :return: Temps d'importation, dans l'ordre de fin d'importation.
+    """
+    process = subprocess.run((sys.executable, "-X", "importtime", "-c", f"import {module}"),
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+    times: list[ImportTime] = list()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields: list[str] = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdecimal():
+            continue
+        times.append(ImportTime(fields[2].strip(), int(fields[0]), int(fields[1])))
+    return times
+
+
+def window_time() -> float:
+    """
+    Mesure le temps d'affichage de la fenêtre principale, importations comprises.
+
+    :return: Temps écoulé, en secondes.
+    """
+    process = subprocess.run((sys.executable, "-c", WINDOW_SCRIPT),
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mesure du temps de démarrage de l'application.")
+    parser.add_argument("--module", default="main", help="module importé (par défaut : main)")
+    parser.add_argument("--runs", type=int, default=5, help="nombre de mesures, dont la médiane est conservée")
+    parser.add_argument("--top", type=int, default=15, help="nombre de modules les plus lents affichés")
+    parser.add_argument("--window", action="store_true", help="mesure aussi l'affichage de la fenêtre principale")
+    arguments = parser.parse_args()
+    if arguments.runs <= 0:
+        parser.error("Le paramètre `--runs` doit être strictement supérieur à `0`.")
+
+    # Temps d'importation, médians par module
+    runs: list[list[ImportTime]] = [import_times(arguments.module) for _ in range(arguments.runs)]
+    self_times: dict[str, list[int]] = dict()
+    cumulatives: dict[str, list[int]] = dict()
+    for times in runs:
+        for time in times:
+            self_times.setdefault(time.module, list()).append(time.self_time)
+            cumulatives.setdefault(time.module, list()).append(time.cumulative)
+    medians: list[ImportTime] = sorted((ImportTime(module, round(statistics.median(self_times[module])),
+                                                   round(statistics.median(cumulatives[module])))
+                                        for module in cumulatives),
+                                       key=lambda time: time.cumulative, reverse=True)
+
+    print(f"Importation de `{arguments.module}` : {statistics.median(cumulatives[arguments.module]) / 1000:.1f} ms "
+          f"(médiane de {arguments.runs} mesure(s), {len(medians)} modules)")
+    print(f"{'Module':<50} {'Propre (ms)':>12} {'Cumulé (ms)':>12}")
+    for time in medians[:arguments.top]:
+        print(f"{time.module:<50} {time.self_time / 1000:>12.1f} {time.cumulative / 1000:>12.1f}")
+
+    # Modules lourds chargés au démarrage
+    heavy: list[str] = sorted(module for module in cumulatives if module in HEAVY_MODULES)
+    if heavy:
+        print(f"Attention : modules lourds chargés au démarrage : {', '.join(heavy)}")
+
+    # Affichage de la fenêtre principale
+    if arguments.window:
+        try:
+            seconds: list[float] = [window_time() for _ in range(arguments.runs)]
+        except subprocess.CalledProcessError as error:
+            print(f"Impossible d'afficher la fenêtre principale :\n{error.stderr}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Affichage de la fenêtre principale : {statistics.median(seconds) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Gestion d'une compétition en ligne de commande, sans interface graphique.
+
+La compétition est conservée dans un fichier de compétition, lu puis réécrit par chaque commande ::
+
+    python cli.py create open.lft --name "Open" --weapon Épée --gender Mixte --category Senior
+    python cli.py register open.lft inscriptions.csv
+    python cli.py pair open.lft -o ronde1.csv
+    python cli.py results open.lft ronde1.txt
+    python cli.py serve open.lft --pistes 40 --site resultats --apparatus 8081
+    python cli.py standings open.lft -o classement.html
+    python cli.py simulate --fencers 1000 --rounds 15
+
+Une feuille de résultats contient une ligne par table : numéro de table éventuel, puis les deux scores du match.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from typing import TextIO
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score, parse_sheet
+
+from competition.events import EventBus
+from competition.fencer import Fencer
+from competition.tournament import Tournament
+
+from service.apparatus import ApparatusIngest
+from service.pistes import PisteService
+
+from storage import autosave, exporters, importer, tournamentfile
+from storage.livesite import LiveSite
+
+
+#: Nombre maximum d'erreurs affichées
+MAX_ERRORS: int = 20
+
+
+class CommandError(Exception):
+    """
+    Exception levée lorsqu'une commande ne peut pas être exécutée.
+    """
+
+
+def load(path: str) -> Tournament:
+    """
+    Charge une compétition, en rejouant son segment de journal s'il existe.
+
+    :param path: Chemin du fichier de compétition.
+    :return: Compétition.
+    """
+    try:
+        return autosave.recover(path)
+    except (OSError, ValueError) as error:
+        raise CommandError(f"Impossible d'ouvrir le fichier `{path}` : {error}") from None
+
+
+def save(tournament: Tournament, path: str) -> None:
+    """
+    Enregistre entièrement une compétition, ce qui rend son segment de journal inutile.
+
+    :param tournament: Compétition.
+    :param path: Chemin du fichier de compétition.
+    """
+    tournamentfile.save(tournament, path)
+    if os.path.exists(autosave.segment_path(path)):
+        os.remove(autosave.segment_path(path))
+
+
+def output_format(path: str | None, default: str) -> str:
+    """
+    Format d'un fichier de sortie, d'après son extension.
+
+    :param path: Chemin du fichier, ou `None` pour la sortie standard.
+    :param default: Format par défaut.
+    :return: Format parmi `exporters.FORMATS`.
+    """
+    if path is None:
+        return default
+    extension: str = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension not in exporters.FORMATS:
+        raise CommandError(f"Format de sortie `{extension}` inconnu, parmi `{sorted(exporters.FORMATS)}`.")
+    return extension
+
+
+def write_rows(rows, columns: dict[str, str], section: str, title: str, path: str | None, file_format: str) -> None:
+    """
+    Écrit des lignes dans un fichier, ou sur la sortie standard.
+
+    :param rows: Lignes à écrire.
+    :param columns: Colonnes, avec leur intitulé.
+    :param section: Identifiant de la section HTML.
+    :param title: Titre de la section HTML.
+    :param path: Chemin du fichier, ou `None` pour la sortie standard.
+    :param file_format: Format parmi `exporters.FORMATS`.
+    """
+
+    def write(file: TextIO) -> None:
+        if file_format == "csv":
+            exporters.write_csv(rows, columns, file)
+        elif file_format == "jsonl":
+            exporters.write_jsonl(rows, file)
+        else:
+            exporters.write_html(rows, columns, section, title, file)
+
+    if path is None:
+        write(sys.stdout)
+    else:
+        with tournamentfile.open_atomically(path, "w", encoding="utf-8", newline="") as file:
+            write(file)
+
+
+def report(errors: list, what: str) -> None:
+    """
+    Affiche des erreurs sur la sortie d'erreur.
+
+    :param errors: Erreurs.
+    :param what: Nature des erreurs, au pluriel.
+    """
+    print(f"{len(errors)} {what} :", file=sys.stderr)
+    for error in errors[:MAX_ERRORS]:
+        print(f"  {error}", file=sys.stderr)
+    if len(errors) > MAX_ERRORS:
+        print("  …", file=sys.stderr)
+
+
+# Commandes
+
+def command_create(arguments: argparse.Namespace) -> None:
+    if os.path.exists(arguments.file) and not arguments.force:
+        raise CommandError(f"Le fichier `{arguments.file}` existe déjà (--force pour le remplacer).")
+    try:
+        tournament: Tournament = Tournament(arguments.name, arguments.weapon, arguments.gender, arguments.category,
+                                            arguments.kind, arguments.score, arguments.licences, arguments.draws)
+    except ValueError as error:
+        raise CommandError(str(error)) from None
+    save(tournament, arguments.file)
+    print(f"Compétition `{tournament.name}` créée dans `{arguments.file}`.")
+
+
+def command_register(arguments: argparse.Namespace) -> None:
+    tournament: Tournament = load(arguments.file)
+    try:
+        added, errors = importer.import_registrations(arguments.registrations, tournament,
+                                                      encoding=arguments.encoding)
+    except (OSError, UnicodeDecodeError, ValueError) as error:
+        raise CommandError(f"Impossible d'importer le fichier `{arguments.registrations}` : {error}") from None
+    save(tournament, arguments.file)
+    print(f"{added} participant(s) inscrit(s), {len(tournament.participants)} au total.")
+    if errors:
+        report(errors, "ligne(s) ignorée(s)")
+
+
+def command_pair(arguments: argparse.Namespace) -> None:
+    tournament: Tournament = load(arguments.file)
+    try:
+        tournament.check_pairing()
+    except ValueError as error:
+        raise CommandError(str(error)) from None
+    file_format: str = output_format(arguments.output, "csv")
+    new_round: Round = tournament.new_round()
+    save(tournament, arguments.file)
+    write_rows(exporters.matches_rows(new_round), exporters.MATCHES_COLUMNS, f"round-{new_round.number:03d}",
+               f"Ronde {new_round.number}", arguments.output, file_format)
+
+
+def command_results(arguments: argparse.Namespace) -> None:
+    tournament: Tournament = load(arguments.file)
+    if not tournament.rounds:
+        raise CommandError("La compétition n'a aucune ronde appariée.")
+    played_round: Round = tournament.rounds[-1]
+    matches: list[Match] = played_round.matches
+
+    # Lecture de toute la feuille avant toute validation
+    try:
+        with open(arguments.sheet, "r", encoding="utf-8-sig") as file:
+            scores, errors = parse_sheet(file, len(matches))
+    except (OSError, UnicodeDecodeError) as error:
+        raise CommandError(f"Impossible de lire le fichier `{arguments.sheet}` : {error}") from None
+    for table, (score1, score2) in sorted(scores.items()):
+        try:
+            tournament.check_result(matches[table - 1], score1, score2)
+        except ValueError as error:
+            errors.append(f"Table {table} : {error}")
+    if errors:
+        report(errors, "erreur(s), aucun résultat enregistré")
+        raise CommandError("Feuille de résultats invalide.")
+
+    # Validation, exemptions comprises
+    for table, (score1, score2) in scores.items():
+        match = matches[table - 1]
+        match.score1, match.score2 = score1, score2
+        tournament.validate_match(match)
+    for match in matches:
+        if (not match.is_validated) and ((match.participant1 is None) or (match.participant2 is None)):
+            tournament.validate_match(match)
+    save(tournament, arguments.file)
+    remaining: int = sum(not match.is_validated for match in matches)
+    print(f"{len(scores)} résultat(s) enregistré(s) pour la ronde {played_round.number}, "
+          f"{remaining} match(s) restant(s).")
+
+
+def command_standings(arguments: argparse.Namespace) -> None:
+    tournament: Tournament = load(arguments.file)
+    write_rows(exporters.standings_rows(tournament.standings()), exporters.STANDINGS_COLUMNS, "standings",
+               "Classement", arguments.output, output_format(arguments.output, "csv"))
+
+
+def command_serve(arguments: argparse.Namespace) -> None:
+    tournament: Tournament = load(arguments.file)
+    service: PisteService = PisteService(tournament, pistes=arguments.pistes)
+    saver: autosave.Autosave = autosave.Autosave(tournament, arguments.file)
+    saver.start()
+    site: LiveSite | None = None
+    if arguments.site is not None:
+        site = LiveSite(EventBus(tournament), arguments.site)
+        site.start()
+
+    async def run() -> None:
+        server: asyncio.Server = await service.serve(arguments.host, arguments.port)
+        addresses: str = ", ".join(f"{address[0]}:{address[1]}" for address in
+                                   (socket.getsockname() for socket in server.sockets))
+        print(f"Service des pistes à l'écoute sur {addresses} ({arguments.pistes} pistes), Ctrl+C pour arrêter.")
+        if arguments.apparatus is not None:
+            ingest: ApparatusIngest = ApparatusIngest(tournament, pistes=arguments.pistes)
+            apparatus: asyncio.Server = await ingest.serve(arguments.host, arguments.apparatus)
+            print(f"Réception des appareils de signalisation sur le port "
+                  f"{apparatus.sockets[0].getsockname()[1]}.")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if site is not None:
+            site.stop(timeout=10)
+        saver.stop(timeout=10)
+    if saver.error is not None:
+        raise CommandError(f"Impossible d'enregistrer le fichier `{arguments.file}` : {saver.error}")
+
+
+def command_simulate(arguments: argparse.Namespace) -> None:
+    if arguments.fencers < 2:
+        raise CommandError("Le paramètre `--fencers` doit être supérieur ou égal à `2`.")
+    generator: random.Random = random.Random(arguments.seed)
+    start: float = time.perf_counter()
+
+    # Inscriptions
+    tournament: Tournament = Tournament("Simulation", "Épée", "Mixte", "Senior", "Individuelle", arguments.score,
+                                        True, False)
+    tournament.add_participants(Fencer(f"TIREUR{i:05d}", "Simulé", generator.choice(("Masculin", "Féminin")),
+                                       generator.randint(15, 60), club=f"Club {i % 97}", licence=100000 + i)
+                                for i in range(arguments.fencers))
+
+    # Rondes, avec des résultats aléatoires
+    pairing: float = 0.0
+    for _ in range(arguments.rounds):
+        round_start: float = time.perf_counter()
+        matches: list[Match] = tournament.new_round().matches
+        pairing += time.perf_counter() - round_start
+        for match in matches:
+            if match.participant2 is not None:
+                loser: int = generator.randrange(arguments.score)
+                if generator.random() < 0.5:
+                    match.score1, match.score2 = Score(arguments.score), Score(loser)
+                else:
+                    match.score1, match.score2 = Score(loser), Score(arguments.score)
+            tournament.validate_match(match)
+    standings = tournament.standings()
+    elapsed: float = time.perf_counter() - start
+
+    if arguments.output is not None:
+        save(tournament, arguments.output)
+    print(f"{arguments.fencers} tireurs, {arguments.rounds} rondes : {elapsed:.2f} s, dont {pairing:.2f} s "
+          f"d'appariement.")
+    for standing in standings[:arguments.top]:
+        print(f"{standing.rank:>5}  {exporters.display_name(standing.participant):<24} "
+              f"{standing.victories:>5g} {standing.indicator:>+5}")
+
+
+def parser() -> argparse.ArgumentParser:
+    """
+    Analyseur des arguments de la ligne de commande.
+
+    :return: Analyseur, une sous-commande par opération.
+    """
+    main_parser = argparse.ArgumentParser(description="Gestion d'une compétition en ligne de commande.")
+    commands = main_parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="crée une compétition")
+    create.add_argument("file", help="fichier de compétition")
+    create.add_argument("--name", required=True, help="nom de la compétition")
+    create.add_argument("--weapon", default="Épée", choices=("Fleuret", "Épée", "Sabre", "Laser", "Multi"))
+    create.add_argument("--gender", default="Mixte", choices=("Hommes", "Dames", "Mixte"))
+    create.add_argument("--category", default="Senior", help="catégorie de la compétition")
+    create.add_argument("--kind", default="Individuelle", choices=("Individuelle", "Équipe"))
+    create.add_argument("--score", type=int, default=15, help="score maximum des matchs")
+    create.add_argument("--licences", action="store_true", help="exige les licences des tireurs")
+    create.add_argument("--draws", action="store_true", help="autorise les matchs nuls")
+    create.add_argument("--force", action="store_true", help="remplace un fichier existant")
+    create.set_defaults(function=command_create)
+
+    register = commands.add_parser("register",
+                                   help="inscrit les participants d'un fichier CSV ou d'un export fédéral")
+    register.add_argument("file", help="fichier de compétition")
+    register.add_argument("registrations", help="fichier d'inscriptions")
+    register.add_argument("--encoding", help="encodage du fichier d'inscriptions, détecté par défaut")
+    register.set_defaults(function=command_register)
+
+    pair = commands.add_parser("pair", help="apparie une nouvelle ronde")
+    pair.add_argument("file", help="fichier de compétition")
+    pair.add_argument("-o", "--output",
+                      help="fichier des appariements (.csv, .jsonl ou .html), sinon la sortie standard")
+    pair.set_defaults(function=command_pair)
+
+    results = commands.add_parser("results", help="valide les résultats de la dernière ronde")
+    results.add_argument("file", help="fichier de compétition")
+    results.add_argument("sheet", help="feuille de résultats : [table] score1 score2, une ligne par table")
+    results.set_defaults(function=command_results)
+
+    standings = commands.add_parser("standings", help="écrit le classement")
+    standings.add_argument("file", help="fichier de compétition")
+    standings.add_argument("-o", "--output",
+                           help="fichier du classement (.csv, .jsonl ou .html), sinon la sortie standard")
+    standings.set_defaults(function=command_standings)
+
+    serve = commands.add_parser("serve", help="démarre le service HTTP de saisie des scores depuis les pistes")
+    serve.add_argument("file", help="fichier de compétition, enregistré au fil des résultats")
+    serve.add_argument("--host", default="0.0.0.0", help="adresse d'écoute (par défaut : toutes)")
+    serve.add_argument("--port", type=int, default=8080, help="port d'écoute")
+    serve.add_argument("--pistes", type=int, default=1, help="nombre de pistes")
+    serve.add_argument("--apparatus", type=int, help="port de réception des trames des appareils de signalisation")
+    serve.add_argument("--site", help="dossier du site statique des résultats en direct, tenu à jour")
+    serve.set_defaults(function=command_serve)
+
+    simulate = commands.add_parser("simulate", help="simule une compétition aux résultats aléatoires")
+    simulate.add_argument("--fencers", type=int, default=1000, help="nombre de tireurs")
+    simulate.add_argument("--rounds", type=int, default=15, help="nombre de rondes")
+    simulate.add_argument("--score", type=int, default=15, help="score maximum des matchs")
+    simulate.add_argument("--seed", type=int, help="graine des résultats aléatoires")
+    simulate.add_argument("--top", type=int, default=10, help="nombre de lignes du classement affichées")
+    simulate.add_argument("-o", "--output", help="fichier de compétition où enregistrer la simulation")
+    simulate.set_defaults(function=command_simulate)
+
+    return main_parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Exécute une commande.
+
+    :param argv: Arguments de la ligne de commande, ceux du processus par défaut.
+    :return: Code de sortie.
+    """
+    arguments: argparse.Namespace = parser().parse_args(argv)
+    try:
+        arguments.function(arguments)
+    except CommandError as error:
+        print(f"Erreur : {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+from collections.abc import Callable, Iterable
+
+from threading import Condition
+
+from typing import Any, NamedTuple, TYPE_CHECKING
+
+from competition.journal import Event
+from competition.snapshots import MatchSnapshot, ParticipantSnapshot, RoundSnapshot, TournamentSnapshot
+from competition.standings import ChangeSet, Ranking, Standing
+
+if TYPE_CHECKING:
+    from competition.tournament import Tournament
+
+
+#: Types de changements publiés par le bus d'événements
+CHANGE_KINDS: frozenset[str] = frozenset(("participant_added", "participant_removed", "participant_updated",
+                                          "round_paired", "match_validated", "match_invalidated", "match_scored",
+                                          "standing_changed", "reset"))
+
+#: Nombre maximal de changements en attente d'un abonnement, par défaut
+DEFAULT_CAPACITY: int = 1024
+
+
+class Change(NamedTuple):
+    """
+    Changement compact d'une compétition, publié par le bus d'événements.
+
+    ========================= ======================== ====================================================
+    Type                      Clé                      Valeur
+    ========================= ======================== ====================================================
+    ``participant_added``     indice dans le registre  `ParticipantSnapshot`
+    ``participant_removed``   indice dans le registre  `ParticipantSnapshot`
+    ``participant_updated``   indice dans le registre  `ParticipantSnapshot`
+    ``round_paired``          numéro de la ronde       `RoundSnapshot`
+    ``match_validated``       (ronde, table)           `MatchSnapshot`
+    ``match_invalidated``     (ronde, table)           `MatchSnapshot`
+    ``match_scored``          (ronde, table)           `MatchSnapshot` non validé, avec ses scores en cours
+    ``standing_changed``      indice dans le registre  `Standing` désignant un `ParticipantSnapshot`, ou `None`
+    ``reset``                 `None`                   `TournamentSnapshot` complet, à relire entièrement
+    ========================= ======================== ====================================================
+
+    Un changement ``standing_changed`` ne concerne que le tireur/équipe replacé.e, avec son nouveau rang, ou `None`
+    s'il/elle n'est plus classé.e. Les autres lignes gardent leur ordre relatif, leur rang se déduisant de leur position
+    parmi les scores : l'ordre est celui de `rank`, puis du nom. L'ordre de deux homonymes ex æquo n'est pas garanti :
+    il suit l'identité des objets, et peut différer de celui du site en direct, qui suit l'indice dans le registre.
+
+    :param str kind: Type de changement, parmi `CHANGE_KINDS`.
+    :param int generation: Numéro de publication de l'instantané qui inclut le changement.
+    :param key: Clé de l'élément modifié.
+    :param value: Nouvelle valeur de l'élément modifié.
+    """
+    #: Type de changement
+    kind: str
+    #: Numéro de publication de l'instantané qui inclut le changement
+    generation: int
+    #: Clé de l'élément modifié
+    key: int | tuple[int, int] | None
+    #: Nouvelle valeur de l'élément modifié
+    value: ParticipantSnapshot | RoundSnapshot | MatchSnapshot | Standing | TournamentSnapshot | None
+
+
+class Subscription:
+    """
+    Classe représentant l'abonnement d'un affichage au bus d'événements d'une compétition.
+
+    Les changements sont déposés par lots et lus depuis n'importe quel fil d'exécution. Chaque lecture renvoie les
+    changements en attente, en ne gardant que le dernier de chaque élément. Un abonnement qui ne suit pas ne ralentit
+    jamais la compétition : au-delà de sa capacité, ses changements en attente sont remplacés par un unique changement
+    ``reset``, qui demande de relire l'instantané complet.
+
+    :param frozenset[str] kinds: Types de changements reçus.
+    :param int capacity: Nombre maximal de changements en attente.
+    :param Callable[[],None]|None notify: Fonction appelée, dans le fil de la compétition, lorsque des changements
+        deviennent disponibles, par exemple pour réveiller une boucle `asyncio` avec `call_soon_threadsafe`.
+    """
+    #: Types de changements reçus
+    _kinds: frozenset[str]
+    #: Nombre maximal de changements en attente
+    _capacity: int
+    #: Fonction appelée lorsque des changements deviennent disponibles
+    _notify: Callable[[], None] | None
+    #: Changements en attente, par type et clé
+    _pending: dict[tuple[str, Any], Change]
+    #: Nombre de débordements de la capacité
+    _overflows: int
+    #: Abonnement résilié
+    _is_closed: bool
+    #: Condition de disponibilité des changements
+    _available: Condition
+
+    def __init__(self, kinds: frozenset[str], capacity: int, *,
+                 notify: Callable[[], None] | None = None) -> None:
+        """
+        Initialise un nouvel abonnement.
+        """
+        if not CHANGE_KINDS.issuperset(kinds):
+            raise ValueError(f"Le paramètre `kinds` doit être une partie de `{sorted(CHANGE_KINDS)}`.")
+        if capacity <= 0:
+            raise ValueError("Le paramètre `capacity` doit être strictement supérieur à `0`.")
+        self._kinds = kinds | {"reset"}
+        self._capacity = capacity
+        self._notify = notify
+        self._pending = dict()
+        self._overflows = 0
+        self._is_closed = False
+        self._available = Condition()
+
+    @property
+    def kinds(self) -> frozenset[str]:
+        return self._kinds
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def overflows(self) -> int:
+        return self._overflows
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(kinds={sorted(self._kinds)}, capacity={self._capacity}, "\
+               f"pending={len(self._pending)}, overflows={self._overflows})"
+
+    def get(self, timeout: float | None = None) -> list[Change]:
+        """
+        Attend puis retire les changements en attente.
+
+        :param timeout: Durée maximale d'attente, en secondes, ou `None` pour attendre indéfiniment.
+        :return: Changements, dans l'ordre de leur dernière modification, vide après le délai, ou après la résiliation
+            une fois les derniers changements lus.
+        """
+        with self._available:
+            self._available.wait_for(lambda: self._pending or self._is_closed, timeout)
+            return self._take()
+
+    def poll(self) -> list[Change]:
+        """
+        Retire les changements en attente, sans attendre.
+
+        :return: Changements, dans l'ordre de leur dernière modification.
+        """
+        with self._available:
+            return self._take()
+
+    def close(self) -> None:
+        """
+        Résilie l'abonnement et réveille les lectures en attente. Les changements déjà déposés restent lisibles.
+        """
+        with self._available:
+            self._is_closed = True
+            self._available.notify_all()
+
+    def _take(self) -> list[Change]:
+        """
+        Retire les changements en attente, le verrou étant acquis.
+        """
+        changes: list[Change] = list(self._pending.values())
+        self._pending.clear()
+        return changes
+
+    def _deliver(self, changes: Iterable[Change], snapshot: TournamentSnapshot) -> None:
+        """
+        Dépose un lot de changements, dans le fil de la compétition.
+
+        :param changes: Changements du lot.
+        :param snapshot: Instantané qui inclut le lot, envoyé seul en cas de débordement.
+        """
+        with self._available:
+            if self._is_closed:
+                return
+            was_empty: bool = not self._pending
+            for change in changes:
+                if change.kind not in self._kinds:
+                    continue
+                if change.kind == "reset":
+                    self._pending.clear()
+                key: tuple[str, Any] = (change.kind, change.key)
+                self._pending.pop(key, None)
+                self._pending[key] = change
+
+            # Débordement : l'instantané complet remplace les changements en attente
+            if len(self._pending) > self._capacity:
+                self._overflows += 1
+                self._pending = {("reset", None): Change("reset", snapshot.generation, None, snapshot)}
+            if not self._pending:
+                return
+            self._available.notify_all()
+        if was_empty and (self._notify is not None):
+            self._notify()
+
+
+class EventBus:
+    """
+    Classe représentant le bus d'événements d'une compétition, qui publie des changements compacts aux affichages.
+
+    Le bus suit le journal de la compétition et cumule les tireurs/équipes modifié.e.s jusqu'au prochain lot. Chaque lot
+    compare le dernier instantané publié au précédent, en ne visitant que les rondes modifiées et les tireurs/équipes
+    concerné.e.s. Seul.e.s les tireurs/équipes replacé.e.s dans le classement sont publié.e.s, si bien qu'un lot ne
+    coûte qu'en proportion des éléments modifiés.
+
+    Sans fonction de programmation, chaque opération du journal produit son lot. Avec, par exemple `after_idle` d'un
+    widget ou `call_soon` d'une boucle `asyncio`, les opérations sont regroupées jusqu'au lot programmé.
+
+    :param Tournament tournament: Compétition suivie.
+    :param Callable[[Callable[[],None]],Any]|None schedule: Fonction de programmation d'un lot dans le fil de la
+        compétition, ou `None` pour un lot par opération.
+    """
+    #: Compétition suivie
+    _tournament: "Tournament"
+    #: Fonction de programmation d'un lot
+    _schedule: Callable[[Callable[[], None]], Any] | None
+    #: Abonnements
+    _subscriptions: list[Subscription]
+    #: Dernier instantané publié dans un lot
+    _snapshot: TournamentSnapshot
+    #: Classement suivi
+    _ranking: Ranking
+    #: Changements du classement en attente du prochain lot
+    _changes: ChangeSet | None
+    #: Programmation d'un lot en cours
+    _is_scheduled: bool
+
+    def __init__(self, tournament: "Tournament", *,
+                 schedule: Callable[[Callable[[], None]], Any] | None = None) -> None:
+        """
+        Initialise un nouveau bus d'événements.
+        """
+        self._tournament = tournament
+        self._schedule = schedule
+        self._subscriptions = list()
+        self._snapshot = tournament.snapshot
+        self._ranking = Ranking(tournament.participants)
+        self._changes = None
+        self._is_scheduled = False
+        tournament.journal.subscribe(self._on_journal)
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        return list(self._subscriptions)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(subscriptions={len(self._subscriptions)}, "\
+               f"generation={self._snapshot.generation})"
+
+    def subscribe(self, kinds: Iterable[str] = CHANGE_KINDS, *,
+                  capacity: int = DEFAULT_CAPACITY,
+                  notify: Callable[[], None] | None = None) -> Subscription:
+        """
+        Abonne un affichage à des types de changements.
+
+        Le premier lot reçu est un changement ``reset`` avec l'instantané actuel.
+
+        :param kinds: Types de changements reçus, parmi `CHANGE_KINDS`.
+        :param capacity: Nombre maximal de changements en attente.
+        :param notify: Fonction appelée, dans le fil de la compétition, lorsque des changements deviennent disponibles.
+        :return: Abonnement.
+        """
+        subscription: Subscription = Subscription(frozenset(kinds), capacity, notify=notify)
+        subscription._deliver((Change("reset", self._snapshot.generation, None, self._snapshot),), self._snapshot)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Résilie un abonnement.
+
+        :param subscription: Abonnement.
+        """
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        subscription.close()
+
+    def close(self) -> None:
+        """
+        Se désabonne du journal et résilie tous les abonnements.
+        """
+        self._tournament.journal.unsubscribe(self._on_journal)
+        for subscription in self._subscriptions:
+            subscription.close()
+        self._subscriptions.clear()
+
+    def _on_journal(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Abonnement au journal de la compétition : cumule les changements, puis produit ou programme un lot.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        """
+        changes: ChangeSet = ChangeSet.from_journal(operation, event)
+        self._changes = changes if self._changes is None else self._changes.merge(changes)
+        if self._schedule is None:
+            self.flush()
+        elif not self._is_scheduled:
+            self._is_scheduled = True
+            self._schedule(self.flush)
+
+    def flush(self) -> list[Change]:
+        """
+        Produit le lot des changements cumulés depuis le précédent et le dépose dans chaque abonnement.
+
+        :return: Changements du lot.
+        """
+        self._is_scheduled = False
+        changes: ChangeSet | None = self._changes
+        self._changes = None
+        if changes is None:
+            return list()
+        previous: TournamentSnapshot = self._snapshot
+        snapshot: TournamentSnapshot = self._tournament.snapshot
+        self._snapshot = snapshot
+
+        # Retour en arrière : instantané complet
+        if changes.is_full:
+            self._ranking.reset(self._tournament.participants)
+            batch: list[Change] = [Change("reset", snapshot.generation, None, snapshot)]
+        else:
+            rounds: list[Change] = self._round_changes(previous, snapshot)
+            indexes: set[int] = {self._tournament.participant_index(participant)
+                                 for participant in changes.participants}
+            for change in rounds:
+                matches = change.value.matches if change.kind == "round_paired" else (change.value,)
+                indexes.update(index for match in matches for index in (match.participant1, match.participant2)
+                               if index is not None)
+            batch: list[Change] = self._participant_changes(previous, snapshot, indexes)
+            batch.extend(rounds)
+            batch.extend(self._standing_changes(changes, snapshot))
+
+        for subscription in tuple(self._subscriptions):
+            subscription._deliver(batch, snapshot)
+        return batch
+
+    @staticmethod
+    def _participant_changes(previous: TournamentSnapshot, snapshot: TournamentSnapshot,
+                             indexes: set[int]) -> list[Change]:
+        """
+        Changements de tireurs/équipes entre deux instantanés.
+
+        :param indexes: Indices des tireurs/équipes concerné.e.s par les opérations du lot.
+        """
+        changes: list[Change] = list()
+        for i in sorted(indexes):
+            participant: ParticipantSnapshot = snapshot.registry[i]
+            old: ParticipantSnapshot | None = previous.registry[i] if i < len(previous.registry) else None
+            if participant is old:
+                continue
+            if participant.is_active and ((old is None) or not old.is_active):
+                changes.append(Change("participant_added", snapshot.generation, i, participant))
+            elif (not participant.is_active) and (old is not None) and old.is_active:
+                changes.append(Change("participant_removed", snapshot.generation, i, participant))
+            elif participant != old:
+                changes.append(Change("participant_updated", snapshot.generation, i, participant))
+        return changes
+
+    @staticmethod
+    def _round_changes(previous: TournamentSnapshot, snapshot: TournamentSnapshot) -> list[Change]:
+        """
+        Changements des rondes et des matchs entre deux instantanés.
+        """
+        changes: list[Change] = list()
+        for i, played_round in enumerate(snapshot.rounds):
+            if i >= len(previous.rounds):
+                changes.append(Change("round_paired", snapshot.generation, played_round.number, played_round))
+                continue
+            if played_round is previous.rounds[i]:
+                continue
+            for table, (match, old) in enumerate(zip(played_round.matches, previous.rounds[i].matches), start=1):
+                if match is not old:
+                    kind: str = "match_validated" if match.is_validated \
+                        else "match_invalidated" if old.is_validated else "match_scored"
+                    changes.append(Change(kind, snapshot.generation, (played_round.number, table), match))
+        return changes
+
+    def _standing_changes(self, changes: ChangeSet, snapshot: TournamentSnapshot) -> list[Change]:
+        """
+        Lignes du classement des tireurs/équipes replacé.e.s.
+        """
+        tournament: "Tournament" = self._tournament
+        if self._ranking.update(changes.participants, tournament.participants) is None:
+            return list()
+        standings: list[Change] = list()
+        for participant in changes.participants:
+            index: int = tournament.participant_index(participant)
+            position: int | None = self._ranking.position(participant)
+            if position is None:
+                standings.append(Change("standing_changed", snapshot.generation, index, None))
+                continue
+            standing: Standing = self._ranking.standing(position)
+            standings.append(Change("standing_changed", snapshot.generation, index,
+                                    standing._replace(participant=snapshot.registry[index])))
+        return standings
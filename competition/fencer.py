@@ -292,3 +292,23 @@ class Fencer:
 
         # Mémoire du tireur
         self._has_been_exempted = True
+
+    def restore(self, victories: float, touches_scored: int, touches_received: int, *,
+                opponents_encountered: set["Fencer"], has_been_exempted: bool) -> None:
+        """
+        Restaure le score et la mémoire du tireur.
+
+        :param victories: Victoires du tireur.
+        :param touches_scored: Touches portées par le tireur.
+        :param touches_received: Touches reçues par le tireur.
+        :param opponents_encountered: Tireurs adverses rencontrés.
+        :param has_been_exempted: Exemption du tireur.
+        """
+        # Score du tireur
+        self._victories = victories
+        self._touches_scored = touches_scored
+        self._touches_received = touches_received
+
+        # Mémoire du tireur
+        self._opponents_encountered = opponents_encountered
+        self._has_been_exempted = has_been_exempted
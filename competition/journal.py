@@ -0,0 +1,411 @@
+from array import array
+
+from collections.abc import Callable, Iterable
+
+from typing import NamedTuple, TYPE_CHECKING
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.team import Team
+
+if TYPE_CHECKING:
+    from competition.tournament import Tournament
+
+
+#: Types d'événements du journal
+EVENT_KINDS: frozenset[str] = frozenset(("registration", "withdrawal", "pairing", "validation"))
+#: Opérations du journal notifiées aux abonnés
+OPERATIONS: frozenset[str] = frozenset(("record", "extend", "undo", "redo", "seek", "score", "change"))
+
+#: Drapeau de participation dans un instantané
+ACTIVE: int = 0b01
+#: Drapeau d'exemption dans un instantané
+EXEMPTED: int = 0b10
+
+
+class Event(NamedTuple):
+    """
+    Événement du journal d'une compétition.
+
+    :param str kind: Type d'événement : ``'registration'``, ``'withdrawal'``, ``'pairing'`` ou ``'validation'``, ou
+        ``'score'`` pour les scores en cours d'un match, notifiés sans être journalisés.
+    :param Fencer|Team|Round|Match subject: Participant, ronde ou match concerné.
+    :param Score|None score1: Score du premier.ère tireur/équipe, pour une validation ou des scores en cours.
+    :param Score|None score2: Score du second.e tireur/équipe, pour une validation ou des scores en cours.
+    """
+    #: Type d'événement
+    kind: str
+    #: Participant, ronde ou match concerné
+    subject: Fencer | Team | Round | Match
+    #: Score du premier.ère tireur/équipe, pour une validation
+    score1: Score | None = None
+    #: Score du second.e tireur/équipe, pour une validation
+    score2: Score | None = None
+
+
+class Snapshot(NamedTuple):
+    """
+    Instantané compact de l'état d'une compétition, indexé par le registre des participants.
+
+    :param int position: Nombre d'événements appliqués.
+    :param int rounds: Nombre de rondes appariées.
+    :param bytes flags: Drapeaux de participation et d'exemption.
+    :param array victories: Victoires.
+    :param array touches_scored: Touches portées.
+    :param array touches_received: Touches reçues.
+    :param array opponents: Indices des adversaires rencontrés, mis bout à bout.
+    :param array offsets: Bornes des adversaires rencontrés de chaque participant.
+    """
+    #: Nombre d'événements appliqués
+    position: int
+    #: Nombre de rondes appariées
+    rounds: int
+    #: Drapeaux de participation et d'exemption
+    flags: bytes
+    #: Victoires
+    victories: array
+    #: Touches portées
+    touches_scored: array
+    #: Touches reçues
+    touches_received: array
+    #: Indices des adversaires rencontrés, mis bout à bout
+    opponents: array
+    #: Bornes des adversaires rencontrés de chaque participant
+    offsets: array
+
+
+class Journal:
+    """
+    Classe représentant le journal, en ajout seul, des événements d'une compétition.
+
+    L'état de la compétition est reconstruit en rejouant les événements depuis l'instantané le plus proche.
+
+    :param Tournament tournament: Compétition journalisée.
+    :param int snapshot_interval: Nombre minimal d'événements entre deux instantanés.
+    """
+    #: Compétition journalisée
+    _tournament: "Tournament"
+    #: Nombre minimal d'événements entre deux instantanés
+    _snapshot_interval: int
+    #: Événements de la compétition
+    _events: list[Event]
+    #: Nombre d'événements appliqués
+    _cursor: int
+    #: Instantanés, par position croissante
+    _snapshots: list[Snapshot]
+    #: Positions des appariements de chaque ronde dans le journal
+    _pairings: list[int]
+    #: Abonnés notifiés de chaque opération, avec l'événement ou les événements concernés
+    _listeners: list[Callable[[str, Event | tuple[Event, ...] | None], None]]
+
+    def __init__(self, tournament: "Tournament", *,
+                 snapshot_interval: int = 256) -> None:
+        """
+        Initialise un nouveau journal.
+        """
+        # Compétition
+        self._tournament = tournament
+
+        # Intervalle des instantanés
+        if snapshot_interval <= 0:
+            raise ValueError("Le paramètre `snapshot_interval` doit être strictement supérieur à `0`.")
+        self._snapshot_interval = snapshot_interval
+
+        # Événements
+        self._events = list()
+        self._cursor = 0
+
+        # Instantanés
+        self._snapshots = [self._take_snapshot()]
+        self._pairings = list()
+
+        # Abonnés
+        self._listeners = list()
+
+    @property
+    def events(self) -> list[Event]:
+        """
+        Événements appliqués, du plus ancien au plus récent.
+        """
+        return self._events[:self._cursor]
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    @property
+    def can_undo(self) -> bool:
+        """
+        Existence d'un événement à annuler.
+        """
+        return self._cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        """
+        Existence d'un événement à rétablir.
+        """
+        return self._cursor < len(self._events)
+
+    def __len__(self) -> int:
+        return self._cursor
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(events={len(self._events)}, cursor={self._cursor}, "\
+               f"snapshots={len(self._snapshots)})"
+
+    def record(self, event: Event) -> None:
+        """
+        Ajoute un événement au journal et l'applique à la compétition.
+
+        Les événements annulés, s'il y en a, sont définitivement abandonnés.
+
+        :param event: Événement entrant.
+        """
+        if event.kind not in EVENT_KINDS:
+            raise ValueError("L'attribut `kind` du paramètre `event` doit être parmi "
+                             "`{'registration', 'withdrawal', 'pairing', 'validation'}`.")
+        self._discard_undone()
+        self._append(event)
+        self._notify("record", event)
+
+    def extend(self, events: Iterable[Event]) -> int:
+        """
+        Ajoute des événements au journal, par lot, par exemple depuis une importation, et les applique à la compétition.
+
+        Les abonnés ne sont notifiés qu'une fois, par l'opération ``'extend'`` accompagnée des événements du lot :
+        l'instantané de la compétition n'est publié qu'une fois par lot, et non une fois par événement.
+
+        :param events: Événements entrants.
+        :return: Nombre d'événements ajoutés.
+        """
+        events = tuple(events)
+        if any(event.kind not in EVENT_KINDS for event in events):
+            raise ValueError("L'attribut `kind` des éléments du paramètre `events` doit être parmi "
+                             "`{'registration', 'withdrawal', 'pairing', 'validation'}`.")
+        if not events:
+            return 0
+        self._discard_undone()
+        for event in events:
+            self._append(event)
+        self._notify("extend", events)
+        return len(events)
+
+    def notify_score(self, match: Match) -> None:
+        """
+        Notifie les abonnés des scores en cours d'un match non validé, par l'opération ``'score'``.
+
+        Les scores en cours ne sont pas des événements du journal : ils ne sont ni annulables ni rejoués, mais la
+        compétition est publiée et les abonnés les voient comme une validation.
+
+        :param match: Match dont les scores viennent de changer.
+        """
+        self._notify("score", Event("score", match, match.score1, match.score2))
+
+    def notify_change(self) -> None:
+        """
+        Notifie les abonnés d'une modification hors du journal, par exemple de la composition d'une équipe, par
+        l'opération ``'change'``.
+
+        Comme après un retour en arrière, la compétition est publiée entièrement et les abonnés repartent de son état
+        complet.
+        """
+        self._notify("change", None)
+
+    def subscribe(self, listener: Callable[[str, Event | tuple[Event, ...] | None], None]) -> None:
+        """
+        Abonne une fonction aux opérations du journal : ``'record'``, ``'extend'``, ``'undo'``, ``'redo'``, ``'seek'``,
+        ``'score'`` ou ``'change'``.
+
+        :param listener: Fonction appelée avec l'opération et l'événement concerné, s'il existe, ou les événements du
+            lot pour ``'extend'``.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Event | tuple[Event, ...] | None], None]) -> None:
+        """
+        Désabonne une fonction des opérations du journal.
+
+        :param listener: Fonction abonnée.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def undo(self) -> Event | None:
+        """
+        Annule le dernier événement appliqué.
+
+        :return: Événement annulé, s'il existe.
+        """
+        if not self.can_undo:
+            return None
+        event: Event = self._events[self._cursor - 1]
+        self._seek(self._cursor - 1)
+        self._notify("undo", event)
+        return event
+
+    def redo(self) -> Event | None:
+        """
+        Rétablit le dernier événement annulé.
+
+        :return: Événement rétabli, s'il existe.
+        """
+        if not self.can_redo:
+            return None
+        event: Event = self._events[self._cursor]
+        self._forward()
+        self._notify("redo", event)
+        return event
+
+    def round_position(self, number: int) -> int:
+        """
+        Position du journal à la fin d'une ronde, c'est-à-dire juste avant l'appariement de la suivante.
+
+        :param number: Numéro de la ronde, ``0`` pour l'état précédant la première ronde journalisée.
+        :return: Position du journal.
+        """
+        first: int = self._snapshots[0].rounds
+        if (number < first) or (number > first + len(self._pairings)):
+            raise ValueError(f"Le paramètre `number` doit être compris entre `{first}` et "
+                             f"`{first + len(self._pairings)}`.")
+        if number - first < len(self._pairings):
+            return self._pairings[number - first]
+        return len(self._events)
+
+    def seek(self, position: int) -> None:
+        """
+        Place la compétition dans l'état correspondant à une position du journal.
+
+        Le coût est proportionnel au nombre d'événements depuis l'instantané le plus proche.
+
+        :param position: Nombre d'événements appliqués.
+        """
+        self._seek(position)
+        self._notify("seek", None)
+
+    def _seek(self, position: int) -> None:
+        """
+        Place la compétition dans l'état correspondant à une position du journal, sans notifier les abonnés.
+
+        :param position: Nombre d'événements appliqués.
+        """
+        if (position < 0) or (position > len(self._events)):
+            raise ValueError(f"Le paramètre `position` doit être compris entre `0` et `{len(self._events)}`.")
+
+        # Retour en arrière
+        if position < self._cursor:
+            for event in self._events[position:self._cursor]:
+                if event.kind == "validation":
+                    event.subject.invalidate()
+            snapshot: Snapshot = next(snapshot for snapshot in reversed(self._snapshots)
+                                      if snapshot.position <= position)
+            self._restore_snapshot(snapshot)
+
+        # Avance
+        while self._cursor < position:
+            self._forward()
+
+    def _notify(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Publie l'instantané de la compétition, puis notifie les abonnés d'une opération du journal.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        """
+        self._tournament._publish(operation, event)
+        for listener in tuple(self._listeners):
+            listener(operation, event)
+
+    def _discard_undone(self) -> None:
+        """
+        Abandonne définitivement les événements annulés, avant l'ajout d'un nouvel événement.
+        """
+        if self._cursor < len(self._events):
+            del self._events[self._cursor:]
+            while self._snapshots[-1].position > self._cursor:
+                self._snapshots.pop()
+            while self._pairings and (self._pairings[-1] >= self._cursor):
+                self._pairings.pop()
+
+    def _append(self, event: Event) -> None:
+        """
+        Ajoute un événement à la fin du journal et l'applique à la compétition, sans notifier les abonnés.
+
+        :param event: Événement entrant.
+        """
+        if event.kind == "pairing":
+            self._pairings.append(len(self._events))
+        self._events.append(event)
+        self._forward()
+
+    def _forward(self) -> None:
+        """
+        Applique l'événement suivant à la compétition et prend un instantané si nécessaire.
+
+        Un instantané coûte autant que la taille du registre : l'intervalle entre deux instantanés croît avec elle, pour
+        que leur coût reste constant par événement, y compris pendant une importation.
+        """
+        event: Event = self._events[self._cursor]
+        self._tournament._apply(event)
+        self._cursor += 1
+        interval: int = max(self._snapshot_interval, len(self._tournament.registry))
+        if self._cursor - self._snapshots[-1].position >= interval:
+            self._snapshots.append(self._take_snapshot())
+
+    def _take_snapshot(self) -> Snapshot:
+        """
+        Prend un instantané de l'état de la compétition.
+
+        :return: Instantané de la compétition.
+        """
+        tournament: "Tournament" = self._tournament
+        registry: list[Fencer] | list[Team] = tournament.registry
+        participants: set[Fencer] | set[Team] = tournament.participants
+
+        flags: bytearray = bytearray(len(registry))
+        victories: array = array("d")
+        touches_scored: array = array("q")
+        touches_received: array = array("q")
+        opponents: array = array("l")
+        offsets: array = array("l", (0,))
+        for i, participant in enumerate(registry):
+            if participant in participants:
+                flags[i] |= ACTIVE
+            if participant.has_been_exempted:
+                flags[i] |= EXEMPTED
+            victories.append(participant.victories)
+            touches_scored.append(participant.touches_scored)
+            touches_received.append(participant.touches_received)
+            opponents.extend(tournament.participant_index(opponent) for opponent in participant.opponents_encountered)
+            offsets.append(len(opponents))
+
+        return Snapshot(self._cursor, len(tournament.rounds), bytes(flags),
+                        victories, touches_scored, touches_received, opponents, offsets)
+
+    def _restore_snapshot(self, snapshot: Snapshot) -> None:
+        """
+        Restaure l'état de la compétition à partir d'un instantané.
+
+        :param snapshot: Instantané de la compétition.
+        """
+        tournament: "Tournament" = self._tournament
+        registry: list[Fencer] | list[Team] = tournament.registry
+
+        participants: set[Fencer] | set[Team] = set()
+        for i, participant in enumerate(registry):
+            if i < len(snapshot.flags):
+                if snapshot.flags[i] & ACTIVE:
+                    participants.add(participant)
+                opponents: array = snapshot.opponents[snapshot.offsets[i]:snapshot.offsets[i + 1]]
+                participant.restore(snapshot.victories[i], snapshot.touches_scored[i], snapshot.touches_received[i],
+                                    opponents_encountered={registry[j] for j in opponents},
+                                    has_been_exempted=bool(snapshot.flags[i] & EXEMPTED))
+            else:
+                participant.restore(0.0, 0, 0,
+                                    opponents_encountered=set(), has_been_exempted=False)
+        tournament._restore(participants, snapshot.rounds)
+        self._cursor = snapshot.position
@@ -0,0 +1,465 @@
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+
+from itertools import chain
+
+from typing import NamedTuple, TYPE_CHECKING
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.journal import Event
+from competition.standings import ChangeSet, Standing, rank
+from competition.team import Team
+
+if TYPE_CHECKING:
+    from competition.tournament import Tournament
+
+
+#: Nombre d'instantanés de tireurs/équipes par tranche du registre
+REGISTRY_CHUNK_SIZE: int = 256
+
+
+class ParticipantSnapshot(NamedTuple):
+    """
+    Instantané immuable d'un.e tireur/équipe, désigné.e par son indice dans le registre de la compétition.
+
+    :param int index: Indice du tireur/équipe dans le registre.
+    :param tuple[str,str]|str name: Nom complet du tireur, ou nom de l'équipe.
+    :param str|None club: Club du tireur, ou `None` pour une équipe.
+    :param float victories: Victoires.
+    :param int touches_scored: Touches portées.
+    :param int touches_received: Touches reçues.
+    :param frozenset[int] opponents: Indices des adversaires rencontré.e.s.
+    :param bool has_been_exempted: Exemption du tireur/équipe.
+    :param bool is_active: Participation du tireur/équipe.
+    """
+    #: Indice du tireur/équipe dans le registre
+    index: int
+    #: Nom complet du tireur, ou nom de l'équipe
+    name: tuple[str, str] | str
+    #: Club du tireur, ou `None` pour une équipe
+    club: str | None
+    #: Victoires
+    victories: float
+    #: Touches portées
+    touches_scored: int
+    #: Touches reçues
+    touches_received: int
+    #: Indices des adversaires rencontré.e.s
+    opponents: frozenset[int]
+    #: Exemption du tireur/équipe
+    has_been_exempted: bool
+    #: Participation du tireur/équipe
+    is_active: bool
+
+    @property
+    def indicator(self) -> int:
+        """
+        Indice du tireur/équipe.
+        """
+        return self.touches_scored - self.touches_received
+
+    @property
+    def score(self) -> tuple[float, int, int]:
+        """
+        Score global du tireur/équipe.
+        """
+        return self.victories, self.indicator, self.touches_scored
+
+
+class MatchSnapshot(NamedTuple):
+    """
+    Instantané immuable d'un match, les tireurs/équipes étant désigné.e.s par leur indice dans le registre.
+
+    :param int|None participant1: Indice du premier.ère tireur/équipe, ou `None`.
+    :param int|None participant2: Indice du second.e tireur/équipe, ou `None`.
+    :param tuple[int,str|None]|None score1: Touches et statut du premier score, ou `None`.
+    :param tuple[int,str|None]|None score2: Touches et statut du second score, ou `None`.
+    :param bool is_validated: Validation du match.
+    :param int version: Version du match.
+    """
+    #: Indice du premier.ère tireur/équipe, ou `None`
+    participant1: int | None
+    #: Indice du second.e tireur/équipe, ou `None`
+    participant2: int | None
+    #: Touches et statut du premier score, ou `None`
+    score1: tuple[int, str | None] | None
+    #: Touches et statut du second score, ou `None`
+    score2: tuple[int, str | None] | None
+    #: Validation du match
+    is_validated: bool
+    #: Version du match
+    version: int
+
+
+class RoundSnapshot(NamedTuple):
+    """
+    Instantané immuable d'une ronde appariée.
+
+    :param int number: Numéro de la ronde.
+    :param Sequence[MatchSnapshot] matches: Matchs de la ronde, séquence immuable.
+    """
+    #: Numéro de la ronde
+    number: int
+    #: Matchs de la ronde, séquence immuable
+    matches: Sequence[MatchSnapshot]
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Validation de tous les matchs de la ronde.
+        """
+        return all(match.is_validated for match in self.matches)
+
+
+class ParticipantRegistry(Sequence):
+    """
+    Classe représentant le registre immuable des instantanés des tireurs/équipes, découpé en tranches.
+
+    Remplacer ou ajouter un instantané ne recopie que sa tranche et la liste des tranches : deux registres successifs
+    partagent toutes les autres tranches, et publier le changement d'un.e tireur/équipe ne coûte plus la copie de
+    tout le registre.
+
+    :param Iterable[ParticipantSnapshot] participants: Instantanés des tireurs/équipes, dans l'ordre d'inscription.
+    """
+    # Un registre par instantané publié : attributs fixes, sans dictionnaire par instance
+    __slots__ = ("_chunks", "_length")
+
+    #: Tranches du registre, toutes pleines sauf la dernière
+    _chunks: tuple[tuple[ParticipantSnapshot, ...], ...]
+    #: Nombre d'instantanés
+    _length: int
+
+    def __init__(self, participants: Iterable[ParticipantSnapshot] = ()) -> None:
+        """
+        Initialise un nouveau registre.
+        """
+        participants = tuple(participants)
+        self._chunks = tuple(participants[i:i + REGISTRY_CHUNK_SIZE]
+                             for i in range(0, len(participants), REGISTRY_CHUNK_SIZE))
+        self._length = len(participants)
+
+    @classmethod
+    def _from_chunks(cls, chunks: tuple[tuple[ParticipantSnapshot, ...], ...], length: int) -> "ParticipantRegistry":
+        """
+        Registre construit depuis des tranches existantes, partagées.
+        """
+        registry: ParticipantRegistry = cls.__new__(cls)
+        registry._chunks = chunks
+        registry._length = length
+        return registry
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(participants={self._length}, chunks={len(self._chunks)})"
+
+    def __getitem__(self, index: int | slice) -> ParticipantSnapshot | tuple[ParticipantSnapshot, ...]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Indice du registre hors limites.")
+        return self._chunks[index // REGISTRY_CHUNK_SIZE][index % REGISTRY_CHUNK_SIZE]
+
+    def __iter__(self) -> Iterator[ParticipantSnapshot]:
+        return chain.from_iterable(self._chunks)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return (len(self) == len(other)) and all(a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def replace(self, index: int, participant: ParticipantSnapshot) -> "ParticipantRegistry":
+        """
+        Registre dont un instantané est remplacé, les autres tranches étant partagées.
+
+        :param index: Indice de l'instantané remplacé.
+        :param participant: Nouvel instantané.
+        :return: Nouveau registre.
+        """
+        if not 0 <= index < self._length:
+            raise IndexError("Indice du registre hors limites.")
+        i, j = divmod(index, REGISTRY_CHUNK_SIZE)
+        chunk: tuple[ParticipantSnapshot, ...] = self._chunks[i]
+        return self._from_chunks(self._chunks[:i] + (chunk[:j] + (participant,) + chunk[j + 1:],)
+                                 + self._chunks[i + 1:], self._length)
+
+    def extend(self, participants: Iterable[ParticipantSnapshot]) -> "ParticipantRegistry":
+        """
+        Registre complété par de nouveaux instantanés, les tranches pleines étant partagées.
+
+        :param participants: Instantanés ajoutés, dans l'ordre d'inscription.
+        :return: Nouveau registre.
+        """
+        participants = tuple(participants)
+        if not participants:
+            return self
+        length: int = self._length + len(participants)
+        chunks: tuple[tuple[ParticipantSnapshot, ...], ...] = self._chunks
+        if chunks and (len(chunks[-1]) < REGISTRY_CHUNK_SIZE):
+            participants = chunks[-1] + participants
+            chunks = chunks[:-1]
+        return self._from_chunks(chunks + tuple(participants[i:i + REGISTRY_CHUNK_SIZE]
+                                                for i in range(0, len(participants), REGISTRY_CHUNK_SIZE)), length)
+
+
+class TournamentSnapshot(NamedTuple):
+    """
+    Instantané immuable et cohérent d'une compétition, lisible depuis n'importe quel fil d'exécution sans verrou.
+
+    Deux instantanés successifs partagent les tireurs/équipes et les rondes qui n'ont pas changé entre eux.
+
+    :param int generation: Numéro de publication de l'instantané.
+    :param str name: Nom de la compétition.
+    :param str kind: Type de compétition : `Individuelle` ou `Équipe`.
+    :param int maximum_score: Score maximum des matchs.
+    :param bool draws_are_allowed: Autorisation des matchs nuls.
+    :param ParticipantRegistry registry: Tous les tireurs/équipes inscrit.e.s, dans l'ordre d'inscription.
+    :param tuple[RoundSnapshot, ...] rounds: Rondes appariées.
+    """
+    #: Numéro de publication de l'instantané
+    generation: int
+    #: Nom de la compétition
+    name: str
+    #: Type de compétition : `Individuelle` ou `Équipe`
+    kind: str
+    #: Score maximum des matchs
+    maximum_score: int
+    #: Autorisation des matchs nuls
+    draws_are_allowed: bool
+    #: Tous les tireurs/équipes inscrit.e.s, dans l'ordre d'inscription
+    registry: ParticipantRegistry
+    #: Rondes appariées
+    rounds: tuple[RoundSnapshot, ...]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(generation={self.generation}, name={self.name!r}, "\
+               f"registry={len(self.registry)}, rounds={len(self.rounds)})"
+
+    @property
+    def participants(self) -> list[ParticipantSnapshot]:
+        """
+        Tireurs/Équipes participant.e.s, dans l'ordre d'inscription.
+        """
+        return [participant for participant in self.registry if participant.is_active]
+
+    def standings(self) -> list[Standing]:
+        """
+        Classement de la compétition au moment de l'instantané.
+
+        :return: Classement, dont les lignes désignent des `ParticipantSnapshot`.
+        """
+        return rank((participant, participant.victories, participant.touches_scored, participant.touches_received)
+                    for participant in self.participants)
+
+
+def score_snapshot(score: Score | None) -> tuple[int, str | None] | None:
+    """
+    Instantané d'un score.
+
+    :param score: Score, ou `None`.
+    :return: Touches et statut, ou `None`.
+    """
+    return None if score is None else (score.touches, score.status)
+
+
+def participant_snapshot(participant: Fencer | Team, indexes: Mapping[int, int],
+                         is_active: bool) -> ParticipantSnapshot:
+    """
+    Instantané d'un.e tireur/équipe inscrit.e.
+
+    :param participant: Tireur/Équipe.
+    :param indexes: Indices des tireurs/équipes dans le registre, par identité.
+    :param is_active: Participation du tireur/équipe.
+    :return: Instantané du tireur/équipe.
+    """
+    return ParticipantSnapshot(indexes[id(participant)], participant.name,
+                               participant.club if isinstance(participant, Fencer) else None,
+                               participant.victories, participant.touches_scored, participant.touches_received,
+                               frozenset(indexes[id(opponent)] for opponent in participant.opponents_encountered),
+                               participant.has_been_exempted, is_active)
+
+
+def match_snapshot(match: Match, indexes: Mapping[int, int]) -> MatchSnapshot:
+    """
+    Instantané d'un match.
+
+    :param match: Match.
+    :param indexes: Indices des tireurs/équipes dans le registre, par identité.
+    :return: Instantané du match.
+    """
+    return MatchSnapshot(None if match.participant1 is None else indexes[id(match.participant1)],
+                         None if match.participant2 is None else indexes[id(match.participant2)],
+                         score_snapshot(match.score1), score_snapshot(match.score2), match.is_validated,
+                         match.version)
+
+
+def round_snapshot(played_round: Round, indexes: Mapping[int, int]) -> RoundSnapshot:
+    """
+    Instantané d'une ronde appariée.
+
+    :param played_round: Ronde.
+    :param indexes: Indices des tireurs/équipes dans le registre, par identité.
+    :return: Instantané de la ronde.
+    """
+    return RoundSnapshot(played_round.number, tuple(match_snapshot(match, indexes) for match in played_round.matches))
+
+
+class SnapshotPublisher:
+    """
+    Classe représentant la publication des instantanés d'une compétition par son unique écrivain.
+
+    Seul le fil qui modifie la compétition publie : après chaque opération du journal, il construit le nouvel
+    instantané à partir des seuls tireurs/équipes et matchs modifiés, puis le publie par une unique affectation. Les
+    autres fils lisent `snapshot` une fois et travaillent sur cet instantané, sans verrou : ils ne voient jamais un état
+    partiellement modifié, et ne bloquent jamais l'écrivain.
+
+    :param Tournament tournament: Compétition publiée.
+    """
+    #: Compétition publiée
+    _tournament: "Tournament"
+    #: Dernier instantané publié
+    _snapshot: TournamentSnapshot
+    #: Indices des tireurs/équipes dans le registre, par identité
+    _indexes: dict[int, int]
+    #: Rondes des instantanés publiés, par indice, ou `None` pour une ronde publiée sans être décodée
+    _sources: list[Round | None]
+
+    def __init__(self, tournament: "Tournament") -> None:
+        """
+        Initialise une nouvelle publication, avec l'instantané de l'état actuel.
+        """
+        self._tournament = tournament
+        self._indexes = dict()
+        self._sources = list()
+        self._snapshot = TournamentSnapshot(0, tournament.name, tournament.kind, tournament.maximum_score,
+                                            tournament.draws_are_allowed, ParticipantRegistry(), ())
+        self.publish()
+
+    @property
+    def snapshot(self) -> TournamentSnapshot:
+        return self._snapshot
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(generation={self._snapshot.generation})"
+
+    def publish(self) -> TournamentSnapshot:
+        """
+        Publie un instantané complet, par exemple après une modification hors du journal.
+
+        Les rondes dont aucun match n'a changé de version sont reprises du précédent instantané. Les rondes chargées à
+        la demande, dont le conteneur fournit une méthode ``snapshot(index)``, ne sont pas décodées pour autant.
+
+        :return: Instantané publié.
+        """
+        tournament: "Tournament" = self._tournament
+        previous: TournamentSnapshot = self._snapshot
+        encoded: Callable[[int], RoundSnapshot | None] = getattr(tournament.rounds, "snapshot", lambda index: None)
+        self._indexes = {id(participant): i for i, participant in enumerate(tournament.registry)}
+        active: set[int] = {id(participant) for participant in tournament.participants}
+
+        rounds: list[RoundSnapshot] = list()
+        sources: list[Round | None] = list()
+        for i in range(len(tournament.rounds)):
+            snapshot: RoundSnapshot | None = encoded(i)
+            played_round: Round | None = None
+            if snapshot is None:
+                played_round = tournament.rounds[i]
+                if (i < len(self._sources)) and (self._sources[i] is played_round)\
+                        and all(match.version == candidate.version
+                                for match, candidate in zip(previous.rounds[i].matches, played_round.matches)):
+                    snapshot = previous.rounds[i]
+                else:
+                    snapshot = round_snapshot(played_round, self._indexes)
+            rounds.append(snapshot)
+            sources.append(played_round)
+        self._sources = sources
+
+        return self._swap(previous._replace(
+            registry=ParticipantRegistry(participant_snapshot(participant, self._indexes, id(participant) in active)
+                                         for participant in tournament.registry),
+            rounds=tuple(rounds)))
+
+    def publish_changes(self, operation: str, event: Event | tuple[Event, ...] | None) -> TournamentSnapshot:
+        """
+        Publie l'instantané qui suit une opération du journal, en ne reconstruisant que ce qu'elle a modifié.
+
+        Un lot d'inscriptions et de retraits est publié en une fois, un lot qui touche aux rondes entièrement.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        :return: Instantané publié.
+        """
+        changes: ChangeSet = ChangeSet.from_journal(operation, event)
+        if changes.is_full:
+            return self.publish()
+        if (operation == "extend") and any(batch_event.kind in ("pairing", "validation") for batch_event in event):
+            return self.publish()
+        tournament: "Tournament" = self._tournament
+        previous: TournamentSnapshot = self._snapshot
+
+        # Tireurs/Équipes nouvellement inscrit.e.s, puis modifié.e.s
+        registry: ParticipantRegistry = previous.registry
+        for i in range(len(registry), len(tournament.registry)):
+            self._indexes[id(tournament.registry[i])] = i
+        for participant in changes.participants:
+            i: int = self._indexes[id(participant)]
+            if i < len(registry):
+                registry = registry.replace(i, participant_snapshot(participant, self._indexes,
+                                                                    participant in tournament.participants))
+        if len(registry) < len(tournament.registry):
+            registry = registry.extend(participant_snapshot(participant, self._indexes,
+                                                            participant in tournament.participants)
+                                       for participant in tournament.registry[len(registry):])
+
+        # Rondes, inchangées par un lot d'inscriptions et de retraits
+        rounds: tuple[RoundSnapshot, ...] = previous.rounds
+        if (operation != "extend") and (event.kind == "pairing"):
+            rounds = rounds + (round_snapshot(event.subject, self._indexes),)
+            self._sources.append(event.subject)
+        elif (operation != "extend") and (event.kind in ("validation", "score")):
+            rounds = self._replace_match(rounds, event.subject)
+            if rounds is None:
+                return self.publish()
+
+        return self._swap(previous._replace(registry=registry, rounds=rounds))
+
+    def _replace_match(self, rounds: tuple[RoundSnapshot, ...], match: Match) -> tuple[RoundSnapshot, ...] | None:
+        """
+        Remplace l'instantané d'un match, cherché depuis la dernière ronde publiée.
+
+        :param rounds: Instantanés des rondes.
+        :param match: Match modifié.
+        :return: Instantanés des rondes, seule la ronde du match étant reconstruite, ou `None` si le match appartient à
+            une ronde publiée sans être décodée.
+        """
+        tournament: "Tournament" = self._tournament
+        for i in reversed(range(len(self._sources))):
+            if self._sources[i] is None:
+                continue
+            for j, candidate in enumerate(self._sources[i].matches):
+                if candidate is match:
+                    matches: tuple[MatchSnapshot, ...] = tuple(rounds[i].matches)
+                    replaced: RoundSnapshot = rounds[i]._replace(
+                        matches=matches[:j] + (match_snapshot(match, self._indexes),) + matches[j + 1:])
+                    return rounds[:i] + (replaced,) + rounds[i + 1:]
+        return None
+
+    def _swap(self, snapshot: TournamentSnapshot) -> TournamentSnapshot:
+        """
+        Publie un instantané, par une unique affectation.
+
+        :param snapshot: Nouvel instantané, sans numéro de publication.
+        :return: Instantané publié.
+        """
+        tournament: "Tournament" = self._tournament
+        self._snapshot = snapshot._replace(generation=self._snapshot.generation + 1, name=tournament.name)
+        return self._snapshot
@@ -0,0 +1,411 @@
+from array import array
+
+from bisect import bisect_left, insort
+
+from collections.abc import Iterable
+
+from typing import NamedTuple
+
+from competition.fencer import Fencer
+from competition.journal import Event
+from competition.team import Team
+
+
+class Standing(NamedTuple):
+    """
+    Ligne du classement d'une compétition.
+
+    :param int rank: Rang du tireur/équipe, partagé en cas d'égalité.
+    :param Fencer|Team participant: Tireur/Équipe classé.e.
+    :param float victories: Victoires.
+    :param int indicator: Indice.
+    :param int touches_scored: Touches portées.
+    :param int touches_received: Touches reçues.
+    """
+    #: Rang du tireur/équipe, partagé en cas d'égalité
+    rank: int
+    #: Tireur/Équipe classé.e
+    participant: Fencer | Team
+    #: Victoires
+    victories: float
+    #: Indice
+    indicator: int
+    #: Touches portées
+    touches_scored: int
+    #: Touches reçues
+    touches_received: int
+
+    @property
+    def score(self) -> tuple[float, int, int]:
+        """
+        Score global du tireur/équipe.
+        """
+        return self.victories, self.indicator, self.touches_scored
+
+
+class Checkpoint(NamedTuple):
+    """
+    Point de contrôle compact des scores à la fin d'une ronde, indexé par le registre des participants.
+
+    Une image clé contient les tableaux complets, les autres points de contrôle uniquement les participants modifiés
+    depuis la ronde précédente.
+
+    :param int size: Taille du registre.
+    :param array|None indexes: Indices des participants modifiés, ou `None` pour une image clé.
+    :param bytes flags: Participation des tireurs/équipes.
+    :param array victories: Victoires.
+    :param array touches_scored: Touches portées.
+    :param array touches_received: Touches reçues.
+    """
+    #: Taille du registre
+    size: int
+    #: Indices des participants modifiés, ou `None` pour une image clé
+    indexes: array | None
+    #: Participation des tireurs/équipes
+    flags: bytes
+    #: Victoires
+    victories: array
+    #: Touches portées
+    touches_scored: array
+    #: Touches reçues
+    touches_received: array
+
+
+def rank(rows: Iterable[tuple[Fencer | Team, float, int, int]]) -> list[Standing]:
+    """
+    Classe des tireurs/équipes selon leurs victoires, leur indice, leurs touches portées puis leur nom.
+
+    :param rows: Tireurs/Équipes avec leurs victoires, touches portées et touches reçues.
+    :return: Classement des tireurs/équipes.
+    """
+    # Ordre alphabétique en cas d'égalité
+    scores: list[tuple[float, int, int, int, Fencer | Team]] = sorted(
+        ((victories, scored - received, scored, received, participant)
+         for participant, victories, scored, received in rows),
+        key=lambda x: x[4].name)
+    scores.sort(key=lambda x: x[:3], reverse=True)
+
+    standings: list[Standing] = list()
+    for i, (victories, indicator, scored, received, participant) in enumerate(scores):
+        if standings and (standings[-1].score == (victories, indicator, scored)):
+            position: int = standings[-1].rank
+        else:
+            position: int = i + 1
+        standings.append(Standing(position, participant, victories, indicator, scored, received))
+    return standings
+
+
+class Checkpoints:
+    """
+    Classe représentant les points de contrôle des scores d'une compétition, ronde par ronde.
+
+    :param int keyframe_interval: Nombre de rondes entre deux images clés.
+    """
+    #: Nombre de rondes entre deux images clés
+    _keyframe_interval: int
+    #: Points de contrôle, par numéro de ronde
+    _checkpoints: list[Checkpoint]
+    #: Tableaux complets du dernier point de contrôle
+    _last: Checkpoint | None
+
+    def __init__(self, *,
+                 keyframe_interval: int = 4) -> None:
+        """
+        Initialise de nouveaux points de contrôle.
+        """
+        # Intervalle des images clés
+        if keyframe_interval <= 0:
+            raise ValueError("Le paramètre `keyframe_interval` doit être strictement supérieur à `0`.")
+        self._keyframe_interval = keyframe_interval
+
+        # Points de contrôle
+        self._checkpoints = list()
+        self._last = None
+
+    @property
+    def checkpoints(self) -> list[Checkpoint]:
+        return self._checkpoints
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(keyframe_interval={self._keyframe_interval}, "\
+               f"checkpoints={len(self._checkpoints)})"
+
+    def restore(self, checkpoints: list[Checkpoint]) -> None:
+        """
+        Restaure des points de contrôle, par exemple depuis un fichier.
+
+        :param checkpoints: Points de contrôle, par numéro de ronde, le premier étant une image clé.
+        """
+        if checkpoints and (checkpoints[0].indexes is not None):
+            raise ValueError("Le premier élément du paramètre `checkpoints` doit être une image clé.")
+        self._checkpoints = list(checkpoints)
+        self._last = None
+        if checkpoints:
+            self._last = self._expand(len(checkpoints) - 1)
+
+    def record(self, number: int, registry: list[Fencer] | list[Team],
+               participants: set[Fencer] | set[Team]) -> None:
+        """
+        Enregistre les scores à la fin d'une ronde, en remplaçant les points de contrôle suivants s'il y en a.
+
+        :param number: Numéro de la ronde, ``0`` pour l'état précédant la première ronde.
+        :param registry: Registre des tireurs/équipes.
+        :param participants: Tireurs/Équipes participant.e.s.
+        """
+        if (number < 0) or (number > len(self._checkpoints)):
+            raise ValueError(f"Le paramètre `number` doit être compris entre `0` et `{len(self._checkpoints)}`.")
+
+        # Abandon des points de contrôle suivants
+        if number < len(self._checkpoints):
+            del self._checkpoints[number:]
+            self._last = self._expand(number - 1) if number > 0 else None
+
+        # Tableaux complets
+        full: Checkpoint = Checkpoint(len(registry), None,
+                                      bytes(participant in participants for participant in registry),
+                                      array("d", (participant.victories for participant in registry)),
+                                      array("q", (participant.touches_scored for participant in registry)),
+                                      array("q", (participant.touches_received for participant in registry)))
+
+        # Image clé
+        if (self._last is None) or (number % self._keyframe_interval == 0):
+            self._checkpoints.append(full)
+
+        # Différences avec la ronde précédente
+        else:
+            last: Checkpoint = self._last
+            indexes: array = array("l", (i for i in range(full.size)
+                                         if (i >= last.size) or (full.flags[i] != last.flags[i])
+                                         or (full.victories[i] != last.victories[i])
+                                         or (full.touches_scored[i] != last.touches_scored[i])
+                                         or (full.touches_received[i] != last.touches_received[i])))
+            self._checkpoints.append(Checkpoint(full.size, indexes,
+                                                bytes(full.flags[i] for i in indexes),
+                                                array("d", (full.victories[i] for i in indexes)),
+                                                array("q", (full.touches_scored[i] for i in indexes)),
+                                                array("q", (full.touches_received[i] for i in indexes))))
+        self._last = full
+
+    def standings(self, number: int, registry: list[Fencer] | list[Team]) -> list[Standing]:
+        """
+        Classement à la fin d'une ronde.
+
+        :param number: Numéro de la ronde, ``0`` pour l'état précédant la première ronde.
+        :param registry: Registre des tireurs/équipes.
+        :return: Classement des tireurs/équipes participant.e.s.
+        """
+        checkpoint: Checkpoint = self._expand(number)
+        return rank((registry[i], checkpoint.victories[i], checkpoint.touches_scored[i], checkpoint.touches_received[i])
+                    for i in range(checkpoint.size) if checkpoint.flags[i])
+
+    def _expand(self, number: int) -> Checkpoint:
+        """
+        Reconstruit les tableaux complets d'une ronde, depuis l'image clé la plus proche.
+
+        :param number: Numéro de la ronde.
+        :return: Point de contrôle complet.
+        """
+        if (number < 0) or (number >= len(self._checkpoints)):
+            raise ValueError(f"Le paramètre `number` doit être compris entre `0` et `{len(self._checkpoints) - 1}`.")
+        if (number == len(self._checkpoints) - 1) and (self._last is not None):
+            return self._last
+
+        # Image clé
+        keyframe: int = number
+        while self._checkpoints[keyframe].indexes is not None:
+            keyframe -= 1
+        checkpoint: Checkpoint = self._checkpoints[keyframe]
+        flags: bytearray = bytearray(checkpoint.flags)
+        victories: array = array("d", checkpoint.victories)
+        touches_scored: array = array("q", checkpoint.touches_scored)
+        touches_received: array = array("q", checkpoint.touches_received)
+
+        # Différences
+        for delta in self._checkpoints[keyframe + 1:number + 1]:
+            missing: int = delta.size - len(flags)
+            if missing > 0:
+                flags.extend(bytes(missing))
+                victories.extend(array("d", bytes(8 * missing)))
+                touches_scored.extend(array("q", bytes(8 * missing)))
+                touches_received.extend(array("q", bytes(8 * missing)))
+            for j, i in enumerate(delta.indexes):
+                flags[i] = delta.flags[j]
+                victories[i] = delta.victories[j]
+                touches_scored[i] = delta.touches_scored[j]
+                touches_received[i] = delta.touches_received[j]
+
+        return Checkpoint(len(flags), None, bytes(flags), victories, touches_scored, touches_received)
+
+
+class ChangeSet(NamedTuple):
+    """
+    Changements du classement d'une compétition, produits par les opérations de son journal.
+
+    :param frozenset[Fencer]|frozenset[Team] participants: Tireurs/Équipes dont le score ou la participation a changé.
+    :param bool is_full: Nécessité de recalculer entièrement le classement.
+    """
+    #: Tireurs/Équipes dont le score ou la participation a changé
+    participants: frozenset[Fencer] | frozenset[Team]
+    #: Nécessité de recalculer entièrement le classement
+    is_full: bool = False
+
+    @classmethod
+    def from_journal(cls, operation: str, event: Event | tuple[Event, ...] | None) -> "ChangeSet":
+        """
+        Changements produits par une opération du journal.
+
+        Un nouvel événement ne modifie que les participants concernés, alors qu'une annulation ou un déplacement dans
+        le journal restaure un état complet.
+
+        :param operation: Opération du journal : ``'record'``, ``'extend'``, ``'undo'``, ``'redo'``, ``'seek'``,
+            ``'score'``, les scores en cours ne modifiant pas le classement, ou ``'change'``.
+        :param event: Événement concerné, s'il existe, ou événements du lot pour ``'extend'``.
+        :return: Changements du classement.
+        """
+        if operation == "extend":
+            participants: set[Fencer] | set[Team] = set()
+            for batch_event in event:
+                participants.update(cls.from_journal("record", batch_event).participants)
+            return cls(frozenset(participants))
+        if operation == "score":
+            return cls(frozenset())
+        if (operation not in ("record", "redo")) or (event is None):
+            return cls(frozenset(), True)
+        if event.kind in ("registration", "withdrawal"):
+            return cls(frozenset((event.subject,)))
+        if event.kind == "validation":
+            return cls(frozenset(participant for participant in (event.subject.participant1,
+                                                                 event.subject.participant2)
+                                 if participant is not None))
+        return cls(frozenset())
+
+    def merge(self, other: "ChangeSet") -> "ChangeSet":
+        """
+        Fusionne deux ensembles de changements, par exemple pour un seul rafraîchissement de l'affichage.
+
+        :param other: Changements suivants.
+        :return: Changements cumulés.
+        """
+        if self.is_full or other.is_full:
+            return ChangeSet(frozenset(), True)
+        return ChangeSet(self.participants | other.participants)
+
+
+class Ranking:
+    """
+    Classe représentant le classement trié d'une compétition, mis à jour participant par participant.
+
+    L'ordre est celui de `rank` : victoires, indice et touches portées décroissants, puis nom. Le rang d'une ligne est
+    retrouvé par dichotomie, si bien qu'une mise à jour ne coûte qu'en proportion des participants modifiés.
+
+    :param Iterable[Fencer]|Iterable[Team] participants: Tireurs/Équipes classé.e.s.
+    """
+    #: Clés de tri des tireurs/équipes, triées
+    _keys: list[tuple]
+    #: Clés de tri, par identité du tireur/équipe
+    _keys_by_id: dict[int, tuple]
+    #: Tireurs/Équipes classé.e.s, par identité
+    _participants: dict[int, Fencer | Team]
+
+    def __init__(self, participants: Iterable[Fencer] | Iterable[Team] = ()) -> None:
+        """
+        Initialise un nouveau classement.
+        """
+        self.reset(participants)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(participants={len(self._keys)})"
+
+    @staticmethod
+    def _key(participant: Fencer | Team) -> tuple:
+        """
+        Clé de tri d'un.e tireur/équipe.
+
+        :param participant: Tireur/Équipe.
+        :return: Score opposé, nom et identité.
+        """
+        return (-participant.victories, participant.touches_received - participant.touches_scored,
+                -participant.touches_scored, participant.name, id(participant))
+
+    def reset(self, participants: Iterable[Fencer] | Iterable[Team]) -> None:
+        """
+        Recalcule entièrement le classement.
+
+        :param participants: Tireurs/Équipes classé.e.s.
+        """
+        self._participants = {id(participant): participant for participant in participants}
+        self._keys_by_id = {i: self._key(participant) for i, participant in self._participants.items()}
+        self._keys = sorted(self._keys_by_id.values())
+
+    def update(self, participants: Iterable[Fencer] | Iterable[Team],
+               active: set[Fencer] | set[Team]) -> tuple[int, int] | None:
+        """
+        Replace des tireurs/équipes dans le classement, d'après leur score et leur participation actuels.
+
+        :param participants: Tireurs/Équipes dont le score ou la participation a changé.
+        :param active: Tireurs/Équipes participant.e.s.
+        :return: Positions ``[début, fin[`` des lignes modifiées, ou `None`.
+        """
+        size: int = len(self._keys)
+        positions: list[int] = list()
+        scores: set[tuple] = set()
+        for participant in participants:
+            # Retrait de l'ancienne position
+            key: tuple | None = self._keys_by_id.pop(id(participant), None)
+            if key is not None:
+                position: int = bisect_left(self._keys, key)
+                del self._keys[position]
+                del self._participants[id(participant)]
+                positions.append(position)
+                scores.add(key[:3])
+
+            # Nouvelle position
+            if participant in active:
+                key = self._key(participant)
+                insort(self._keys, key)
+                self._keys_by_id[id(participant)] = key
+                self._participants[id(participant)] = participant
+                positions.append(bisect_left(self._keys, key))
+                scores.add(key[:3])
+
+        if not positions:
+            return None
+        if len(self._keys) != size:
+            return min(positions), max(size, len(self._keys))
+
+        # Les ex æquo quittés ou rejoints par un participant replacé changent de rang avec lui
+        end: int = max(positions) + 1
+        for victories, indicator, scored in scores:
+            end = max(end, bisect_left(self._keys, (victories, indicator, scored + 1)))
+        return min(positions), end
+
+    def position(self, participant: Fencer | Team) -> int | None:
+        """
+        Position d'un.e tireur/équipe dans le classement.
+
+        :param participant: Tireur/Équipe.
+        :return: Position, ou `None` s'il/elle n'est pas classé.e.
+        """
+        key: tuple | None = self._keys_by_id.get(id(participant))
+        if key is None:
+            return None
+        return bisect_left(self._keys, key)
+
+    def standing(self, position: int) -> Standing:
+        """
+        Ligne du classement à une position.
+
+        :param position: Position dans le classement.
+        :return: Ligne du classement, le rang étant partagé en cas d'égalité.
+        """
+        key: tuple = self._keys[position]
+        participant: Fencer | Team = self._participants[key[-1]]
+        return Standing(bisect_left(self._keys, key[:3]) + 1, participant, participant.victories,
+                        participant.touches_scored - participant.touches_received, participant.touches_scored,
+                        participant.touches_received)
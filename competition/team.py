@@ -345,3 +345,23 @@ class Team:
 
         # Mémoire de l'équipe
         self._has_been_exempted = True
+
+    def restore(self, victories: float, touches_scored: int, touches_received: int, *,
+                opponents_encountered: set["Team"], has_been_exempted: bool) -> None:
+        """
+        Restaure le score et la mémoire de l'équipe.
+
+        :param victories: Victoires de l'équipe.
+        :param touches_scored: Touches portées par l'équipe.
+        :param touches_received: Touches reçues par l'équipe.
+        :param opponents_encountered: Équipes adverses rencontrées.
+        :param has_been_exempted: Exemption de l'équipe.
+        """
+        # Score de l'équipe
+        self._victories = victories
+        self._touches_scored = touches_scored
+        self._touches_received = touches_received
+
+        # Mémoire de l'équipe
+        self._opponents_encountered = opponents_encountered
+        self._has_been_exempted = has_been_exempted
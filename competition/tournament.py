@@ -1,6 +1,13 @@
+from collections.abc import Iterable, MutableSequence
+
+from assault.match import Match, MatchConflictError
 from assault.round import Round
+from assault.score import Score
 
 from competition.fencer import Fencer
+from competition.journal import Event, Journal
+from competition.snapshots import SnapshotPublisher, TournamentSnapshot
+from competition.standings import Checkpoint, Checkpoints, Standing, rank
 from competition.team import Team
 
 
@@ -36,7 +43,17 @@ class Tournament:
     #: Tireurs/Équipes de la compétition
     _participants: set[Fencer] | set[Team]
     #: Rondes de la compétition
-    _round: list[Round]
+    _rounds: MutableSequence[Round]
+    #: Registre de tous les tireurs/équipes inscrit.e.s, dans l'ordre d'inscription
+    _registry: list[Fencer] | list[Team]
+    #: Indices des tireurs/équipes dans le registre
+    _registry_indexes: dict[Fencer, int] | dict[Team, int]
+    #: Journal des événements de la compétition
+    _journal: Journal
+    #: Points de contrôle des scores à la fin de chaque ronde
+    _checkpoints: Checkpoints
+    #: Publication des instantanés de la compétition
+    _publisher: SnapshotPublisher
 
     def __init__(self,
                  name: str,
@@ -94,6 +111,17 @@ class Tournament:
         # Rondes
         self._rounds = list()
 
+        # Registre
+        self._registry = list()
+        self._registry_indexes = dict()
+
+        # Journal
+        self._journal = Journal(self)
+        self._checkpoints = Checkpoints()
+
+        # Instantanés
+        self._publisher = SnapshotPublisher(self)
+
     @property
     def name(self) -> str:
         return self._name
@@ -110,6 +138,94 @@ class Tournament:
                f"category={self._category!r}, kind={self._kind!r}, maximum_score={self._maximum_score}, "\
                f"licences_are_needed={self._licences_are_needed}, draws_are_allowed={self._draws_are_allowed}"
 
+    @property
+    def weapon(self) -> str:
+        return self._weapon
+
+    @property
+    def gender(self) -> str:
+        return self._gender
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def maximum_score(self) -> int:
+        return self._maximum_score
+
+    @property
+    def licences_are_needed(self) -> bool:
+        return self._licences_are_needed
+
+    @property
+    def draws_are_allowed(self) -> bool:
+        return self._draws_are_allowed
+
+    @property
+    def participants(self) -> set[Fencer] | set[Team]:
+        return self._participants
+
+    @property
+    def rounds(self) -> MutableSequence[Round]:
+        return self._rounds
+
+    @property
+    def registry(self) -> list[Fencer] | list[Team]:
+        return self._registry
+
+    @property
+    def journal(self) -> Journal:
+        return self._journal
+
+    @property
+    def checkpoints(self) -> list[Checkpoint]:
+        return self._checkpoints.checkpoints
+
+    @property
+    def snapshot(self) -> TournamentSnapshot:
+        """
+        Dernier instantané immuable de la compétition, publié après chaque opération du journal.
+
+        Les travaux en arrière-plan lisent cet instantané plutôt que les tireurs/équipes et les matchs, modifiés par le
+        fil de l'interface : il reste cohérent sans verrou, quelles que soient les modifications suivantes.
+        """
+        return self._publisher.snapshot
+
+    def participant_index(self, participant: Fencer | Team) -> int:
+        """
+        Cherche l'indice d'un.e tireur/équipe dans le registre de la compétition.
+
+        :param participant: Tireur/Équipe inscrit.e.
+        :return: Indice du tireur/équipe dans le registre.
+        """
+        return self._registry_indexes[participant]
+
+    def standings(self, *,
+                  as_of_round: int | None = None) -> list[Standing]:
+        """
+        Classement de la compétition, actuel ou à la fin d'une ronde.
+
+        Les classements passés sont reconstruits à partir des points de contrôle, sans rejouer les validations.
+
+        :param as_of_round: Numéro de la ronde, ``0`` pour l'état précédant la première ronde, ou `None`.
+        :return: Classement des tireurs/équipes participant.e.s.
+        """
+        # Classement actuel
+        if (as_of_round is None) or (as_of_round == len(self._rounds)):
+            return rank((participant, participant.victories, participant.touches_scored, participant.touches_received)
+                        for participant in self._participants)
+
+        # Classement passé
+        if (as_of_round < 0) or (as_of_round > len(self._rounds)):
+            raise ValueError(f"Le paramètre `as_of_round` doit être compris entre `0` et `{len(self._rounds)}`, "
+                             f"ou `None`.")
+        return self._checkpoints.standings(as_of_round, self._registry)
+
     def add_participant(self, participant: Fencer | Team) -> None:
         """
         Ajoute un participant à la compétition.
@@ -120,7 +236,28 @@ class Tournament:
             raise TypeError("Le paramètre `participant` doit être une instance de `Fencer`.")
         elif isinstance(participant, Fencer) and (self._kind == "Équipe"):
             raise TypeError("Le paramètre `participant` doit être une instance de `Team`.")
-        self._participants.add(participant)
+        if participant not in self._participants:
+            self._journal.record(Event("registration", participant))
+
+    def add_participants(self, participants: Iterable[Fencer | Team]) -> int:
+        """
+        Ajoute des participants à la compétition, par lot, par exemple depuis une importation.
+
+        :param participants: Participants entrants.
+        :return: Nombre de participants ajoutés.
+        """
+        expected: type = Fencer if self._kind == "Individuelle" else Team
+        registered: set[Fencer] | set[Team] = set()
+        events: list[Event] = list()
+        for participant in participants:
+            if not isinstance(participant, expected):
+                raise TypeError(f"Les éléments du paramètre `participants` doivent être des instances de "
+                                f"`{expected.__name__}`.")
+            if (participant not in self._participants) and (participant not in registered):
+                registered.add(participant)
+                events.append(Event("registration", participant))
+        # Un seul ajout au journal pour tout le lot : une seule publication et une seule notification
+        return self._journal.extend(events)
 
     def remove_participant(self, participant: Fencer | Team) -> None:
         """
@@ -128,7 +265,238 @@ class Tournament:
 
         :param participant: Participant sortant.
         """
-        self._participants.discard(participant)
+        if participant in self._participants:
+            self._journal.record(Event("withdrawal", participant))
+
+    def check_pairing(self) -> None:
+        """
+        Vérifie qu'une nouvelle ronde peut être appariée.
+        """
+        if len(self._participants) < 2:
+            raise ValueError("La compétition doit compter au moins deux participants.")
+        if self._rounds and not all(match.is_validated for match in self._rounds[-1].matches):
+            raise ValueError(f"Les résultats de la ronde {len(self._rounds)} ne sont pas tous validés.")
+
+    def new_round(self) -> Round:
+        """
+        Apparie une nouvelle ronde entre les participants de la compétition.
+
+        :return: Ronde appariée.
+        """
+        new_round: Round = Round(len(self._rounds) + 1, self._maximum_score, self._draws_are_allowed,
+                                 set(self._participants))
+        new_round.matches  # Appariement
+        self._journal.record(Event("pairing", new_round))
+        return new_round
+
+    def add_round(self, paired_round: Round) -> None:
+        """
+        Ajoute une ronde déjà appariée à la compétition, par exemple depuis une sauvegarde.
+
+        :param paired_round: Ronde appariée, numérotée à la suite des précédentes.
+        """
+        if paired_round.number != len(self._rounds) + 1:
+            raise ValueError(f"Le numéro du paramètre `paired_round` doit être `{len(self._rounds) + 1}`.")
+        if not paired_round.is_paired:
+            raise ValueError("Le paramètre `paired_round` doit être apparié.")
+        self._journal.record(Event("pairing", paired_round))
+
+    def check_result(self, match: Match, score1: Score, score2: Score) -> None:
+        """
+        Vérifie qu'un résultat peut être saisi pour un match de la compétition.
+
+        :param match: Match à valider.
+        :param score1: Score du premier tireur/équipe.
+        :param score2: Score du second tireur/équipe.
+        """
+        if match.is_validated:
+            raise ValueError("Match déjà validé.")
+        if (match.participant1 is None) or (match.participant2 is None):
+            raise ValueError("Exemption, sans score.")
+        if max(score1.touches, score2.touches) > self._maximum_score:
+            raise ValueError(f"Score supérieur au score maximum `{self._maximum_score}`.")
+        if (score1 == score2) and not self._draws_are_allowed:
+            raise ValueError("Match nul non autorisé.")
+
+    def submit_result(self, match: Match, score1: Score, score2: Score, *,
+                      version: int) -> int:
+        """
+        Soumet le résultat d'un match par comparaison et échange de sa version, puis le valide.
+
+        Le résultat n'est appliqué que si le match n'a pas été modifié depuis la version connue de son auteur. Un
+        résultat identique à celui d'un match déjà validé est accepté sans effet, ce qui rend la soumission idempotente.
+        La vérification et l'application s'exécutent sans interruption dans le fil qui possède la compétition :
+        plusieurs sources de résultats ne peuvent pas appliquer deux fois un même match.
+
+        :param match: Match à valider.
+        :param score1: Score du premier tireur/équipe.
+        :param score2: Score du second tireur/équipe.
+        :param version: Version du match connue de l'auteur du résultat.
+        :return: Nouvelle version du match.
+        """
+        # Soumission renouvelée
+        if match.is_validated and (match.score1 is not None) and (match.score2 is not None)\
+                and (match.score1, match.score2) == (score1, score2):
+            return match.version
+
+        # Comparaison, puis échange
+        if match.version != version:
+            raise MatchConflictError(match, version)
+        self.check_result(match, score1, score2)
+        match.score1 = Score(score1.touches, score1.status)
+        match.score2 = Score(score2.touches, score2.status)
+        self.validate_match(match)
+        return match.version
+
+    def update_score(self, match: Match, score1: Score, score2: Score) -> int:
+        """
+        Met à jour les scores en cours d'un match, sans le valider, par exemple depuis un appareil de signalisation.
+
+        Les abonnés du journal en sont notifiés par l'opération ``'score'`` : le service des pistes, le bus
+        d'événements et la sauvegarde automatique suivent le match en cours.
+
+        :param match: Match en cours.
+        :param score1: Score du premier tireur/équipe.
+        :param score2: Score du second tireur/équipe.
+        :return: Nouvelle version du match.
+        """
+        if match.is_validated:
+            raise ValueError("Match déjà validé.")
+        if (match.participant1 is None) or (match.participant2 is None):
+            raise ValueError("Exemption, sans score.")
+        if max(score1.touches, score2.touches) > self._maximum_score:
+            raise ValueError(f"Score supérieur au score maximum `{self._maximum_score}`.")
+        match.score1 = Score(score1.touches, score1.status)
+        match.score2 = Score(score2.touches, score2.status)
+        self._journal.notify_score(match)
+        return match.version
+
+    def validate_match(self, match: Match) -> None:
+        """
+        Valide un match de la compétition et applique son résultat aux tireurs/équipes.
+
+        :param match: Match à valider.
+        """
+        if match.is_validated:
+            raise ValueError("Le paramètre `match` ne doit pas être déjà validé.")
+        score1: Score | None = None if match.score1 is None else Score(match.score1.touches, match.score1.status)
+        score2: Score | None = None if match.score2 is None else Score(match.score2.touches, match.score2.status)
+        self._journal.record(Event("validation", match, score1, score2))
+
+    def undo(self) -> Event | None:
+        """
+        Annule le dernier événement de la compétition.
+
+        :return: Événement annulé, s'il existe.
+        """
+        return self._journal.undo()
+
+    def redo(self) -> Event | None:
+        """
+        Rétablit le dernier événement annulé de la compétition.
+
+        :return: Événement rétabli, s'il existe.
+        """
+        return self._journal.redo()
+
+    def seek_round(self, number: int) -> None:
+        """
+        Place la compétition dans l'état de la fin d'une ronde.
+
+        Les événements suivants restent rétablissables avec :meth:`redo`, tant qu'aucun nouvel événement n'est ajouté.
+
+        :param number: Numéro de la ronde, ``0`` pour l'état précédant la première ronde.
+        """
+        self._journal.seek(self._journal.round_position(number))
+
+    def publish(self) -> TournamentSnapshot:
+        """
+        Publie un nouvel instantané complet de la compétition, après une modification hors du journal, par exemple du
+        club d'un tireur ou de la composition d'une équipe.
+
+        Les abonnés du journal en sont notifiés par l'opération ``'change'`` : la sauvegarde automatique enregistre
+        toute la compétition et les classements repartent de son état complet.
+
+        Comme toute modification, la publication doit être faite par le fil qui possède la compétition.
+
+        :return: Instantané publié.
+        """
+        self._journal.notify_change()
+        return self._publisher.snapshot
+
+    def restore(self, registry: list[Fencer] | list[Team], participants: set[Fencer] | set[Team],
+                rounds: MutableSequence[Round], checkpoints: list[Checkpoint]) -> None:
+        """
+        Restaure l'état d'une compétition, par exemple depuis un fichier, sans rejouer ses événements.
+
+        Le journal repart de cet état : les événements antérieurs ne sont pas annulables.
+
+        :param registry: Registre de tous les tireurs/équipes inscrit.e.s, dans l'ordre d'inscription.
+        :param participants: Tireurs/Équipes participant.e.s.
+        :param rounds: Rondes appariées, conservées telles quelles pour permettre leur chargement à la demande.
+        :param checkpoints: Points de contrôle des scores à la fin de chaque ronde.
+        """
+        # Registre
+        self._registry = list(registry)
+        self._registry_indexes = {participant: i for i, participant in enumerate(self._registry)}
+
+        # Participants et rondes
+        self._participants = set(participants)
+        self._rounds = rounds
+
+        # Points de contrôle et journal
+        self._checkpoints.restore(checkpoints)
+        self._journal = Journal(self)
+
+        # Instantané
+        self._publisher.publish()
+
+    def _apply(self, event: Event) -> None:
+        """
+        Applique un événement du journal à la compétition.
+
+        :param event: Événement à appliquer.
+        """
+        # Inscription
+        if event.kind == "registration":
+            if event.subject not in self._registry_indexes:
+                self._registry_indexes[event.subject] = len(self._registry)
+                self._registry.append(event.subject)
+            self._participants.add(event.subject)
+
+        # Retrait
+        elif event.kind == "withdrawal":
+            self._participants.discard(event.subject)
+
+        # Appariement
+        elif event.kind == "pairing":
+            self._checkpoints.record(len(self._rounds), self._registry, self._participants)
+            self._rounds.append(event.subject)
+
+        # Validation
+        elif event.kind == "validation":
+            event.subject.score1 = event.score1
+            event.subject.score2 = event.score2
+            event.subject.validate()
+
+    def _publish(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Publie l'instantané de la compétition qui suit une opération du journal.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        """
+        self._publisher.publish_changes(operation, event)
+
+    def _restore(self, participants: set[Fencer] | set[Team], rounds: int) -> None:
+        """
+        Restaure les participants et les rondes de la compétition, à partir d'un instantané du journal.
+
+        :param participants: Participants de la compétition.
+        :param rounds: Nombre de rondes appariées.
+        """
+        self._participants = participants
+        del self._rounds[rounds:]
 
 
 
@@ -3,7 +3,27 @@ from tkinter import ttk
 from tkinter import filedialog as fd
 import tkinter.messagebox as mb
 import tkinter.colorchooser as cc
-from PIL import Image, ImageDraw, ImageTk, ImageFont
+
+from competition.fencer import Fencer
+from competition.team import Team
+from competition.tournament import Tournament
+from storage import autosave, exporters, importer, tournamentfile
+from windows import rendering
+from windows.participantsview import ParticipantsView
+from windows.roundproperties import RoundProperties
+from windows.standingsview import StandingsView
+
+#: Armes du formulaire, vers les armes de la compétition
+WEAPONS = {"Epée": "Épée"}
+#: Types du formulaire, vers les types de la compétition
+KINDS = {"Individuel": "Individuelle", "Equipe": "Équipe"}
+#: Nombre maximum d'erreurs d'importation affichées
+MAX_IMPORT_ERRORS = 20
+#: Couleurs par défaut des onglets
+DEFAULT_BACKGROUND = "#008000"
+DEFAULT_FOREGROUND = "#FFFFFF"
+#: Délai après lequel les widgets d'un onglet masqué sont libérés, en millisecondes
+TAB_RELEASE_DELAY = 5 * 60 * 1000
 
 
 class FencerProperties(tk.Toplevel):
@@ -236,9 +256,9 @@ class FencerProperties(tk.Toplevel):
             mb.showerror(title="Erreur saisie", message="Veuillez renseigner le prénom du participant.", parent=self)
         elif self.parent.tournament_properties["kind"] == "Equipe" and fencer["team"] == "":
             mb.showerror(title="Erreur saisie", message="Veuillez renseigner l'équipe du participant.", parent=self)
-        elif self.parent.tournament_properties["licence"] and fencer["age"] == "":
+        elif fencer["age"] == "":
             mb.showerror(title="Erreur saisie", message="Veuillez renseigner l'âge du participant.", parent=self)
-        elif self.parent.tournament_properties["licence"] and fencer["gender"] == "":
+        elif fencer["gender"] == "":
             mb.showerror(title="Erreur saisie", message="Veuillez renseigner le sexe du participant.", parent=self)
         elif self.parent.tournament_properties["licence"] and fencer["club"] == "":
             mb.showerror(title="Erreur saisie", message="Veuillez renseigner le club du participant.", parent=self)
@@ -246,59 +266,28 @@ class FencerProperties(tk.Toplevel):
             mb.showerror(title="Erreur saisie", message="Veuillez renseigner la licence du participant.", parent=self)
         else:
 
-            # Ajout d'une nouvelle équipe et/ou d'un nouveau club et attribution des indices correspondants
-            new_team = False
-            team_index = None
-            club_index = None
-            if self.parent.tournament_properties["kind"] == "Equipe":
-                try:
-                    team_index = list(map(lambda x: x.casefold(), self.parent.tournament_teams)).index(
-                        fencer["team"].casefold())
-                except ValueError:
-                    new_team = True
-                    team_index = len(self.parent.tournament_teams)
-                    self.parent.tournament_teams.append(fencer["team"])
-                    self.parent.total_teams_added += 1
-            if self.parent.tournament_properties["licence"]:
-                try:
-                    club_index = list(map(lambda x: x.casefold(), self.parent.tournament_clubs)).index(
-                        fencer["club"].casefold())
-                except ValueError:
-                    club_index = len(self.parent.tournament_clubs)
-                    self.parent.tournament_clubs.append(fencer["club"])
-            self.parent.total_fencers_added += 1
-            fencer["team"] = team_index
-            fencer["club"] = club_index
-
-            # Préparation de l'entrée du tableau correspondant au participant
-            tournament_fencer = []
-            if fencer["team"] is not None:
-                tournament_fencer.append(self.parent.tournament_teams[fencer["team"]])
-            tournament_fencer.extend([fencer["name"], fencer["firstname"], fencer["age"], fencer["gender"]])
-            if fencer["club"] is not None:
-                tournament_fencer.append(self.parent.tournament_clubs[fencer["club"]])
-            tournament_fencer.append(fencer["licence"])
-
-            # Insertion d'une nouvelle équipe dans le tableau
-            if new_team and self.parent.tournament_properties["licence"]:
-                self.parent.table.insert("", tk.END, values=(tournament_fencer[0], "", "", "", "", "", ""),
-                                         iid=f"T{self.parent.total_teams_added}", open=True,
-                                         tags=(str(len(self.parent.tournament_fencers) % 2),))
-            elif new_team:
-                self.parent.table.insert("", tk.END, values=(tournament_fencer[0], "", "", "", ""),
-                                         iid=f"T{self.parent.total_teams_added}", open=True,
-                                         tags=(str(len(self.parent.tournament_fencers) % 2),))
-
-            # Insertion du nouveau participant dans le tableau
+            # Tireur
+            try:
+                participant = Fencer(fencer["name"], fencer["firstname"], fencer["gender"], int(fencer["age"]),
+                                     club=fencer["club"] or None,
+                                     licence=int(fencer["licence"]) if fencer["licence"] else None,
+                                     has_team=self.parent.tournament_properties["kind"] == "Equipe")
+            except ValueError as error:
+                mb.showerror(title="Erreur saisie", message=str(error), parent=self)
+                return
+
+            # Inscription par le journal, dans une équipe existante ou nouvelle pour une compétition par équipe
+            tournament = self.parent.tournament
             if self.parent.tournament_properties["kind"] == "Equipe":
-                self.parent.table.insert(f"T{team_index + 1}", tk.END, values=tournament_fencer,
-                                         iid=f"F{self.parent.total_fencers_added}",
-                                         tags=(str(len(self.parent.tournament_fencers) % 2),))
+                team = next((team for team in tournament.participants
+                             if team.name.casefold() == fencer["team"].casefold()), None)
+                if team is None:
+                    tournament.add_participant(Team(fencer["team"], fencers={participant}))
+                else:
+                    team.add_fencer(participant)
+                    tournament.publish()
             else:
-                self.parent.table.insert("", tk.END, values=tournament_fencer,
-                                         iid=f"F{self.parent.total_fencers_added}",
-                                         tags=(str(len(self.parent.tournament_fencers) % 2),))
-            self.parent.tournament_fencers.append(tournament_fencer)
+                tournament.add_participant(participant)
 
             # Ajout d'un autre participant au tournoi
             self.destroy()
@@ -306,17 +295,30 @@ class FencerProperties(tk.Toplevel):
 
 
 class TournamentFrame(ttk.Frame):
+    """
+    Onglet d'une compétition.
+
+    Les widgets de l'onglet ne sont construits qu'à son premier affichage, et libérés lorsqu'il reste masqué plus de
+    `TAB_RELEASE_DELAY` millisecondes : la compétition est conservée pour les reconstruire.
+    """
 
     def __init__(self, master, id_, background, foreground, heading, weapon, gender, category, score, kind, licence,
-                 draw):
+                 draw, tournament=None, file_path=None):
         super().__init__(master)
 
         # Caractéristiques du tableau
         self.frame_id = id_
         self.color_background = background
         self.color_foreground = foreground
-        self.total_teams_added = 0
-        self.total_fencers_added = 0
+
+        # Compétition et fichier associé
+        if tournament is None:
+            tournament = Tournament(heading, WEAPONS.get(weapon, weapon), gender, category, KINDS[kind], score, licence,
+                                    draw)
+        self.tournament = tournament
+        self.file_path = file_path
+        self.autosave = None
+        self.exporter = None
 
         # Caractéristiques du tournoi
         self.tournament_properties = {"heading": heading,
@@ -327,77 +329,176 @@ class TournamentFrame(ttk.Frame):
                                       "kind": kind,
                                       "licence": licence,
                                       "draw": draw}
-        self.tournament_teams = []
-        self.tournament_clubs = []
-        self.tournament_fencers = []
 
-        self.create_actions()
-        self.table = self.create_table()
+        # Widgets, construits au premier affichage
+        self.participants_view = None
+        self.standings_view = None
+        self.release_id = None
+
+    @property
+    def is_built(self):
+        return self.participants_view is not None
+
+    @property
+    def tournament_teams(self):
+        """
+        Noms des équipes participantes, dans l'ordre d'inscription, proposés à la saisie d'un tireur.
+        """
+        if self.tournament.kind != "Équipe":
+            return []
+        return [team.name for team in self.tournament.registry if team in self.tournament.participants]
+
+    @property
+    def tournament_clubs(self):
+        """
+        Clubs des tireurs participants, dans l'ordre d'inscription, proposés à la saisie d'un tireur.
+        """
+        clubs = {}
+        for participant in self.tournament.registry:
+            if participant in self.tournament.participants:
+                fencers = participant.fencers_sorted_by_name if isinstance(participant, Team) else (participant,)
+                clubs.update((fencer.club, None) for fencer in fencers if fencer.club)
+        return list(clubs)
+
+    def show(self):
+        """
+        Construit les widgets de l'onglet s'ils n'existent pas, et annule leur libération programmée.
+        """
+        if self.release_id is not None:
+            self.after_cancel(self.release_id)
+            self.release_id = None
+        if not self.is_built:
+            self.create_actions()
+            self.participants_view = self.create_table()
+            self.standings_view = self.create_standings()
+
+    def hide(self):
+        """
+        Programme la libération des widgets de l'onglet, qui vient d'être masqué.
+        """
+        if self.is_built and self.release_id is None:
+            self.release_id = self.after(TAB_RELEASE_DELAY, self.release)
+
+    def release(self):
+        """
+        Détruit les widgets de l'onglet, en conservant la compétition.
+
+        La libération est reportée tant qu'une fenêtre de l'onglet est ouverte : elle en est un widget enfant et
+        utilise son tableau.
+        """
+        if any(isinstance(child, tk.Toplevel) for child in self.winfo_children()):
+            self.release_id = self.after(TAB_RELEASE_DELAY, self.release)
+            return
+        self.release_id = None
+        for child in self.winfo_children():
+            child.destroy()
+        self.participants_view = None
+        self.standings_view = None
 
     def create_actions(self):
         ttk.Style().configure("TButton", font="Arial 16")
 
         add_button = ttk.Button(self, command=self.add_fencer, text="Ajouter")
+        import_button = ttk.Button(self, command=self.import_participants, text="Importer")
         remove_button = ttk.Button(self, command=self.remove_fencers, text="Enlever")
+        round_button = ttk.Button(self, command=self.new_round, text="Nouvelle ronde")
 
         add_button.pack(anchor=tk.NW)
+        import_button.pack(anchor=tk.NW)
         remove_button.pack(anchor=tk.NW)
+        round_button.pack(anchor=tk.NW)
 
     def create_table(self):
+        """
+        Crée le tableau virtualisé des participants de la compétition.
+        """
         custom_style_name = f"My{self.frame_id}.Treeview"
         ttk.Style().configure(f"{custom_style_name}.Heading", font="Consolas 16", background=self.color_background,
                               foreground=self.color_foreground)
         ttk.Style().configure("Treeview", font="Consolas 14")
+        view = ParticipantsView(self, self.tournament, licence=self.tournament_properties["licence"],
+                                style=custom_style_name)
+        view.pack(fill="both", expand=True)
+        view.refresh()
+        return view
 
-        if self.tournament_properties["kind"] == "Individuel" and self.tournament_properties["licence"]:
-            columns = ("name", "firstname", "age", "gender", "club", "licence")
-        elif self.tournament_properties["kind"] == "Individuel":
-            columns = ("name", "firstname", "age", "gender")
-        elif self.tournament_properties["kind"] == "Equipe" and self.tournament_properties["licence"]:
-            columns = ("team", "name", "firstname", "age", "gender", "club", "licence")
-        else:
-            columns = ("team", "name", "firstname", "age", "gender")
-
-        if self.tournament_properties["kind"] == "Individuel":
-            tree = ttk.Treeview(self, columns=columns, show="headings", style=custom_style_name)
-        else:
-            tree = ttk.Treeview(self, columns=columns, show="tree headings", style=custom_style_name)
-
-        if self.tournament_properties["kind"] == "Equipe":
-            tree.heading("#0", text="Equipe")
-            tree.heading("team", text="Equipe")
-        tree.heading("name", text="Nom")
-        tree.heading("firstname", text="Prénom")
-        tree.heading("age", text="Age")
-        tree.heading("gender", text="Sexe")
-        if self.tournament_properties["licence"]:
-            tree.heading("club", text="Club")
-            tree.heading("licence", text="Licence")
-
-        tree.tag_configure("1", background="#E8E8E8")
-
-        tree.pack(fill="both", expand=True)
-
-        tree.bind("<Double-1>", lambda x: print("Hey !"))  # to complete [modify function]
-
-        return tree
+    def create_standings(self):
+        """
+        Crée le classement virtualisé de la compétition, sous le tableau des participants.
+        """
+        custom_style_name = f"My{self.frame_id}Standings.Treeview"
+        ttk.Style().configure(f"{custom_style_name}.Heading", font="Consolas 16", background=self.color_background,
+                              foreground=self.color_foreground)
+        view = StandingsView(self, self.tournament, style=custom_style_name)
+        view.pack(fill="both", expand=True)
+        view.refresh()
+        return view
 
     def add_fencer(self):
         window = FencerProperties(self)
         window.grab_set()
 
-    def remove_fencers(self):
-        selected_fencers_iid = self.table.selection()
-        selected_fencers_idx = sorted([self.table.index(iid) for iid in selected_fencers_iid], reverse=True)
+    def new_round(self):
+        """
+        Ouvre la fenêtre de la prochaine ronde, appariée en arrière-plan, si la compétition peut l'apparier.
+        """
+        try:
+            self.tournament.check_pairing()
+        except ValueError as error:
+            mb.showerror(title="Nouvelle ronde", message=str(error), parent=self)
+            return
+        window = RoundProperties(self)
+        window.grab_set()
 
-        self.table.delete(*selected_fencers_iid)
-        for idx in selected_fencers_idx:
-            del self.tournament_fencers[idx]
+    def import_participants(self):
+        """
+        Importe les inscriptions d'un fichier CSV ou d'un export fédéral, puis signale les lignes invalides.
+        """
+        file = fd.askopenfilename(title="Importer des inscriptions",
+                                  filetypes=(("Fichiers CSV", "*.csv"), ("Fichiers texte", "*.txt"),
+                                             ("Tous les fichiers", "*.*")), parent=self)
+        if not file:
+            return
+        try:
+            added, errors = importer.import_registrations(file, self.tournament)
+        except (OSError, UnicodeDecodeError, ValueError) as error:
+            mb.showerror(title="Erreur importation", message=f"Impossible d'importer le fichier :\n{error}",
+                         parent=self)
+            return
+
+        # Bilan
+        message = f"{added} participant(s) importé(s)."
+        if errors:
+            message += f"\n{len(errors)} ligne(s) ignorée(s) :\n" + "\n".join(map(str, errors[:MAX_IMPORT_ERRORS]))
+            if len(errors) > MAX_IMPORT_ERRORS:
+                message += "\n…"
+            mb.showwarning(title="Importation", message=message, parent=self)
+        else:
+            mb.showinfo(title="Importation", message=message, parent=self)
 
-        left_fencers_iid = self.table.get_children()
+    def remove_fencers(self):
+        """
+        Retire les participants sélectionnés de la compétition : le tableau suit le journal.
+        """
+        selection = self.participants_view.selection
+        for participant, team in selection:
+            if team is None:
+                self.tournament.remove_participant(participant)
+
+        # Tireurs retirés d'une équipe, qui est retirée à son tour si elle se retrouve vide
+        team_changed = False
+        for fencer, team in selection:
+            if team is None or team not in self.tournament.participants:
+                continue
+            team.remove_fencer(fencer)
+            if team.fencers:
+                team_changed = True
+            else:
+                self.tournament.remove_participant(team)
 
-        for idx, iid in enumerate(left_fencers_iid):
-            self.table.item(iid, tags=(str(idx % 2),))
+        # Compositions modifiées hors du journal, publiées à ses abonnés : sauvegarde automatique, événements, site
+        if team_changed:
+            self.tournament.publish()
 
 
 class TournamentProperties(tk.Toplevel):
@@ -441,18 +542,7 @@ class TournamentProperties(tk.Toplevel):
                 button.config(bg=self.color_background)
 
             if colors[0]:
-                linear_color = []
-                for c in colors[0]:
-                    c_lin = c / 255
-                    if c_lin <= 0.04045:
-                        linear_color.append(c_lin / 12.92)
-                    else:
-                        linear_color.append(((c_lin + 0.055) / 1.055) ** 2.4)
-                lightness = 0.2126 * linear_color[0] + 0.7152 * linear_color[1] + 0.0722 * linear_color[2]
-                if lightness > 0.179:
-                    self.color_foreground = "#000000"
-                else:
-                    self.color_foreground = "#FFFFFF"
+                self.color_foreground = rendering.get_color_font(colors[0]).upper()
                 label.config(foreground=self.color_foreground)
                 button.config(fg=self.color_foreground)
 
@@ -545,26 +635,7 @@ class TournamentProperties(tk.Toplevel):
                 if tournament["heading"] == "":
                     tournament["heading"] = f"{tournament['weapon']}{tournament['gender']}{tournament['category']}"
 
-                if not self.parent.is_notebook:
-                    self.parent.background_notebook = ttk.Notebook(self.parent)
-
-                    self.parent.background_image.pack_forget()
-                    self.parent.background_notebook.pack(fill="both", expand=True)
-
-                    self.parent.is_notebook = True
-
-                frame = TournamentFrame(self.parent.background_notebook, len(self.parent.notebook_frames),
-                                        self.color_background, self.color_foreground, **tournament)
-
-                im = Image.new("RGB", (180, 40), self.color_background)
-                im_draw = ImageDraw.Draw(im)
-                im_draw.text((90, 20), tournament["heading"], fill=self.color_foreground, anchor="mm",
-                             font=ImageFont.truetype("arial", 20))
-                frame.img = ImageTk.PhotoImage(im)
-
-                self.parent.background_notebook.add(frame, image=frame.img)
-
-                self.parent.notebook_frames.append(frame)
+                self.parent.add_tournament_frame(tournament, self.color_background, self.color_foreground)
                 self.destroy()
 
 
@@ -588,6 +659,8 @@ class App(tk.Tk):
         self.create_menu_bar()
         self.background_image = self.create_background()
 
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
     def create_menu_bar(self):
         self.option_add("*Menu*Font", "Arial 12")
 
@@ -603,18 +676,22 @@ class App(tk.Tk):
         menu_recent.add_command(label="Fichier 3")
         menu_file.add_cascade(menu=menu_recent, label="Récemment ouverts", underline=False)
 
-        menu_file.add_command(command=..., label="Enregistrer", underline=False, accelerator="Ctrl+S")
-        menu_file.add_command(command=..., label="Enregistrer sous", underline=False, accelerator="Maj+Ctrl+S")
+        menu_file.add_command(command=self.save_file, label="Enregistrer", underline=False, accelerator="Ctrl+S")
+        menu_file.add_command(command=self.save_file_as, label="Enregistrer sous", underline=False,
+                              accelerator="Maj+Ctrl+S")
+        menu_file.add_command(command=self.export_results, label="Exporter les résultats", underline=False,
+                              accelerator="Ctrl+E")
         menu_file.add_separator()
-        menu_file.add_command(command=self.quit, label="Quitter", underline=True)
+        menu_file.add_command(command=self.close, label="Quitter", underline=True)
         menu_bar.add_cascade(menu=menu_file, label="Fichier", underline=False)
 
         self.config(menu=menu_bar)
 
         self.bind_all("<Control-n>", lambda x: self.new_file())
         self.bind_all("<Control-o>", lambda x: self.open_file())
-        self.bind_all("<Control-s>", lambda x: ...)
-        self.bind_all("<Control-Shift-S>", lambda x: ...)
+        self.bind_all("<Control-s>", lambda x: self.save_file())
+        self.bind_all("<Control-Shift-S>", lambda x: self.save_file_as())
+        self.bind_all("<Control-e>", lambda x: self.export_results())
 
     def create_background(self):
         canvas = tk.Canvas(self, width=700, height=550, bg="#FFFFFF")
@@ -630,9 +707,153 @@ class App(tk.Tk):
         window = TournamentProperties(self)
         window.grab_set()
 
+    def add_tournament_frame(self, tournament, background, foreground, *, model=None, file_path=None):
+        """
+        Ajoute un onglet de compétition à l'application.
+
+        :param tournament: Caractéristiques de la compétition, au format de `TournamentProperties`.
+        :param background: Couleur de fond de l'onglet.
+        :param foreground: Couleur de police de l'onglet.
+        :param model: Compétition déjà construite, par exemple depuis un fichier.
+        :param file_path: Fichier associé à la compétition.
+        :return: L'onglet de la compétition.
+        """
+        if not self.is_notebook:
+            self.background_notebook = ttk.Notebook(self)
+            self.background_notebook.bind("<<NotebookTabChanged>>", lambda x: self.on_tab_changed())
+
+            self.background_image.pack_forget()
+            self.background_notebook.pack(fill="both", expand=True)
+
+            self.is_notebook = True
+
+        frame = TournamentFrame(self.background_notebook, len(self.notebook_frames), background, foreground,
+                                **tournament, tournament=model, file_path=file_path)
+
+        # Bannière, dessinée une seule fois pour un même titre et mêmes couleurs
+        frame.img = rendering.banner_photo(self, tournament["heading"], background, foreground)
+
+        self.background_notebook.add(frame, image=frame.img)
+
+        self.notebook_frames.append(frame)
+        self.on_tab_changed()
+        return frame
+
+    def on_tab_changed(self):
+        """
+        Construit l'onglet affiché, et programme la libération des autres onglets.
+        """
+        current = self.current_frame()
+        for frame in self.notebook_frames:
+            if frame is current:
+                frame.show()
+            else:
+                frame.hide()
+
+    def current_frame(self):
+        """
+        Onglet de compétition affiché, s'il existe.
+        """
+        if not self.is_notebook or not self.notebook_frames:
+            return None
+        return self.notebook_frames[self.background_notebook.index("current")]
+
     def open_file(self):
-        file = fd.askopenfilename(title="Ouvrir", filetypes=(("Fichiers TXT", "*.txt"), ("Tous les fichiers", "*.*")))
-        print(file)
+        file = fd.askopenfilename(title="Ouvrir",
+                                  filetypes=(("Fichiers LFT", f"*{tournamentfile.EXTENSION}"),
+                                             ("Tous les fichiers", "*.*")))
+        if not file:
+            return
+        # Les rondes précédentes sont décodées à la demande
+        try:
+            model = autosave.recover(file)
+        except (OSError, ValueError) as error:
+            mb.showerror(title="Erreur ouverture", message=f"Impossible d'ouvrir le fichier :\n{error}", parent=self)
+            return
+
+        tournament = {"heading": model.name,
+                      "weapon": next((k for k, v in WEAPONS.items() if v == model.weapon), model.weapon),
+                      "gender": model.gender,
+                      "category": model.category,
+                      "score": model.maximum_score,
+                      "kind": next(k for k, v in KINDS.items() if v == model.kind),
+                      "licence": model.licences_are_needed,
+                      "draw": model.draws_are_allowed}
+        frame = self.add_tournament_frame(tournament, DEFAULT_BACKGROUND, DEFAULT_FOREGROUND, model=model,
+                                          file_path=file)
+        self.background_notebook.select(frame)
+        self.start_autosave(frame)
+
+    def save_file(self):
+        """
+        Enregistre l'onglet courant par une sauvegarde complète, qui sert aussi de nouvel essai après l'échec d'une
+        écriture de la sauvegarde automatique.
+        """
+        frame = self.current_frame()
+        if frame is None:
+            return
+        if frame.file_path is None:
+            self.save_file_as()
+            return
+
+        # Échec d'une écriture précédente, signalé avant le nouvel essai ; l'erreur est effacée s'il réussit
+        if frame.autosave is not None and frame.autosave.error is not None:
+            mb.showerror(title="Erreur enregistrement",
+                         message=f"Impossible d'enregistrer le fichier :\n{frame.autosave.error}\n\n"
+                                 "Nouvel essai d'enregistrement en cours.", parent=self)
+        if frame.autosave is None or frame.autosave.path != frame.file_path:
+            self.start_autosave(frame)
+        else:
+            frame.autosave.save()
+
+    def start_autosave(self, frame):
+        """
+        Démarre la sauvegarde automatique d'un onglet dans son fichier, en commençant par une sauvegarde complète.
+
+        :param frame: Onglet de la compétition.
+        """
+        if frame.autosave is not None:
+            frame.autosave.stop()
+        frame.autosave = autosave.Autosave(frame.tournament, frame.file_path)
+        frame.autosave.start()
+
+    def close(self):
+        for frame in self.notebook_frames:
+            if frame.autosave is not None:
+                frame.autosave.stop(timeout=10)
+        self.quit()
+
+    def save_file_as(self):
+        frame = self.current_frame()
+        if frame is None:
+            return
+        file = fd.asksaveasfilename(title="Enregistrer sous", defaultextension=tournamentfile.EXTENSION,
+                                    initialfile=f"{frame.tournament.name}{tournamentfile.EXTENSION}",
+                                    filetypes=(("Fichiers LFT", f"*{tournamentfile.EXTENSION}"),
+                                               ("Tous les fichiers", "*.*")))
+        if not file:
+            return
+        frame.file_path = file
+        self.save_file()
+
+    def export_results(self):
+        """
+        Exporte le classement et les rondes de l'onglet courant, en ne réécrivant que les sections modifiées depuis
+        la dernière exportation. Le dossier est demandé à la première exportation.
+        """
+        frame = self.current_frame()
+        if frame is None:
+            return
+        if frame.exporter is None:
+            directory = fd.askdirectory(title="Exporter les résultats", mustexist=False)
+            if not directory:
+                return
+            frame.exporter = exporters.Exporter(frame.tournament, directory)
+        try:
+            frame.exporter.export()
+        except OSError as error:
+            mb.showerror(title="Erreur exportation", message=f"Impossible d'exporter les résultats :\n{error}",
+                         parent=self)
 
 
 if __name__ == "__main__":
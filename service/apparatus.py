@@ -0,0 +1,433 @@
+import asyncio
+import time
+
+from collections import deque
+from collections.abc import Callable
+
+from typing import BinaryIO, NamedTuple
+
+from assault.boutlog import BoutLog
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.journal import Event
+from competition.tournament import Tournament
+
+from service.pistes import piste_tables
+
+
+#: Longueur maximale d'une trame, en octets
+MAX_FRAME_SIZE: int = 128
+#: Taille des lectures d'un flux, en octets
+READ_SIZE: int = 1 << 16
+#: Nombre d'erreurs conservées
+MAX_ERRORS: int = 100
+#: Longueur maximale d'un champ cité dans un message d'erreur, en caractères
+MAX_ECHO: int = 16
+
+#: Types de trames : touche, annulation de touche, statut, coup double, fin de période, remise à zéro et fin de match
+FRAME_KINDS: frozenset[str] = frozenset("TASDPRE")
+#: Côtés d'une piste : gauche pour le premier.ère tireur/équipe, droite pour le second.e
+SIDES: dict[str, int] = {"L": 1, "R": 2}
+
+
+def _echo(field: str) -> str:
+    """
+    Champ d'une trame cité dans un message d'erreur, tronqué à `MAX_ECHO` caractères.
+
+    :param field: Champ de la trame.
+    :return: Champ cité.
+    """
+    return field if len(field) <= MAX_ECHO else f"{field[:MAX_ECHO]}…"
+
+
+class Frame(NamedTuple):
+    """
+    Trame d'un appareil de signalisation.
+
+    :param int piste: Numéro de la piste, à partir de ``1``.
+    :param str kind: Type de trame, parmi `FRAME_KINDS`.
+    :param int|None side: Côté concerné, ``1`` ou ``2``, ou `None`.
+    :param int|str|None value: Nombre de touches, statut, ou `None`.
+    """
+    #: Numéro de la piste, à partir de ``1``
+    piste: int
+    #: Type de trame, parmi `FRAME_KINDS`
+    kind: str
+    #: Côté concerné, ``1`` ou ``2``, ou `None`
+    side: int | None
+    #: Nombre de touches, statut, ou `None`
+    value: int | str | None
+
+
+def parse_frame(line: bytes) -> Frame:
+    """
+    Interprète une trame : type, numéro de piste, puis côté et valeur selon le type.
+
+    :param line: Trame, sans fin de ligne.
+    :return: Trame interprétée.
+    """
+    try:
+        fields: list[str] = line.decode("ascii").upper().split()
+    except UnicodeDecodeError:
+        raise ValueError("Trame non ASCII.") from None
+    if (not fields) or (fields[0] not in FRAME_KINDS):
+        raise ValueError(f"Type de trame inconnu `{_echo(fields[0]) if fields else ''}`.")
+    kind: str = fields[0]
+    if (len(fields) < 2) or (not fields[1].isdecimal()) or (int(fields[1]) == 0):
+        raise ValueError("Numéro de piste invalide.")
+    piste: int = int(fields[1])
+
+    # Coup double, fin de période, remise à zéro et fin de match
+    if kind in ("D", "P", "R", "E"):
+        if len(fields) != 2:
+            raise ValueError(f"Trame `{kind}` : aucun champ attendu après la piste.")
+        return Frame(piste, kind, None, None)
+
+    # Touches, annulation et statut
+    if (len(fields) not in (3, 4)) or (fields[2] not in SIDES):
+        raise ValueError(f"Trame `{kind}` : côté `L` ou `R` attendu.")
+    side: int = SIDES[fields[2]]
+    if kind == "S":
+        if (len(fields) != 4) or (fields[3] not in ("V", "D", "N")):
+            raise ValueError("Trame `S` : statut `V`, `D` ou `N` attendu.")
+        return Frame(piste, kind, side, fields[3])
+    if len(fields) == 3:
+        return Frame(piste, kind, side, 1)
+    if (not fields[3].isdecimal()) or (int(fields[3]) == 0):
+        raise ValueError(f"Trame `{kind}` : nombre de touches invalide `{_echo(fields[3])}`.")
+    return Frame(piste, kind, side, int(fields[3]))
+
+
+class FrameParser:
+    """
+    Classe représentant le découpage incrémental d'un flux d'octets en trames, une par ligne.
+
+    Les octets sont reçus par morceaux quelconques : une trame incomplète est conservée jusqu'au morceau suivant. Une
+    ligne trop longue, par exemple après une perte de synchronisation de la liaison série, est ignorée jusqu'à la
+    fin de ligne suivante, qu'elle soit reçue en un ou plusieurs morceaux.
+    """
+    #: Début de la trame incomplète
+    _buffer: bytes
+    #: Ligne trop longue en cours d'abandon
+    _is_discarding: bool
+
+    def __init__(self) -> None:
+        """
+        Initialise un nouveau découpage.
+        """
+        self._buffer = b""
+        self._is_discarding = False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(buffered={len(self._buffer)})"
+
+    def feed(self, data: bytes) -> tuple[list[Frame], list[str]]:
+        """
+        Découpe un morceau du flux.
+
+        :param data: Octets reçus.
+        :return: Trames complètes interprétées et erreurs, dans l'ordre du flux.
+        """
+        lines: list[bytes] = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        frames: list[Frame] = list()
+        errors: list[str] = list()
+        for line in lines:
+            if self._is_discarding:
+                self._is_discarding = False
+                continue
+            if len(line) > MAX_FRAME_SIZE:
+                errors.append(f"Trame de plus de {MAX_FRAME_SIZE} octets ignorée.")
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                frames.append(parse_frame(line))
+            except ValueError as error:
+                errors.append(str(error))
+
+        # Ligne trop longue
+        if len(self._buffer) > MAX_FRAME_SIZE:
+            if not self._is_discarding:
+                errors.append(f"Trame de plus de {MAX_FRAME_SIZE} octets ignorée.")
+            self._buffer = b""
+            self._is_discarding = True
+        return frames, errors
+
+
+class ApparatusIngest:
+    """
+    Classe représentant la réception en continu des trames des appareils de signalisation des pistes.
+
+    Chaque trame désigne une piste, dont le match en cours est le premier match non validé des tables qu'elle arbitre
+    dans la dernière ronde, comme pour le service des pistes. Les touches mettent à jour les scores du match au fil du
+    match et sont ajoutées à son déroulé, horodatées depuis la remise à zéro, puis la fin de match soumet le résultat,
+    vérifié et validé comme depuis la table de contrôle. Les flux sont lus par la boucle `asyncio` qui possède la
+    compétition, par morceaux, chacun avec son propre découpage.
+
+    Trames, une par ligne, champs séparés par des espaces :
+
+    * ``R <piste>`` : remise à zéro des scores, au début d'un match ;
+    * ``T <piste> <L|R> [n]`` : touche(s) du côté gauche (premier.ère tireur/équipe) ou droit ;
+    * ``A <piste> <L|R> [n]`` : annulation de touche(s) ;
+    * ``S <piste> <L|R> <V|D|N>`` : statut d'un côté, par exemple la victoire à la priorité ;
+    * ``D <piste>`` : coup double, une touche de chaque côté ;
+    * ``P <piste>`` : fin de période ;
+    * ``E <piste>`` : fin du match, qui est validé.
+
+    Une trame refusée est conservée parmi les erreurs récentes, sans interrompre le flux.
+
+    :param Tournament tournament: Compétition arbitrée.
+    :param int pistes: Nombre de pistes.
+    :param Callable[[],float] clock: Horloge des déroulés, en secondes.
+    """
+    #: Compétition arbitrée
+    _tournament: Tournament
+    #: Nombre de pistes
+    _pistes: int
+    #: Horloge des déroulés, en secondes
+    _clock: Callable[[], float]
+    #: Match en cours de chaque piste, par numéro de piste
+    _bouts: dict[int, Match]
+    #: Début du match en cours de chaque piste, selon l'horloge, par numéro de piste
+    _starts: dict[int, float]
+    #: Nombre de trames appliquées
+    _frames: int
+    #: Erreurs récentes
+    _errors: deque[str]
+
+    def __init__(self, tournament: Tournament, *,
+                 pistes: int,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialise une nouvelle réception.
+        """
+        self._tournament = tournament
+        if pistes <= 0:
+            raise ValueError("Le paramètre `pistes` doit être strictement supérieur à `0`.")
+        self._pistes = pistes
+        self._clock = clock
+        self._bouts = dict()
+        self._starts = dict()
+        self._frames = 0
+        self._errors = deque(maxlen=MAX_ERRORS)
+        tournament.journal.subscribe(self._on_journal)
+
+    @property
+    def tournament(self) -> Tournament:
+        return self._tournament
+
+    @property
+    def pistes(self) -> int:
+        return self._pistes
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def errors(self) -> list[str]:
+        return list(self._errors)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(pistes={self._pistes}, frames={self._frames}, errors={len(self._errors)})"
+
+    def close(self) -> None:
+        """
+        Détache la réception du journal de la compétition.
+        """
+        self._tournament.journal.unsubscribe(self._on_journal)
+
+    def _on_journal(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Abonnement au journal de la compétition : une nouvelle ronde ou un retour en arrière change les matchs en cours.
+        """
+        if operation in ("score", "change"):
+            return
+        events: tuple[Event, ...] = event if operation == "extend" else (event,)
+        if (operation not in ("record", "extend")) or any(batch_event.kind == "pairing" for batch_event in events):
+            self._bouts.clear()
+            self._starts.clear()
+
+    # Trames
+
+    def feed(self, parser: FrameParser, data: bytes) -> int:
+        """
+        Découpe un morceau d'un flux et applique ses trames.
+
+        :param parser: Découpage du flux.
+        :param data: Octets reçus.
+        :return: Nombre de trames appliquées.
+        """
+        frames, errors = parser.feed(data)
+        self._errors.extend(errors)
+        applied: int = 0
+        for frame in frames:
+            try:
+                self.apply(frame)
+                applied += 1
+            except ValueError as error:
+                self._errors.append(f"Piste {frame.piste} : {error}")
+        self._frames += applied
+        return applied
+
+    def apply(self, frame: Frame) -> Match:
+        """
+        Applique une trame au match en cours de sa piste.
+
+        Les nouveaux scores sont vérifiés avant toute modification : une trame refusée, par exemple au-delà du score
+        maximum, ne change ni le match ni son déroulé. Chaque trame acceptée est notifiée aux abonnés du journal par
+        `Tournament.update_score`.
+
+        :param frame: Trame.
+        :return: Match concerné.
+        """
+        match: Match = self.current_bout(frame.piste)
+        scores: list[Score] = [match.score1 or Score(0), match.score2 or Score(0)]
+
+        # Remise à zéro, avec un nouveau déroulé
+        if frame.kind == "R":
+            self._tournament.update_score(match, Score(0), Score(0))
+            match.log = BoutLog()
+            self._starts[frame.piste] = self._clock()
+            return match
+
+        # Fin du match
+        if frame.kind == "E":
+            self._tournament.submit_result(match, *scores, version=match.version)
+            del self._bouts[frame.piste]
+            self._starts.pop(frame.piste, None)
+            return match
+
+        # Déroulé, commencé à la première trame si la remise à zéro a été manquée
+        if (match.log is None) or (frame.piste not in self._starts):
+            match.log = BoutLog()
+            self._starts[frame.piste] = self._clock()
+        elapsed: float = max(0.0, self._clock() - self._starts[frame.piste])
+
+        # Fin de période et coup double
+        if frame.kind == "P":
+            match.log.record(elapsed, 0, "period")
+            return match
+        if frame.kind == "D":
+            self._tournament.update_score(match, Score(scores[0].touches + 1, scores[0].status),
+                                          Score(scores[1].touches + 1, scores[1].status))
+            match.log.record(elapsed, 0, "double")
+            return match
+
+        # Touches, annulation et statut
+        score: Score = scores[frame.side - 1]
+        if frame.kind == "T":
+            score = Score(score.touches + frame.value, score.status)
+        elif frame.kind == "A":
+            if frame.value > score.touches:
+                raise ValueError(f"Annulation de {frame.value} touche(s) sur {score.touches}.")
+            score = Score(score.touches - frame.value, score.status)
+        else:
+            score = Score(score.touches, frame.value)
+        scores[frame.side - 1] = score
+        self._tournament.update_score(match, *scores)
+        if frame.kind == "T":
+            for _ in range(frame.value):
+                match.log.record(elapsed, frame.side, "touch")
+        elif frame.kind == "A":
+            # Touches antérieures au déroulé : seules celles du déroulé y sont annulées
+            for _ in range(min(frame.value, match.log.touches[frame.side - 1])):
+                match.log.record(elapsed, frame.side, "annulment")
+        return match
+
+    def current_bout(self, piste: int) -> Match:
+        """
+        Match en cours d'une piste.
+
+        :param piste: Numéro de la piste, à partir de ``1``.
+        :return: Premier match non validé, hors exemptions, des tables de la piste.
+        """
+        match: Match | None = self._bouts.get(piste)
+        if (match is not None) and not match.is_validated:
+            return match
+        if piste > self._pistes:
+            raise ValueError(f"Piste `{piste}` inexistante.")
+        if not self._tournament.rounds:
+            raise ValueError("Aucune ronde appariée.")
+        played_round: Round = self._tournament.rounds[-1]
+        for table in piste_tables(piste, self._pistes, len(played_round.matches)):
+            match = played_round.matches[table - 1]
+            if (not match.is_validated) and (match.participant1 is not None) and (match.participant2 is not None):
+                self._bouts[piste] = match
+                return match
+        raise ValueError("Ronde terminée sur la piste.")
+
+    # Flux
+
+    async def consume(self, reader: asyncio.StreamReader) -> None:
+        """
+        Lit un flux jusqu'à sa fin et applique ses trames au fil de l'eau, la dernière même sans fin de ligne.
+
+        :param reader: Flux d'un appareil ou d'un concentrateur de pistes.
+        """
+        parser: FrameParser = FrameParser()
+        while data := await reader.read(READ_SIZE):
+            self.feed(parser, data)
+        self.feed(parser, b"\n")
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8081) -> asyncio.Server:
+        """
+        Démarre l'écoute des appareils sur une socket TCP, une connexion par appareil ou concentrateur.
+
+        :param host: Adresse d'écoute.
+        :param port: Port d'écoute, ou ``0`` pour un port libre.
+        :return: Serveur démarré.
+        """
+        return await asyncio.start_server(self._on_connection, host, port)
+
+    async def serve_unix(self, path: str) -> asyncio.Server:
+        """
+        Démarre l'écoute des appareils sur une socket locale.
+
+        :param path: Chemin de la socket.
+        :return: Serveur démarré.
+        """
+        return await asyncio.start_unix_server(self._on_connection, path)
+
+    async def follow(self, path: str) -> None:
+        """
+        Lit un flux continu jusqu'à sa fin : liaison série, déjà configurée, ou tube nommé.
+
+        :param path: Chemin du périphérique ou du tube.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        reader: asyncio.StreamReader = asyncio.StreamReader()
+        with open(path, "rb", buffering=0) as file:
+            transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), file)
+            try:
+                await self.consume(reader)
+            finally:
+                transport.close()
+
+    def replay(self, file: BinaryIO) -> int:
+        """
+        Rejoue un enregistrement de trames, par exemple un fichier capturé depuis une liaison série.
+
+        :param file: Fichier binaire ouvert en lecture.
+        :return: Nombre de trames appliquées.
+        """
+        parser: FrameParser = FrameParser()
+        applied: int = 0
+        while data := file.read(READ_SIZE):
+            applied += self.feed(parser, data)
+        return applied + self.feed(parser, b"\n")
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Lit le flux d'une connexion jusqu'à sa fermeture.
+        """
+        try:
+            await self.consume(reader)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,446 @@
+import asyncio
+import json
+
+from typing import Any
+from urllib.parse import urlsplit
+
+from assault.match import Match, MatchConflictError
+from assault.round import Round
+from assault.score import parse_bout
+
+from competition.journal import Event
+from competition.tournament import Tournament
+
+from storage.exporters import display_name, score_string, standings_rows
+
+
+#: Taille maximale du corps d'une requête, en octets
+MAX_BODY_SIZE: int = 1 << 16
+#: Nombre maximal d'en-têtes d'une requête
+MAX_HEADERS: int = 64
+#: Délai d'inactivité d'une connexion, en secondes
+IDLE_TIMEOUT: float = 30.0
+
+#: Intitulés des statuts HTTP utilisés
+REASONS: dict[int, str] = {200: "OK",
+                           400: "Bad Request",
+                           404: "Not Found",
+                           405: "Method Not Allowed",
+                           409: "Conflict",
+                           413: "Payload Too Large",
+                           431: "Request Header Fields Too Large",
+                           500: "Internal Server Error"}
+
+
+def piste_tables(piste: int, pistes: int, tables: int) -> range:
+    """
+    Tables d'une ronde arbitrées par une piste : la piste `p` arbitre les tables `p`, `p + n`, `p + 2n`, etc.
+
+    :param piste: Numéro de la piste, à partir de ``1``.
+    :param pistes: Nombre de pistes.
+    :param tables: Nombre de tables de la ronde.
+    :return: Numéros des tables, à partir de ``1``.
+    """
+    return range(piste, tables + 1, pistes)
+
+
+class HTTPError(Exception):
+    """
+    Exception levée lorsqu'une requête ne peut pas être satisfaite.
+
+    :param int status: Statut HTTP de la réponse.
+    :param str message: Description de l'erreur.
+    """
+    #: Statut HTTP de la réponse
+    status: int
+    #: Description de l'erreur
+    message: str
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def read_line(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+    """
+    Lit une ligne d'une requête, refusée si elle dépasse la limite du flux.
+
+    :param reader: Flux de la connexion.
+    :param status: Statut HTTP de la réponse à une ligne trop longue.
+    :param message: Message d'erreur d'une ligne trop longue.
+    :return: Ligne lue, fin de ligne comprise.
+    """
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(status, message) from None
+
+
+async def read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes] | None:
+    """
+    Lit une requête HTTP/1.1.
+
+    :param reader: Flux de la connexion.
+    :return: Méthode, chemin, en-têtes en minuscules et corps, ou `None` si la connexion est fermée.
+    """
+    line: bytes = await read_line(reader, 400, "Ligne de requête trop longue.")
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("ascii").split()
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPError(400, "Ligne de requête invalide.") from None
+
+    # En-têtes
+    headers: dict[str, str] = dict()
+    while (line := await read_line(reader, 431, "En-tête trop long.")).strip():
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(400, "Trop d'en-têtes.")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    # Corps
+    length: str = headers.get("content-length", "0")
+    if not length.isdecimal():
+        raise HTTPError(400, "En-tête `Content-Length` invalide.")
+    if int(length) > MAX_BODY_SIZE:
+        raise HTTPError(413, "Corps de la requête trop volumineux.")
+    body: bytes = await reader.readexactly(int(length)) if int(length) else b""
+    return method.upper(), urlsplit(target).path, headers, body
+
+
+def encode_response(status: int, body: bytes, *,
+                    keep_alive: bool = True) -> bytes:
+    """
+    Encode une réponse HTTP/1.1 au format JSON.
+
+    :param status: Statut HTTP.
+    :param body: Contenu JSON encodé.
+    :param keep_alive: Maintien de la connexion.
+    :return: Réponse encodée.
+    """
+    head: str = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                 f"Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(body)}\r\n"
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("ascii") + body
+
+
+class PisteService:
+    """
+    Classe représentant le service HTTP/JSON de saisie des scores depuis les pistes.
+
+    Les tables de la dernière ronde sont réparties entre les pistes : la piste `p` arbitre les tables `p`, `p + n`,
+    `p + 2n`, etc. Chaque tablette demande le prochain match de sa piste, puis envoie ses scores, vérifiés et validés
+    comme depuis la table de contrôle. Toutes les requêtes sont traitées par la boucle `asyncio` qui possède la
+    compétition, sans verrou : une validation s'exécute sans point d'attente, donc sans entrelacement. Les réponses
+    aux requêtes ``GET`` sont conservées encodées jusqu'au prochain événement du journal de la compétition.
+
+    Routes :
+
+    * ``GET /round`` : matchs de la dernière ronde ;
+    * ``GET /pistes/<piste>`` : prochain match non validé de la piste ;
+    * ``POST /tables/<table>`` : scores d'un match, ``{"round": n, "score1": "V5", "score2": "3", "version": v}``,
+      la version étant celle du match lu par la tablette ;
+    * ``GET /standings`` : classement.
+
+    :param Tournament tournament: Compétition arbitrée.
+    :param int pistes: Nombre de pistes.
+    """
+    #: Compétition arbitrée
+    _tournament: Tournament
+    #: Nombre de pistes
+    _pistes: int
+    #: Réponses encodées aux requêtes ``GET``, par chemin, depuis le dernier événement du journal
+    _responses: dict[str, tuple[int, bytes]]
+
+    def __init__(self, tournament: Tournament, *,
+                 pistes: int) -> None:
+        """
+        Initialise un nouveau service.
+        """
+        self._tournament = tournament
+        if pistes <= 0:
+            raise ValueError("Le paramètre `pistes` doit être strictement supérieur à `0`.")
+        self._pistes = pistes
+        self._responses = dict()
+        tournament.journal.subscribe(self._on_journal)
+
+    @property
+    def tournament(self) -> Tournament:
+        return self._tournament
+
+    @property
+    def pistes(self) -> int:
+        return self._pistes
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(tournament={self._tournament!r}, pistes={self._pistes})"
+
+    def close(self) -> None:
+        """
+        Détache le service du journal de la compétition.
+        """
+        self._tournament.journal.unsubscribe(self._on_journal)
+
+    def _on_journal(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Abonnement au journal de la compétition : les réponses conservées sont périmées.
+        """
+        self._responses.clear()
+
+    # Routes
+
+    def respond(self, method: str, path: str, body: bytes = b"") -> tuple[int, bytes]:
+        """
+        Traite une requête et encode sa réponse, conservée pour les requêtes ``GET`` réussies.
+
+        :param method: Méthode HTTP.
+        :param path: Chemin de la requête.
+        :param body: Corps de la requête.
+        :return: Statut HTTP et contenu JSON encodé de la réponse.
+        """
+        if method == "GET":
+            response: tuple[int, bytes] | None = self._responses.get(path)
+            if response is not None:
+                return response
+        status, payload = self.handle(method, path, body)
+        response = status, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if (method == "GET") and (status == 200):
+            self._responses[path] = response
+        return response
+
+    def handle(self, method: str, path: str, body: bytes = b"") -> tuple[int, Any]:
+        """
+        Traite une requête, indépendamment de la connexion.
+
+        :param method: Méthode HTTP.
+        :param path: Chemin de la requête.
+        :param body: Corps de la requête.
+        :return: Statut HTTP et contenu de la réponse.
+        """
+        try:
+            parts: list[str] = [part for part in path.split("/") if part]
+            if parts == ["round"]:
+                self._expect(method, "GET")
+                return 200, self._round_payload()
+            if parts == ["standings"]:
+                self._expect(method, "GET")
+                return 200, list(standings_rows(self._tournament.standings()))
+            if (len(parts) == 2) and (parts[0] == "pistes"):
+                self._expect(method, "GET")
+                return 200, self._next_bout(self._number(parts[1], "piste"))
+            if (len(parts) == 2) and (parts[0] == "tables"):
+                self._expect(method, "POST")
+                return 200, self._submit(self._number(parts[1], "table"), body)
+            raise HTTPError(404, "Route inconnue.")
+        except HTTPError as error:
+            return error.status, {"error": error.message}
+
+    @staticmethod
+    def _expect(method: str, expected: str) -> None:
+        if method != expected:
+            raise HTTPError(405, f"Méthode `{expected}` attendue.")
+
+    @staticmethod
+    def _number(text: str, what: str) -> int:
+        if (not text.isdecimal()) or (int(text) == 0):
+            raise HTTPError(404, f"Numéro de {what} invalide `{text}`.")
+        return int(text)
+
+    def _current_round(self) -> Round:
+        if not self._tournament.rounds:
+            raise HTTPError(404, "Aucune ronde appariée.")
+        return self._tournament.rounds[-1]
+
+    @staticmethod
+    def _bout_payload(played_round: Round, table: int, match: Match) -> dict[str, Any]:
+        return {"round": played_round.number,
+                "table": table,
+                "participant1": display_name(match.participant1),
+                "participant2": display_name(match.participant2),
+                "score1": score_string(match.score1),
+                "score2": score_string(match.score2),
+                "is_validated": match.is_validated,
+                "version": match.version}
+
+    def _round_payload(self) -> dict[str, Any]:
+        played_round: Round = self._current_round()
+        return {"round": played_round.number,
+                "pistes": self._pistes,
+                "matches": [self._bout_payload(played_round, table, match)
+                            for table, match in enumerate(played_round.matches, 1)]}
+
+    def _next_bout(self, piste: int) -> dict[str, Any] | None:
+        """
+        Prochain match non validé d'une piste.
+
+        :param piste: Numéro de la piste, à partir de ``1``.
+        :return: Match, ou `None` si la piste a terminé la ronde.
+        """
+        if piste > self._pistes:
+            raise HTTPError(404, f"Piste `{piste}` inexistante.")
+        played_round: Round = self._current_round()
+        matches: list[Match] = played_round.matches
+        for table in piste_tables(piste, self._pistes, len(matches)):
+            match: Match = matches[table - 1]
+            if (not match.is_validated) and (match.participant1 is not None) and (match.participant2 is not None):
+                return self._bout_payload(played_round, table, match)
+        return None
+
+    def _submit(self, table: int, body: bytes) -> dict[str, Any]:
+        """
+        Vérifie et valide les scores d'un match.
+
+        Les scores sont soumis par comparaison et échange de la version du match, la version actuelle par défaut. Un
+        envoi identique à un match déjà validé est accepté sans effet, pour qu'une tablette puisse renvoyer une requête
+        dont elle n'a pas reçu la réponse.
+
+        :param table: Numéro de la table, à partir de ``1``.
+        :param body: Corps JSON de la requête.
+        :return: Match validé.
+        """
+        # Contenu
+        try:
+            content: Any = json.loads(body)
+        except (UnicodeDecodeError, ValueError):
+            raise HTTPError(400, "Corps JSON invalide.") from None
+        if (not isinstance(content, dict)) or (not {"round", "score1", "score2"}.issubset(content)):
+            raise HTTPError(400, "Les champs `round`, `score1` et `score2` sont requis.")
+        if not isinstance(content.get("version", 0), int):
+            raise HTTPError(400, "Le champ `version` doit être un entier.")
+        try:
+            score1, score2 = parse_bout(str(content["score1"]), str(content["score2"]))
+        except ValueError as error:
+            raise HTTPError(400, f"{str(error)[0].upper()}{str(error)[1:]}.") from None
+
+        # Match
+        played_round: Round = self._current_round()
+        if content["round"] != played_round.number:
+            raise HTTPError(409, f"La ronde en cours est la ronde {played_round.number}.")
+        if table > len(played_round.matches):
+            raise HTTPError(404, f"Table `{table}` inexistante.")
+        match: Match = played_round.matches[table - 1]
+
+        # Validation, ou renvoi identique
+        try:
+            self._tournament.submit_result(match, score1, score2, version=content.get("version", match.version))
+        except MatchConflictError as error:
+            raise HTTPError(409, str(error)) from None
+        except ValueError as error:
+            raise HTTPError(409 if match.is_validated else 400, str(error)) from None
+        return self._bout_payload(played_round, table, match)
+
+    # Connexions
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8080) -> asyncio.Server:
+        """
+        Démarre le service.
+
+        :param host: Adresse d'écoute.
+        :param port: Port d'écoute, ou ``0`` pour un port libre.
+        :return: Serveur démarré.
+        """
+        return await asyncio.start_server(self._on_connection, host, port)
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Traite les requêtes successives d'une connexion.
+        """
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+                except HTTPError as error:
+                    writer.write(encode_response(error.status, json.dumps({"error": error.message}).encode("utf-8"),
+                                                 keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive: bool = headers.get("connection", "").lower() != "close"
+                try:
+                    status, content = self.respond(method, path, body)
+                except Exception as error:
+                    status, content = 500, json.dumps({"error": str(error)}).encode("utf-8")
+                writer.write(encode_response(status, content, keep_alive=keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class PisteClient:
+    """
+    Classe représentant un client du service des pistes, sur une connexion maintenue : tablette de démonstration ou
+    client de test.
+
+    :param str host: Adresse du service.
+    :param int port: Port du service.
+    """
+    #: Adresse du service
+    _host: str
+    #: Port du service
+    _port: int
+    #: Flux de la connexion, une fois ouverte
+    _reader: asyncio.StreamReader | None
+    _writer: asyncio.StreamWriter | None
+
+    def __init__(self, host: str, port: int) -> None:
+        """
+        Initialise un nouveau client, sans ouvrir de connexion.
+        """
+        self._host = host
+        self._port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method: str, path: str, payload: Any = None) -> tuple[int, Any]:
+        """
+        Envoie une requête, en ouvrant la connexion si nécessaire.
+
+        :param method: Méthode HTTP.
+        :param path: Chemin de la requête.
+        :param payload: Contenu JSON de la requête, s'il existe.
+        :return: Statut HTTP et contenu de la réponse.
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        body: bytes = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self._host}\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+        await self._writer.drain()
+
+        # Réponse
+        status: int = int((await self._reader.readline()).split()[1])
+        headers: dict[str, str] = dict()
+        while (line := await self._reader.readline()).strip():
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        content: bytes = await self._reader.readexactly(int(headers.get("content-length", "0")))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, json.loads(content) if content else None
+
+    async def get(self, path: str) -> tuple[int, Any]:
+        return await self.request("GET", path)
+
+    async def post(self, path: str, payload: Any) -> tuple[int, Any]:
+        return await self.request("POST", path, payload)
+
+    async def close(self) -> None:
+        """
+        Ferme la connexion, si elle est ouverte.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._reader = None
+            self._writer = None
@@ -0,0 +1,465 @@
+import multiprocessing
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from itertools import count
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from threading import Lock, Thread
+
+from typing import Any
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import parse_bout
+
+from competition.fencer import Fencer
+from competition.snapshots import MatchSnapshot, RoundSnapshot, TournamentSnapshot
+from competition.standings import Standing
+from competition.team import Team
+from competition.tournament import Tournament
+
+from storage import autosave
+from storage.exporters import FORMATS, Exporter
+
+
+#: Durée maximale d'attente de l'arrêt d'un processus, en secondes
+STOP_TIMEOUT: float = 30.0
+
+
+class WorkerError(Exception):
+    """
+    Exception levée lorsqu'un processus de compétition ne peut pas exécuter une commande.
+
+    :param str name: Nom de la compétition.
+    :param str kind: Type de l'erreur levée dans le processus, par exemple ``'MatchConflictError'``.
+    :param str message: Description de l'erreur.
+    """
+    #: Nom de la compétition
+    name: str
+    #: Type de l'erreur levée dans le processus
+    kind: str
+    #: Description de l'erreur
+    message: str
+
+    def __init__(self, name: str, kind: str, message: str) -> None:
+        super().__init__(f"{name} : {message}")
+        self.name = name
+        self.kind = kind
+        self.message = message
+
+
+# Commandes, exécutées dans le processus de la compétition
+
+def _snapshot(tournament: Tournament) -> TournamentSnapshot:
+    return tournament.snapshot
+
+
+def _register(tournament: Tournament, participants: Iterable[Fencer | Team]) -> int:
+    return tournament.add_participants(participants)
+
+
+def _pair(tournament: Tournament) -> RoundSnapshot:
+    # Exemptions de la ronde précédente, validées d'office une fois ses matchs joués
+    if tournament.rounds:
+        matches: list[Match] = tournament.rounds[-1].matches
+        byes: list[Match] = [match for match in matches if (match.participant1 is None) or (match.participant2 is None)]
+        if all(match.is_validated for match in matches
+               if (match.participant1 is not None) and (match.participant2 is not None)):
+            for match in byes:
+                if not match.is_validated:
+                    tournament.validate_match(match)
+    tournament.check_pairing()
+    tournament.new_round()
+    return tournament.snapshot.rounds[-1]
+
+
+def _submit(tournament: Tournament, table: int, score1: str, score2: str,
+            version: int | None = None) -> MatchSnapshot:
+    if not tournament.rounds:
+        raise ValueError("La compétition n'a aucune ronde appariée.")
+    played_round: Round = tournament.rounds[-1]
+    if not 1 <= table <= len(played_round.matches):
+        raise ValueError(f"Table `{table}` inexistante.")
+    match: Match = played_round.matches[table - 1]
+    tournament.submit_result(match, *parse_bout(score1, score2),
+                             version=match.version if version is None else version)
+    return tournament.snapshot.rounds[-1].matches[table - 1]
+
+
+def _standings(tournament: Tournament) -> list[Standing]:
+    return tournament.snapshot.standings()
+
+
+def _export(tournament: Tournament, directory: str, formats: Iterable[str] = FORMATS) -> list[str]:
+    return Exporter(tournament, directory, formats=frozenset(formats)).export()
+
+
+def _undo(tournament: Tournament) -> bool:
+    return tournament.undo() is not None
+
+
+#: Commandes des processus de compétition, hors arrêt
+COMMANDS: dict[str, Callable[..., Any]] = {"snapshot": _snapshot,
+                                           "register": _register,
+                                           "pair": _pair,
+                                           "submit": _submit,
+                                           "standings": _standings,
+                                           "export": _export,
+                                           "undo": _undo}
+
+
+def host(path: str, connection: Connection) -> None:
+    """
+    Boucle d'un processus de compétition.
+
+    La compétition est chargée depuis son fichier, sauvegardée automatiquement, et ne vit que dans ce processus. Chaque
+    requête ``(numéro, commande, arguments)`` reçue par le canal est exécutée dans l'ordre, et son résultat renvoyé sous
+    la forme ``(numéro, succès, résultat)``, le résultat d'un échec étant le type et la description de l'erreur. La
+    requête ``0`` annonce le chargement de la compétition avec son premier instantané.
+
+    :param path: Chemin du fichier de compétition.
+    :param connection: Extrémité du canal côté processus.
+    """
+    # Chargement
+    try:
+        tournament: Tournament = autosave.recover(path)
+    except (OSError, ValueError) as error:
+        connection.send((0, False, (type(error).__name__, f"Impossible d'ouvrir le fichier `{path}` : {error}")))
+        connection.close()
+        return
+    saver: autosave.Autosave = autosave.Autosave(tournament, path)
+    saver.start()
+    connection.send((0, True, tournament.snapshot))
+
+    # Requêtes, jusqu'à l'arrêt ou la fermeture du canal
+    stop: int | None = None
+    try:
+        while stop is None:
+            try:
+                request, command, arguments = connection.recv()
+            except EOFError:
+                break
+            if command == "stop":
+                stop = request
+                continue
+            try:
+                result: Any = COMMANDS[command](tournament, **arguments)
+            except Exception as error:
+                connection.send((request, False, (type(error).__name__, str(error))))
+            else:
+                connection.send((request, True, result))
+    finally:
+        saver.stop(timeout=STOP_TIMEOUT)
+
+    # Arrêt, une fois les événements écrits
+    if stop is not None:
+        if saver.error is None:
+            connection.send((stop, True, None))
+        else:
+            connection.send((stop, False, (type(saver.error).__name__,
+                                           f"Impossible d'enregistrer le fichier `{path}` : {saver.error}")))
+    connection.close()
+
+
+class TournamentWorker:
+    """
+    Classe représentant une compétition hébergée dans son propre processus.
+
+    Les commandes sont envoyées par un canal et renvoient immédiatement un `Future`, résolu par un fil de réception à
+    l'arrivée du résultat : l'interface peut l'interroger avec `after`, et le service l'attendre avec
+    `asyncio.wrap_future`. Les résultats sont des instantanés immuables de la compétition.
+
+    :param str name: Nom de la compétition dans l'ordonnanceur.
+    :param str path: Chemin du fichier de compétition.
+    :param BaseContext context: Contexte de création des processus.
+    """
+    #: Nom de la compétition dans l'ordonnanceur
+    _name: str
+    #: Chemin du fichier de compétition
+    _path: str
+    #: Processus de la compétition
+    _process: BaseProcess
+    #: Extrémité du canal côté ordonnanceur
+    _connection: Connection
+    #: Verrou des envois et des requêtes en attente
+    _lock: Lock
+    #: Numéros des requêtes
+    _requests: Iterator[int]
+    #: Résultats attendus, par numéro de requête
+    _pending: dict[int, Future]
+    #: Chargement de la compétition, résolu avec son premier instantané
+    _ready: Future
+    #: Fermeture du canal
+    _is_closed: bool
+    #: Fil de réception des résultats
+    _receiver: Thread
+
+    def __init__(self, name: str, path: str, context: BaseContext) -> None:
+        """
+        Démarre le processus d'une compétition.
+        """
+        self._name = name
+        self._path = path
+
+        # Processus
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=host, args=(path, child), name=f"Tournament({name})", daemon=True)
+        self._process.start()
+        child.close()
+
+        # Requêtes
+        self._lock = Lock()
+        self._requests = count(1)
+        self._ready = Future()
+        self._pending = {0: self._ready}
+        self._is_closed = False
+        self._receiver = Thread(target=self._receive, name=f"TournamentWorker({name})", daemon=True)
+        self._receiver.start()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def ready(self) -> Future:
+        return self._ready
+
+    @property
+    def is_alive(self) -> bool:
+        """
+        Activité du processus de la compétition.
+        """
+        return self._process.is_alive()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self._name!r}, path={self._path!r}, pid={self._process.pid})"
+
+    def call(self, command: str, **arguments: Any) -> Future:
+        """
+        Envoie une commande au processus de la compétition.
+
+        :param command: Commande, parmi `COMMANDS` ou ``'stop'``.
+        :param arguments: Arguments de la commande.
+        :return: Résultat à venir de la commande.
+        """
+        if (command not in COMMANDS) and (command != "stop"):
+            raise ValueError(f"Le paramètre `command` doit être parmi `{sorted(COMMANDS)}`, ou `'stop'`.")
+        future: Future = Future()
+        with self._lock:
+            if self._is_closed:
+                raise WorkerError(self._name, "ProcessError", "Le processus de la compétition est arrêté.")
+            request: int = next(self._requests)
+            self._pending[request] = future
+            try:
+                self._connection.send((request, command, arguments))
+            except OSError:
+                del self._pending[request]
+                raise WorkerError(self._name, "ProcessError", "Le processus de la compétition est arrêté.") from None
+        return future
+
+    def snapshot(self) -> Future:
+        """
+        Demande l'instantané actuel de la compétition.
+
+        :return: `TournamentSnapshot` à venir.
+        """
+        return self.call("snapshot")
+
+    def register(self, participants: Iterable[Fencer | Team]) -> Future:
+        """
+        Inscrit des tireurs/équipes.
+
+        :param participants: Tireurs/Équipes entrant.e.s.
+        :return: Nombre de tireurs/équipes inscrit.e.s à venir.
+        """
+        return self.call("register", participants=list(participants))
+
+    def pair(self) -> Future:
+        """
+        Apparie une nouvelle ronde.
+
+        :return: `RoundSnapshot` à venir.
+        """
+        return self.call("pair")
+
+    def submit(self, table: int, score1: str, score2: str, *,
+               version: int | None = None) -> Future:
+        """
+        Soumet le résultat d'un match de la ronde en cours.
+
+        :param table: Numéro de la table, à partir de ``1``.
+        :param score1: Score du premier tireur/équipe.
+        :param score2: Score du second tireur/équipe.
+        :param version: Version du match connue de l'auteur du résultat, ou `None` pour la version actuelle.
+        :return: `MatchSnapshot` à venir.
+        """
+        return self.call("submit", table=table, score1=score1, score2=score2, version=version)
+
+    def standings(self) -> Future:
+        """
+        Demande le classement de la compétition.
+
+        :return: Classement à venir, dont les lignes désignent des `ParticipantSnapshot`.
+        """
+        return self.call("standings")
+
+    def export(self, directory: str, *,
+               formats: Iterable[str] = FORMATS) -> Future:
+        """
+        Exporte les résultats de la compétition dans un dossier.
+
+        :param directory: Dossier d'exportation.
+        :param formats: Formats d'exportation.
+        :return: Chemins des fichiers réécrits à venir.
+        """
+        return self.call("export", directory=directory, formats=sorted(formats))
+
+    def close(self, *,
+              timeout: float | None = STOP_TIMEOUT) -> None:
+        """
+        Arrête le processus de la compétition, après l'écriture de ses derniers événements.
+
+        :param timeout: Durée maximale d'attente, en secondes.
+        """
+        self._join(self._stop(), timeout)
+
+    def _stop(self) -> Future | None:
+        """
+        Demande l'arrêt du processus de la compétition.
+
+        :return: Arrêt à venir, ou `None` si le processus est déjà arrêté.
+        """
+        try:
+            return self.call("stop")
+        except WorkerError:
+            return None
+
+    def _join(self, stop: Future | None, timeout: float | None) -> None:
+        """
+        Attend l'arrêt du processus de la compétition, et l'interrompt au-delà du délai.
+
+        :param stop: Arrêt à venir, ou `None`.
+        :param timeout: Durée maximale d'attente, en secondes.
+        """
+        if stop is not None:
+            try:
+                stop.result(timeout)
+            except (WorkerError, TimeoutError):
+                pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._connection.close()
+
+    def _receive(self) -> None:
+        """
+        Boucle du fil de réception des résultats.
+        """
+        while True:
+            try:
+                request, succeeded, result = self._connection.recv()
+            except (EOFError, OSError):
+                break
+            future: Future | None = self._pending.pop(request, None)
+            if future is None:
+                continue
+            if succeeded:
+                future.set_result(result)
+            else:
+                future.set_exception(WorkerError(self._name, *result))
+
+        # Processus arrêté : les requêtes en attente échouent
+        with self._lock:
+            self._is_closed = True
+            pending: list[Future] = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.set_exception(WorkerError(self._name, "ProcessError", "Le processus de la compétition est arrêté."))
+
+
+class TournamentScheduler:
+    """
+    Classe représentant l'ordonnanceur de compétitions simultanées, chacune hébergée dans son propre processus.
+
+    Les appariements et les exportations de compétitions différentes s'exécutent ainsi en parallèle sur tous les cœurs,
+    sans qu'une grande compétition ne bloque les autres. Les processus sont créés par ``spawn`` par défaut, qui ne
+    recopie ni l'interface ni ses fils d'exécution.
+
+    :param str start_method: Méthode de création des processus, au sens de `multiprocessing`.
+    """
+    #: Contexte de création des processus
+    _context: BaseContext
+    #: Compétitions hébergées, par nom
+    _workers: dict[str, TournamentWorker]
+
+    def __init__(self, *,
+                 start_method: str = "spawn") -> None:
+        """
+        Initialise un nouvel ordonnanceur.
+        """
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = dict()
+
+    @property
+    def workers(self) -> dict[str, TournamentWorker]:
+        return dict(self._workers)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(workers={sorted(self._workers)})"
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    def __getitem__(self, name: str) -> TournamentWorker:
+        return self._workers[name]
+
+    def __enter__(self) -> "TournamentScheduler":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def open(self, name: str, path: str) -> TournamentWorker:
+        """
+        Héberge une compétition dans un nouveau processus.
+
+        :param name: Nom de la compétition dans l'ordonnanceur, par exemple sa catégorie.
+        :param path: Chemin du fichier de compétition.
+        :return: Processus de la compétition, dont `ready` est résolu une fois la compétition chargée.
+        """
+        if name in self._workers:
+            raise ValueError(f"La compétition `{name}` est déjà hébergée.")
+        worker: TournamentWorker = TournamentWorker(name, path, self._context)
+        self._workers[name] = worker
+        return worker
+
+    def broadcast(self, command: str, **arguments: Any) -> dict[str, Future]:
+        """
+        Envoie une même commande à toutes les compétitions, exécutée en parallèle.
+
+        :param command: Commande, parmi `COMMANDS`.
+        :param arguments: Arguments de la commande.
+        :return: Résultats à venir, par nom de compétition.
+        """
+        return {name: worker.call(command, **arguments) for name, worker in self._workers.items()}
+
+    def close(self, name: str | None = None, *,
+              timeout: float | None = STOP_TIMEOUT) -> None:
+        """
+        Arrête une compétition, ou toutes.
+
+        :param name: Nom de la compétition, ou `None` pour toutes.
+        :param timeout: Durée maximale d'attente de chaque processus, en secondes.
+        """
+        names: list[str] = list(self._workers) if name is None else [name]
+        workers: list[TournamentWorker] = [self._workers.pop(name) for name in names]
+        stops: list[Future | None] = [worker._stop() for worker in workers]
+        for worker, stop in zip(workers, stops):
+            worker._join(stop, timeout)
@@ -0,0 +1,506 @@
+import os
+import struct
+import zlib
+
+from queue import Queue, Empty
+
+from threading import Thread
+
+from typing import BinaryIO
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.journal import Event
+from competition.team import Team
+from competition.tournament import Tournament
+
+from storage import tournamentfile
+from storage.tournamentfile import FENCER_GENDERS, NO_PARTICIPANT, NO_SCORE, STATUSES
+
+
+#: Extension des segments de journal
+EXTENSION: str = ".wal"
+
+#: Signature des segments de journal
+MAGIC: bytes = b"LFTW"
+
+#: Codes des types d'enregistrements, ``'score'`` étant les scores en cours d'un match
+KINDS: tuple[str, ...] = ("registration", "withdrawal", "pairing", "validation", "score")
+
+#: Structure de l'en-tête d'un segment : signature et somme de contrôle du fichier de compétition qu'il prolonge
+SEGMENT: struct.Struct = struct.Struct("<4sI")
+#: Structure de l'en-tête d'un enregistrement : longueur, somme de contrôle et type
+RECORD: struct.Struct = struct.Struct("<IIB")
+#: Structure d'un tireur : sexe, âge, licence et appartenance à une équipe
+FENCER: struct.Struct = struct.Struct("<BHQB")
+#: Structure d'un compteur ou d'un indice
+COUNT: struct.Struct = struct.Struct("<I")
+#: Structure d'un couple de participants d'un match
+PAIR: struct.Struct = struct.Struct("<ii")
+#: Structure d'une validation : ronde, match, touches et statuts
+VALIDATION: struct.Struct = struct.Struct("<IIHBHB")
+
+
+def segment_path(path: str) -> str:
+    """
+    Chemin du segment de journal associé à un fichier de compétition.
+
+    :param path: Chemin du fichier de compétition.
+    :return: Chemin du segment de journal.
+    """
+    return f"{path}{EXTENSION}"
+
+
+def _encode_string(string: str | None) -> bytes:
+    """
+    Encode une chaîne, préfixée de sa longueur, ``0xFFFF`` représentant `None`.
+
+    :param string: Chaîne, ou `None`.
+    :return: Chaîne encodée.
+    """
+    if string is None:
+        return struct.pack("<H", 0xFFFF)
+    encoded: bytes = string.encode("utf-8")
+    return struct.pack("<H", len(encoded)) + encoded
+
+
+def _decode_string(buffer: bytes, offset: int) -> tuple[str | None, int]:
+    """
+    Décode une chaîne préfixée de sa longueur.
+
+    :param buffer: Contenu de l'enregistrement.
+    :param offset: Position de la chaîne.
+    :return: Chaîne et position suivante.
+    """
+    length: int = struct.unpack_from("<H", buffer, offset)[0]
+    offset += 2
+    if length == 0xFFFF:
+        return None, offset
+    return buffer[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _encode_fencer(fencer: Fencer) -> bytes:
+    """
+    Encode un tireur.
+
+    :param fencer: Tireur.
+    :return: Tireur encodé.
+    """
+    return b"".join((_encode_string(fencer.lastname), _encode_string(fencer.firstname), _encode_string(fencer.club),
+                     FENCER.pack(FENCER_GENDERS.index(fencer.gender), fencer.age, fencer.licence or 0,
+                                 fencer.has_team)))
+
+
+def _decode_fencer(buffer: bytes, offset: int) -> tuple[Fencer, int]:
+    """
+    Décode un tireur.
+
+    :param buffer: Contenu de l'enregistrement.
+    :param offset: Position du tireur.
+    :return: Tireur et position suivante.
+    """
+    lastname, offset = _decode_string(buffer, offset)
+    firstname, offset = _decode_string(buffer, offset)
+    club, offset = _decode_string(buffer, offset)
+    gender, age, licence, has_team = FENCER.unpack_from(buffer, offset)
+    return Fencer(lastname, firstname, FENCER_GENDERS[gender], age,
+                  club=club, licence=licence or None, has_team=bool(has_team)), offset + FENCER.size
+
+
+def _encode_score(score: Score | None) -> tuple[int, int]:
+    """
+    Encode un score.
+
+    :param score: Score, ou `None`.
+    :return: Touches et code du statut.
+    """
+    if score is None:
+        return 0, NO_SCORE
+    return score.touches, STATUSES.index(score.status)
+
+
+def _decode_score(touches: int, status: int) -> Score | None:
+    """
+    Décode un score.
+
+    :param touches: Touches du score.
+    :param status: Code du statut du score.
+    :return: Score, ou `None`.
+    """
+    if status == NO_SCORE:
+        return None
+    return Score(touches, STATUSES[status])
+
+
+class _Encoder:
+    """
+    Encodeur des événements d'une compétition en enregistrements de segment de journal.
+
+    :param Tournament tournament: Compétition journalisée.
+    """
+    #: Compétition journalisée
+    _tournament: Tournament
+    #: Positions des matchs : numéro de ronde et indice du match dans la ronde
+    _positions: dict[Match, tuple[int, int]]
+
+    def __init__(self, tournament: Tournament) -> None:
+        """
+        Initialise un nouvel encodeur.
+        """
+        self._tournament = tournament
+        self._positions = dict()
+
+    def encode(self, event: Event) -> bytes:
+        """
+        Encode un événement.
+
+        :param event: Événement du journal.
+        :return: Enregistrement, avec son en-tête.
+        """
+        tournament: Tournament = self._tournament
+
+        # Inscription
+        if event.kind == "registration":
+            if isinstance(event.subject, Team):
+                fencers: list[Fencer] = event.subject.fencers_sorted_by_name
+                payload: bytes = b"".join((_encode_string(event.subject.name), COUNT.pack(len(fencers)),
+                                           *map(_encode_fencer, fencers)))
+            else:
+                payload: bytes = _encode_fencer(event.subject)
+
+        # Retrait
+        elif event.kind == "withdrawal":
+            payload: bytes = COUNT.pack(tournament.participant_index(event.subject))
+
+        # Appariement
+        elif event.kind == "pairing":
+            matches: list[Match] = event.subject.matches
+            for i, match in enumerate(matches):
+                self._positions[match] = (event.subject.number, i)
+            payload: bytes = b"".join((COUNT.pack(event.subject.number), COUNT.pack(len(matches)),
+                                       *(PAIR.pack(*(NO_PARTICIPANT if participant is None
+                                                     else tournament.participant_index(participant)
+                                                     for participant in (match.participant1, match.participant2)))
+                                         for match in matches)))
+
+        # Validation et scores en cours
+        else:
+            # Recherche depuis la dernière ronde, pour ne pas décoder les rondes chargées à la demande
+            if event.subject not in self._positions:
+                for number in range(len(tournament.rounds), 0, -1):
+                    for i, match in enumerate(tournament.rounds[number - 1].matches):
+                        self._positions[match] = (number, i)
+                    if event.subject in self._positions:
+                        break
+            number, i = self._positions[event.subject]
+            payload: bytes = VALIDATION.pack(number, i, *_encode_score(event.score1), *_encode_score(event.score2))
+
+        kind: int = KINDS.index(event.kind)
+        return RECORD.pack(len(payload), zlib.crc32(bytes((kind,)) + payload), kind) + payload
+
+
+def _apply(tournament: Tournament, kind: str, payload: bytes) -> None:
+    """
+    Applique un enregistrement de segment de journal à une compétition.
+
+    :param tournament: Compétition restaurée.
+    :param kind: Type de l'enregistrement.
+    :param payload: Contenu de l'enregistrement.
+    """
+    # Inscription
+    if kind == "registration":
+        if tournament.kind == "Équipe":
+            name, offset = _decode_string(payload, 0)
+            count: int = COUNT.unpack_from(payload, offset)[0]
+            offset += COUNT.size
+            fencers: set[Fencer] = set()
+            for _ in range(count):
+                fencer, offset = _decode_fencer(payload, offset)
+                fencers.add(fencer)
+            tournament.add_participant(Team(name, fencers=fencers))
+        else:
+            tournament.add_participant(_decode_fencer(payload, 0)[0])
+
+    # Retrait
+    elif kind == "withdrawal":
+        tournament.remove_participant(tournament.registry[COUNT.unpack_from(payload, 0)[0]])
+
+    # Appariement
+    elif kind == "pairing":
+        number, count = struct.unpack_from("<II", payload, 0)
+        registry: list[Fencer] | list[Team] = tournament.registry
+        participants: set[Fencer] | set[Team] = set()
+        matches: list[Match] = list()
+        for i in range(count):
+            pair: tuple[Fencer | Team | None, ...] = tuple(None if index == NO_PARTICIPANT else registry[index]
+                                                           for index in PAIR.unpack_from(payload, 8 + i * PAIR.size))
+            matches.append(Match(tournament.maximum_score, tournament.draws_are_allowed,
+                                 participant1=pair[0], participant2=pair[1]))
+            participants.update(participant for participant in pair if participant is not None)
+        tournament.add_round(Round(number, tournament.maximum_score, tournament.draws_are_allowed, participants,
+                                   matches=matches))
+
+    # Validation et scores en cours
+    elif kind in ("validation", "score"):
+        number, i, touches1, status1, touches2, status2 = VALIDATION.unpack_from(payload, 0)
+        match: Match = tournament.rounds[number - 1].matches[i]
+        match.score1 = _decode_score(touches1, status1)
+        match.score2 = _decode_score(touches2, status2)
+        if kind == "validation":
+            tournament.validate_match(match)
+
+
+def _checksum(path: str) -> int:
+    """
+    Somme de contrôle d'un fichier de compétition, lu par morceaux.
+
+    :param path: Chemin du fichier de compétition.
+    :return: Somme de contrôle du fichier.
+    """
+    checksum: int = 0
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            checksum = zlib.crc32(chunk, checksum)
+    return checksum
+
+
+def _reset_segment(path: str, content: bytes) -> None:
+    """
+    Remplace atomiquement le segment de journal d'un fichier de compétition qui vient d'être écrit par un segment vide.
+
+    :param path: Chemin du fichier de compétition.
+    :param content: Contenu écrit du fichier de compétition.
+    """
+    tournamentfile.write_atomically(segment_path(path), SEGMENT.pack(MAGIC, zlib.crc32(content)))
+
+
+def _read_records(file: BinaryIO):
+    """
+    Parcourt les enregistrements valides d'un segment de journal, jusqu'au premier enregistrement tronqué ou corrompu.
+
+    :param file: Segment de journal ouvert en lecture.
+    :return: Générateur des types et contenus des enregistrements.
+    """
+    while True:
+        head: bytes = file.read(RECORD.size)
+        if len(head) < RECORD.size:
+            return
+        length, checksum, kind = RECORD.unpack(head)
+        payload: bytes = file.read(length)
+        if (len(payload) < length) or (kind >= len(KINDS)) or (zlib.crc32(bytes((kind,)) + payload) != checksum):
+            return
+        yield KINDS[kind], payload
+
+
+def recover(path: str) -> Tournament:
+    """
+    Charge une compétition depuis son fichier, puis rejoue son segment de journal s'il existe.
+
+    Le segment n'est rejoué que s'il prolonge le fichier : après une interruption entre l'écriture du fichier et la
+    remise à zéro du segment, ses enregistrements sont déjà dans le fichier et sont ignorés.
+
+    :param path: Chemin du fichier de compétition.
+    :return: Compétition restaurée.
+    """
+    tournament: Tournament = tournamentfile.load(path)
+    if os.path.exists(segment_path(path)):
+        with open(segment_path(path), "rb") as file:
+            head: bytes = file.read(SEGMENT.size)
+            if len(head) < SEGMENT.size:
+                return tournament
+            magic, checksum = SEGMENT.unpack(head)
+            if (magic != MAGIC) or (checksum != _checksum(path)):
+                return tournament
+            for kind, payload in _read_records(file):
+                _apply(tournament, kind, payload)
+    return tournament
+
+
+class Autosave:
+    """
+    Classe représentant la sauvegarde automatique et incrémentale d'une compétition.
+
+    Chaque événement du journal est ajouté à un segment de journal à côté du fichier de compétition. Un fil d'exécution
+    dédié écrit sur le disque et compacte périodiquement le segment dans le fichier : le fil de l'interface ne fait
+    qu'encoder les événements, et capturer la compétition pour une sauvegarde complète.
+
+    Chaque segment porte la somme de contrôle du fichier qu'il prolonge : une interruption entre l'écriture du fichier
+    et la remise à zéro du segment ne fait pas rejouer des enregistrements déjà appliqués.
+
+    :param Tournament tournament: Compétition sauvegardée.
+    :param str path: Chemin du fichier de compétition.
+    :param int compaction_interval: Nombre d'enregistrements du segment avant son compactage.
+    """
+    #: Compétition sauvegardée
+    _tournament: Tournament
+    #: Chemin du fichier de compétition
+    _path: str
+    #: Nombre d'enregistrements du segment avant son compactage
+    _compaction_interval: int
+    #: Encodeur des événements
+    _encoder: _Encoder
+    #: Tâches du fil d'écriture : ``('append', enregistrement)``, ``('save', capture)`` ou ``('stop', None)``
+    _tasks: Queue
+    #: Fil d'écriture
+    _thread: Thread | None
+    #: Erreur de la dernière écriture, effacée par la suivante si elle réussit
+    _error: Exception | None
+
+    def __init__(self, tournament: Tournament, path: str, *,
+                 compaction_interval: int = 1024) -> None:
+        """
+        Initialise une nouvelle sauvegarde automatique.
+        """
+        # Compétition et fichier
+        self._tournament = tournament
+        self._path = path
+
+        # Intervalle de compactage
+        if compaction_interval <= 0:
+            raise ValueError("Le paramètre `compaction_interval` doit être strictement supérieur à `0`.")
+        self._compaction_interval = compaction_interval
+
+        # Écriture
+        self._encoder = _Encoder(tournament)
+        self._tasks = Queue()
+        self._thread = None
+        self._error = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def error(self) -> Exception | None:
+        return self._error
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Activité du fil d'écriture.
+        """
+        return (self._thread is not None) and self._thread.is_alive()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self._path!r}, compaction_interval={self._compaction_interval})"
+
+    def start(self) -> None:
+        """
+        Démarre la sauvegarde automatique, en commençant par une sauvegarde complète.
+        """
+        if self.is_running:
+            return
+        self._thread = Thread(target=self._run, name=f"Autosave({os.path.basename(self._path)})", daemon=True)
+        self._thread.start()
+        self._tournament.journal.subscribe(self._on_journal)
+        self.save()
+
+    def stop(self, *,
+             timeout: float | None = None) -> None:
+        """
+        Arrête la sauvegarde automatique, après avoir écrit les enregistrements en attente.
+
+        :param timeout: Durée maximale d'attente du fil d'écriture, en secondes.
+        """
+        self._tournament.journal.unsubscribe(self._on_journal)
+        if self.is_running:
+            self._tasks.put(("stop", None))
+            self._thread.join(timeout)
+
+    def save(self) -> None:
+        """
+        Demande une sauvegarde complète de la compétition, encodée et écrite en arrière-plan.
+        """
+        self._tasks.put(("save", tournamentfile.capture(self._tournament)))
+
+    def _on_journal(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Ajoute un ou plusieurs événements au segment de journal, ou demande une sauvegarde complète après un retour en
+        arrière ou une modification hors du journal.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        """
+        if operation in ("record", "score"):
+            self._tasks.put(("append", self._encoder.encode(event)))
+        elif operation == "extend":
+            for batch_event in event:
+                self._tasks.put(("append", self._encoder.encode(batch_event)))
+        else:
+            self.save()
+
+    def _run(self) -> None:
+        """
+        Boucle du fil d'écriture.
+        """
+        segment: str = segment_path(self._path)
+        records: int = 0
+        file: BinaryIO | None = None
+        stopping: bool = False
+        try:
+            while not stopping:
+                # Regroupement des tâches en attente
+                tasks: list[tuple[str, bytes | tournamentfile.Capture | None]] = [self._tasks.get()]
+                while True:
+                    try:
+                        tasks.append(self._tasks.get_nowait())
+                    except Empty:
+                        break
+
+                failed: bool = False
+                for task, content in tasks:
+                    try:
+                        # Arrêt, après l'écriture des tâches précédentes
+                        if task == "stop":
+                            stopping = True
+
+                        # Sauvegarde complète
+                        elif task == "save":
+                            if file is not None:
+                                file.close()
+                                file = None
+                            encoded: bytes = tournamentfile.dumps(content)
+                            tournamentfile.write_atomically(self._path, encoded)
+                            _reset_segment(self._path, encoded)
+                            records = 0
+                            self._error = None
+                            failed = False
+
+                        # Ajout au segment
+                        elif task == "append":
+                            if file is None:
+                                file = open(segment, "ab")
+                            file.write(content)
+                            records += 1
+                    except (OSError, ValueError) as error:
+                        self._error = error
+                        failed = True
+
+                # Écriture sur le disque, qui efface l'erreur précédente si aucune tâche n'a échoué
+                if file is not None:
+                    try:
+                        file.flush()
+                        os.fsync(file.fileno())
+                        if not failed:
+                            self._error = None
+                    except OSError as error:
+                        self._error = error
+
+                # Compactage
+                if records >= self._compaction_interval:
+                    try:
+                        file.close()
+                        file = None
+                        encoded: bytes = tournamentfile.dumps(recover(self._path))
+                        tournamentfile.write_atomically(self._path, encoded)
+                        _reset_segment(self._path, encoded)
+                        records = 0
+                        self._error = None
+                    except (OSError, ValueError) as error:
+                        self._error = error
+        finally:
+            if file is not None:
+                file.close()
@@ -0,0 +1,468 @@
+import sqlite3
+
+from typing import NamedTuple
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.standings import Checkpoint
+from competition.team import Team
+from competition.tournament import Tournament
+
+from storage.tournamentfile import decode_checkpoint, encode_checkpoint
+
+
+#: Version du schéma de la base
+SCHEMA_VERSION: int = 1
+
+#: Schéma de la base : une ligne par compétition, tireur, équipe, participant, ronde et match
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    season TEXT NOT NULL,
+    name TEXT NOT NULL,
+    weapon TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    category TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    maximum_score INTEGER NOT NULL,
+    licences_are_needed INTEGER NOT NULL,
+    draws_are_allowed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fencers (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    team_id INTEGER REFERENCES teams (id) ON DELETE CASCADE,
+    lastname TEXT NOT NULL,
+    firstname TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    club TEXT,
+    licence INTEGER
+);
+CREATE TABLE IF NOT EXISTS participants (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    fencer_id INTEGER REFERENCES fencers (id) ON DELETE CASCADE,
+    team_id INTEGER REFERENCES teams (id) ON DELETE CASCADE,
+    is_active INTEGER NOT NULL,
+    victories REAL NOT NULL,
+    touches_scored INTEGER NOT NULL,
+    touches_received INTEGER NOT NULL,
+    PRIMARY KEY (tournament_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    checkpoint BLOB,
+    PRIMARY KEY (tournament_id, number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    participant1 INTEGER,
+    touches1 INTEGER,
+    status1 TEXT,
+    participant2 INTEGER,
+    touches2 INTEGER,
+    status2 TEXT,
+    is_validated INTEGER NOT NULL,
+    FOREIGN KEY (tournament_id, round) REFERENCES rounds (tournament_id, number) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS tournaments_season ON tournaments (season);
+CREATE INDEX IF NOT EXISTS teams_tournament ON teams (tournament_id);
+CREATE INDEX IF NOT EXISTS fencers_licence ON fencers (licence);
+CREATE INDEX IF NOT EXISTS fencers_name ON fencers (lastname, firstname);
+CREATE INDEX IF NOT EXISTS fencers_club ON fencers (club);
+CREATE INDEX IF NOT EXISTS fencers_tournament ON fencers (tournament_id);
+CREATE INDEX IF NOT EXISTS fencers_team ON fencers (team_id);
+CREATE INDEX IF NOT EXISTS participants_fencer ON participants (fencer_id);
+CREATE INDEX IF NOT EXISTS participants_team ON participants (team_id);
+CREATE UNIQUE INDEX IF NOT EXISTS matches_round ON matches (tournament_id, round, position);
+CREATE INDEX IF NOT EXISTS matches_participant1 ON matches (tournament_id, participant1);
+CREATE INDEX IF NOT EXISTS matches_participant2 ON matches (tournament_id, participant2);
+"""
+
+#: Matchs d'un.e tireur/équipe, vus de son côté, à partir de sa position dans le registre de la compétition
+RESULTS: str = """
+SELECT t.id, t.season, t.name, m.round, m.participant1,
+       m.participant2, m.touches1, m.status1, m.touches2, m.status2, m.is_validated
+FROM matches m JOIN tournaments t ON t.id = m.tournament_id
+WHERE m.tournament_id = :tournament_id AND m.participant1 = :position
+UNION ALL
+SELECT t.id, t.season, t.name, m.round, m.participant2,
+       m.participant1, m.touches2, m.status2, m.touches1, m.status1, m.is_validated
+FROM matches m JOIN tournaments t ON t.id = m.tournament_id
+WHERE m.tournament_id = :tournament_id AND m.participant2 = :position
+"""
+
+
+class TournamentRow(NamedTuple):
+    """
+    Compétition enregistrée dans la base.
+
+    :param int id: Identifiant de la compétition.
+    :param str season: Saison de la compétition.
+    :param str name: Nom de la compétition.
+    :param str weapon: Arme de la compétition.
+    :param str gender: Sexe de la compétition.
+    :param str category: Catégorie de la compétition.
+    :param str kind: Type de compétition : `Individuelle` ou `Équipe`.
+    """
+    #: Identifiant de la compétition
+    id: int
+    #: Saison de la compétition
+    season: str
+    #: Nom de la compétition
+    name: str
+    #: Arme de la compétition
+    weapon: str
+    #: Sexe de la compétition
+    gender: str
+    #: Catégorie de la compétition
+    category: str
+    #: Type de compétition : `Individuelle` ou `Équipe`
+    kind: str
+
+
+class Result(NamedTuple):
+    """
+    Match d'un tireur, vu de son côté.
+
+    :param int tournament_id: Identifiant de la compétition.
+    :param str season: Saison de la compétition.
+    :param str tournament: Nom de la compétition.
+    :param int round: Numéro de la ronde.
+    :param int position: Position du tireur/équipe dans le registre de la compétition.
+    :param int|None opponent: Position de l'adversaire dans le registre de la compétition, ou `None` pour une exemption.
+    :param Score|None score: Score du tireur/équipe.
+    :param Score|None opponent_score: Score de l'adversaire.
+    :param bool is_validated: Validation du match.
+    """
+    #: Identifiant de la compétition
+    tournament_id: int
+    #: Saison de la compétition
+    season: str
+    #: Nom de la compétition
+    tournament: str
+    #: Numéro de la ronde
+    round: int
+    #: Position du tireur/équipe dans le registre de la compétition
+    position: int
+    #: Position de l'adversaire dans le registre de la compétition, ou `None` pour une exemption
+    opponent: int | None
+    #: Score du tireur/équipe
+    score: Score | None
+    #: Score de l'adversaire
+    opponent_score: Score | None
+    #: Validation du match
+    is_validated: bool
+
+
+def _columns(score: Score | None) -> tuple[int | None, str | None]:
+    """
+    Colonnes d'un score : touches et statut.
+
+    :param score: Score, s'il existe.
+    :return: Touches et statut, ou `None` en l'absence de score.
+    """
+    return (None, None) if score is None else (score.touches, score.status)
+
+
+def _score(touches: int | None, status: str | None) -> Score | None:
+    """
+    Reconstruit un score depuis ses colonnes.
+
+    :param touches: Touches, ou `None` en l'absence de score.
+    :param status: Statut du score.
+    :return: Score, s'il existe.
+    """
+    return None if touches is None else Score(touches, status)
+
+
+class Database:
+    """
+    Classe représentant une base SQLite de compétitions, pour les requêtes sur plusieurs compétitions d'une saison.
+
+    Chaque compétition est enregistrée en entier et remplacée à chaque enregistrement. Les requêtes par licence, nom,
+    club, compétition et ronde s'appuient sur des index.
+
+    :param str path: Chemin de la base, ou ``':memory:'``.
+    """
+    #: Chemin de la base
+    _path: str
+    #: Connexion à la base
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        Ouvre, en la créant si nécessaire, une base de compétitions.
+        """
+        self._path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        version: int = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self._connection.close()
+            raise ValueError(f"La version `{version}` du schéma de la base n'est pas prise en charge.")
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._connection
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self._path!r})"
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Ferme la base.
+        """
+        self._connection.close()
+
+    def save_tournament(self, tournament: Tournament, season: str, *,
+                        tournament_id: int | None = None) -> int:
+        """
+        Enregistre une compétition, en remplaçant la précédente version si son identifiant est donné.
+
+        :param tournament: Compétition à enregistrer.
+        :param season: Saison de la compétition, par exemple ``'2025-2026'``.
+        :param tournament_id: Identifiant de la compétition déjà enregistrée, ou `None`.
+        :return: Identifiant de la compétition.
+        """
+        if len(season) == 0:
+            raise ValueError("Le paramètre `season` doit être non vide.")
+        registry: list[Fencer] | list[Team] = tournament.registry
+        positions: dict[int, int] = {id(participant): i for i, participant in enumerate(registry)}
+
+        def position(participant: Fencer | Team | None) -> int | None:
+            return None if participant is None else positions[id(participant)]
+
+        with self._connection as connection:
+            # Compétition
+            if tournament_id is not None:
+                connection.execute("DELETE FROM tournaments WHERE id = ?", (tournament_id,))
+            tournament_id = connection.execute(
+                "INSERT INTO tournaments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (tournament_id, season, tournament.name, tournament.weapon, tournament.gender, tournament.category,
+                 tournament.kind, tournament.maximum_score, tournament.licences_are_needed,
+                 tournament.draws_are_allowed)).lastrowid
+
+            # Tireurs, équipes et participants
+            for i, participant in enumerate(registry):
+                team_id: int | None = None
+                fencer_id: int | None = None
+                if isinstance(participant, Team):
+                    team_id = connection.execute("INSERT INTO teams (tournament_id, name) VALUES (?, ?)",
+                                                 (tournament_id, participant.name)).lastrowid
+                    fencers: list[Fencer] = participant.fencers_sorted_by_name
+                else:
+                    fencers: list[Fencer] = [participant]
+                for fencer in fencers:
+                    fencer_id = connection.execute(
+                        "INSERT INTO fencers (tournament_id, team_id, lastname, firstname, gender, age, club, licence) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (tournament_id, team_id, fencer.lastname, fencer.firstname, fencer.gender, fencer.age,
+                         fencer.club, fencer.licence)).lastrowid
+                connection.execute("INSERT INTO participants VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (tournament_id, i, None if team_id is not None else fencer_id, team_id,
+                                    participant in tournament.participants, participant.victories,
+                                    participant.touches_scored, participant.touches_received))
+
+            # Rondes et matchs
+            checkpoints: list[Checkpoint] = tournament.checkpoints
+            connection.executemany("INSERT INTO rounds VALUES (?, ?, ?)",
+                                   ((tournament_id, number, encode_checkpoint(checkpoints[number - 1])
+                                     if number - 1 < len(checkpoints) else None)
+                                    for number in range(1, len(tournament.rounds) + 1)))
+            connection.executemany(
+                "INSERT INTO matches (tournament_id, round, position, participant1, touches1, status1, "
+                "participant2, touches2, status2, is_validated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((tournament_id, played_round.number, i,
+                  position(match.participant1),
+                  *_columns(match.score1),
+                  position(match.participant2),
+                  *_columns(match.score2),
+                  match.is_validated)
+                 for played_round in tournament.rounds for i, match in enumerate(played_round.matches)))
+        return tournament_id
+
+    def delete_tournament(self, tournament_id: int) -> None:
+        """
+        Supprime une compétition et tout son contenu.
+
+        :param tournament_id: Identifiant de la compétition.
+        """
+        with self._connection as connection:
+            connection.execute("DELETE FROM tournaments WHERE id = ?", (tournament_id,))
+
+    def tournaments(self, *,
+                    season: str | None = None) -> list[TournamentRow]:
+        """
+        Compétitions enregistrées, éventuellement d'une seule saison.
+
+        :param season: Saison des compétitions, ou `None` pour toutes les saisons.
+        :return: Compétitions, par identifiant.
+        """
+        if season is None:
+            rows = self._connection.execute("SELECT id, season, name, weapon, gender, category, kind "
+                                            "FROM tournaments ORDER BY id")
+        else:
+            rows = self._connection.execute("SELECT id, season, name, weapon, gender, category, kind "
+                                            "FROM tournaments WHERE season = ? ORDER BY id", (season,))
+        return [TournamentRow(*row) for row in rows]
+
+    def load_tournament(self, tournament_id: int) -> Tournament:
+        """
+        Charge une compétition enregistrée.
+
+        :param tournament_id: Identifiant de la compétition.
+        :return: Compétition chargée.
+        """
+        connection: sqlite3.Connection = self._connection
+        row = connection.execute("SELECT name, weapon, gender, category, kind, maximum_score, licences_are_needed, "
+                                 "draws_are_allowed FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"La compétition `{tournament_id}` n'existe pas dans la base.")
+        tournament: Tournament = Tournament(*row[:6], bool(row[6]), bool(row[7]))
+
+        # Tireurs et équipes
+        fencers: dict[int, Fencer] = dict()
+        members: dict[int, set[Fencer]] = dict()
+        for fencer_id, team_id, lastname, firstname, gender, age, club, licence in connection.execute(
+                "SELECT id, team_id, lastname, firstname, gender, age, club, licence "
+                "FROM fencers WHERE tournament_id = ? ORDER BY id", (tournament_id,)):
+            fencers[fencer_id] = Fencer(lastname, firstname, gender, age, club=club, licence=licence,
+                                        has_team=team_id is not None)
+            if team_id is not None:
+                members.setdefault(team_id, set()).add(fencers[fencer_id])
+        teams: dict[int, Team] = {team_id: Team(name, fencers=members.get(team_id, set()))
+                                  for team_id, name in connection.execute(
+                                      "SELECT id, name FROM teams WHERE tournament_id = ? ORDER BY id",
+                                      (tournament_id,))}
+
+        # Registre et participants
+        registry: list[Fencer] | list[Team] = list()
+        participants: set[Fencer] | set[Team] = set()
+        scores: list[tuple[float, int, int]] = list()
+        for fencer_id, team_id, is_active, victories, touches_scored, touches_received in connection.execute(
+                "SELECT fencer_id, team_id, is_active, victories, touches_scored, touches_received "
+                "FROM participants WHERE tournament_id = ? ORDER BY position", (tournament_id,)):
+            participant: Fencer | Team = fencers[fencer_id] if team_id is None else teams[team_id]
+            registry.append(participant)
+            scores.append((victories, touches_scored, touches_received))
+            if is_active:
+                participants.add(participant)
+
+        # Rondes, adversaires rencontrés et exemptions
+        opponents: list[set[Fencer] | set[Team]] = [set() for _ in registry]
+        exempted: list[bool] = [False] * len(registry)
+        rounds: list[Round] = list()
+        checkpoints: list[Checkpoint] = list()
+        for number, checkpoint in connection.execute("SELECT number, checkpoint FROM rounds "
+                                                     "WHERE tournament_id = ? ORDER BY number", (tournament_id,)):
+            if checkpoint is not None:
+                checkpoints.append(decode_checkpoint(memoryview(checkpoint), 0))
+            matches: list[Match] = list()
+            for position1, touches1, status1, position2, touches2, status2, is_validated in connection.execute(
+                    "SELECT participant1, touches1, status1, participant2, touches2, status2, is_validated "
+                    "FROM matches WHERE tournament_id = ? AND round = ? ORDER BY position", (tournament_id, number)):
+                participant1: Fencer | Team | None = None if position1 is None else registry[position1]
+                participant2: Fencer | Team | None = None if position2 is None else registry[position2]
+                matches.append(Match(tournament.maximum_score, tournament.draws_are_allowed,
+                                     participant1=participant1, score1=_score(touches1, status1),
+                                     participant2=participant2, score2=_score(touches2, status2),
+                                     is_validated=bool(is_validated)))
+                if (position1 is not None) and (position2 is not None):
+                    opponents[position1].add(participant2)
+                    opponents[position2].add(participant1)
+                else:
+                    exempted[position1 if position2 is None else position2] = True
+            rounds.append(Round(number, tournament.maximum_score, tournament.draws_are_allowed,
+                                {participant for match in matches
+                                 for participant in (match.participant1, match.participant2)
+                                 if participant is not None},
+                                matches=matches))
+
+        for i, participant in enumerate(registry):
+            participant.restore(*scores[i], opponents_encountered=opponents[i], has_been_exempted=exempted[i])
+        tournament.restore(registry, participants, rounds, checkpoints)
+        return tournament
+
+    def find_fencers(self, *,
+                     licence: int | None = None,
+                     lastname: str | None = None,
+                     firstname: str | None = None,
+                     club: str | None = None,
+                     season: str | None = None) -> list[tuple[int, Fencer]]:
+        """
+        Cherche des tireurs dans toutes les compétitions, par licence, nom ou club.
+
+        :param licence: Licence du tireur.
+        :param lastname: Nom du tireur.
+        :param firstname: Prénom du tireur, avec le nom.
+        :param club: Club du tireur.
+        :param season: Saison des compétitions, ou `None` pour toutes les saisons.
+        :return: Identifiants des compétitions et tireurs trouvés.
+        """
+        if (licence is None) and (lastname is None) and (club is None):
+            raise ValueError("L'un des paramètres `licence`, `lastname` ou `club` doit être renseigné.")
+        conditions: list[str] = list()
+        parameters: list[int | str] = list()
+        for column, value in (("f.licence", licence), ("f.lastname", lastname), ("f.firstname", firstname),
+                              ("f.club", club), ("t.season", season)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        return [(row[0], Fencer(*row[2:6], club=row[6], licence=row[7], has_team=row[1] is not None))
+                for row in self._connection.execute(
+                    "SELECT f.tournament_id, f.team_id, f.lastname, f.firstname, f.gender, f.age, f.club, f.licence "
+                    "FROM fencers f JOIN tournaments t ON t.id = f.tournament_id "
+                    f"WHERE {' AND '.join(conditions)} ORDER BY f.tournament_id, f.id", parameters)]
+
+    def results(self, licence: int, *,
+                season: str | None = None) -> list[Result]:
+        """
+        Matchs d'un tireur, ou de son équipe, dans toutes les compétitions.
+
+        :param licence: Licence du tireur.
+        :param season: Saison des compétitions, ou `None` pour toutes les saisons.
+        :return: Matchs du tireur, par compétition et ronde.
+        """
+        # Positions du tireur, ou de son équipe, dans le registre de chaque compétition
+        query: str = ("SELECT p.tournament_id, p.position FROM fencers f "
+                      "JOIN participants p ON p.fencer_id = f.id OR p.team_id = f.team_id "
+                      "JOIN tournaments t ON t.id = p.tournament_id "
+                      "WHERE f.licence = ?")
+        parameters: tuple = (licence,)
+        if season is not None:
+            query += " AND t.season = ?"
+            parameters += (season,)
+        results: list[Result] = list()
+        for tournament_id, position in self._connection.execute(query, parameters).fetchall():
+            for row in self._connection.execute(RESULTS, {"tournament_id": tournament_id, "position": position}):
+                results.append(Result(*row[:6], _score(*row[6:8]), _score(*row[8:10]), bool(row[10])))
+        results.sort(key=lambda x: (x.tournament_id, x.round))
+        return results
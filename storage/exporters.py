@@ -0,0 +1,339 @@
+import csv
+import json
+import os
+import shutil
+import zlib
+
+from collections.abc import Iterator
+
+from html import escape
+
+from typing import TextIO
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.standings import Standing
+from competition.team import Team
+from competition.tournament import Tournament
+
+from storage.tournamentfile import open_atomically, round_block
+
+
+#: Formats d'exportation
+FORMATS: frozenset[str] = frozenset(("csv", "jsonl", "html"))
+
+#: Colonnes du classement, avec leur intitulé
+STANDINGS_COLUMNS: dict[str, str] = {"rank": "Rang",
+                                     "name": "Nom",
+                                     "club": "Club",
+                                     "licence": "Licence",
+                                     "victories": "Victoires",
+                                     "indicator": "Indice",
+                                     "touches_scored": "Touches portées",
+                                     "touches_received": "Touches reçues"}
+
+#: Colonnes des matchs d'une ronde, avec leur intitulé
+MATCHES_COLUMNS: dict[str, str] = {"round": "Ronde",
+                                   "table": "Table",
+                                   "participant1": "Tireur/Équipe 1",
+                                   "score1": "Score 1",
+                                   "score2": "Score 2",
+                                   "participant2": "Tireur/Équipe 2",
+                                   "is_validated": "Validé"}
+
+#: Nom du fichier des empreintes des sections exportées
+MANIFEST: str = "manifest.json"
+#: Nom du dossier des fragments HTML
+FRAGMENTS: str = "sections"
+
+
+def display_name(participant: Fencer | Team | None) -> str:
+    """
+    Nom affiché d'un.e tireur/équipe.
+
+    :param participant: Tireur/Équipe, ou `None` pour une exemption.
+    :return: Nom affiché.
+    """
+    if participant is None:
+        return "Exempt.e"
+    if isinstance(participant, Team):
+        return participant.name
+    return f"{participant.lastname} {participant.firstname}"
+
+
+def score_string(score: Score | None) -> str:
+    """
+    Représentation d'un score, lisible par `Score.from_str_score`.
+
+    :param score: Score, s'il existe.
+    :return: Statut éventuel suivi des touches, ou une chaîne vide.
+    """
+    if score is None:
+        return ""
+    return f"{score.status or ''}{score.touches}"
+
+
+def standings_rows(standings: list[Standing]) -> Iterator[dict[str, str | int | float | None]]:
+    """
+    Lignes du classement d'une compétition.
+
+    :param standings: Classement de la compétition.
+    :return: Lignes du classement, une par tireur/équipe.
+    """
+    for standing in standings:
+        participant: Fencer | Team = standing.participant
+        yield {"rank": standing.rank,
+               "name": display_name(participant),
+               "club": participant.club if isinstance(participant, Fencer) else None,
+               "licence": participant.licence if isinstance(participant, Fencer) else None,
+               "victories": standing.victories,
+               "indicator": standing.indicator,
+               "touches_scored": standing.touches_scored,
+               "touches_received": standing.touches_received}
+
+
+def matches_rows(played_round: Round) -> Iterator[dict[str, str | int | bool]]:
+    """
+    Lignes des matchs d'une ronde : appariements, puis résultats une fois saisis.
+
+    :param played_round: Ronde appariée.
+    :return: Lignes des matchs, une par table.
+    """
+    match: Match
+    for table, match in enumerate(played_round.matches, 1):
+        yield {"round": played_round.number,
+               "table": table,
+               "participant1": display_name(match.participant1),
+               "score1": score_string(match.score1),
+               "score2": score_string(match.score2),
+               "participant2": display_name(match.participant2),
+               "is_validated": match.is_validated}
+
+
+def write_csv(rows: Iterator[dict], columns: dict[str, str], file: TextIO) -> None:
+    """
+    Écrit des lignes au format CSV, une à une.
+
+    :param rows: Lignes à écrire.
+    :param columns: Colonnes, avec leur intitulé.
+    :param file: Fichier texte ouvert en écriture, sans traduction des fins de ligne.
+    """
+    writer = csv.writer(file, delimiter=";")
+    writer.writerow(columns.values())
+    for row in rows:
+        writer.writerow(("" if row[column] is None else row[column]) for column in columns)
+
+
+def write_jsonl(rows: Iterator[dict], file: TextIO) -> None:
+    """
+    Écrit des lignes au format JSON Lines, une à une.
+
+    :param rows: Lignes à écrire.
+    :param file: Fichier texte ouvert en écriture.
+    """
+    for row in rows:
+        file.write(json.dumps(row, ensure_ascii=False))
+        file.write("\n")
+
+
+def write_html(rows: Iterator[dict], columns: dict[str, str], section: str, title: str, file: TextIO) -> None:
+    """
+    Écrit des lignes sous forme d'une section HTML contenant un tableau, une à une.
+
+    :param rows: Lignes à écrire.
+    :param columns: Colonnes, avec leur intitulé.
+    :param section: Identifiant de la section.
+    :param title: Titre de la section.
+    :param file: Fichier texte ouvert en écriture.
+    """
+    file.write(f'<section id="{escape(section)}">\n<h2>{escape(title)}</h2>\n<table>\n<thead><tr>')
+    file.write("".join(f"<th>{escape(label)}</th>" for label in columns.values()))
+    file.write("</tr></thead>\n<tbody>\n")
+    for row in rows:
+        file.write("<tr>")
+        file.write("".join(f"<td>{escape(_html_value(row[column]))}</td>" for column in columns))
+        file.write("</tr>\n")
+    file.write("</tbody>\n</table>\n</section>\n")
+
+
+def _html_value(value: str | int | float | bool | None) -> str:
+    """
+    Représentation d'une valeur dans une cellule HTML.
+
+    :param value: Valeur de la cellule.
+    :return: Texte de la cellule.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Oui" if value else "Non"
+    return str(value)
+
+
+class Exporter:
+    """
+    Classe représentant l'exportation des résultats d'une compétition dans un dossier.
+
+    Chaque section, le classement puis chaque ronde, est écrite dans son propre fichier pour chaque format, ligne par
+    ligne depuis la compétition. Une empreinte de chaque section est conservée dans le dossier, pour ne réécrire que les
+    sections modifiées lors des exportations suivantes. La page HTML est assemblée en recopiant les fragments des
+    sections.
+
+    :param Tournament tournament: Compétition exportée.
+    :param str directory: Dossier d'exportation.
+    :param set[str] formats: Formats d'exportation, parmi ``{'csv', 'jsonl', 'html'}``.
+    """
+    #: Compétition exportée
+    _tournament: Tournament
+    #: Dossier d'exportation
+    _directory: str
+    #: Formats d'exportation
+    _formats: frozenset[str]
+
+    def __init__(self, tournament: Tournament, directory: str, *,
+                 formats: set[str] | frozenset[str] = FORMATS) -> None:
+        """
+        Initialise une nouvelle exportation.
+        """
+        self._tournament = tournament
+        self._directory = directory
+        if (not formats) or (not FORMATS.issuperset(formats)):
+            raise ValueError("Le paramètre `formats` doit être une partie non vide de `{'csv', 'jsonl', 'html'}`.")
+        self._formats = frozenset(formats)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def formats(self) -> frozenset[str]:
+        return self._formats
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(directory={self._directory!r}, formats={sorted(self._formats)})"
+
+    def export(self) -> list[str]:
+        """
+        Exporte les sections modifiées depuis la dernière exportation.
+
+        :return: Chemins des fichiers réécrits.
+        """
+        tournament: Tournament = self._tournament
+        os.makedirs(os.path.join(self._directory, FRAGMENTS), exist_ok=True)
+        manifest: dict[str, int | list[str]] = self._read_manifest()
+        if manifest.get("formats") != sorted(self._formats):
+            manifest = {"formats": sorted(self._formats)}
+        written: list[str] = list()
+
+        # Classement
+        standings: list[Standing] = tournament.standings()
+        digest: int = zlib.crc32(repr([(standing.rank, display_name(standing.participant), standing.victories,
+                                        standing.touches_scored, standing.touches_received)
+                                       for standing in standings]).encode("utf-8"))
+        sections: list[str] = ["standings"]
+        if manifest.get("standings") != digest:
+            written.extend(self._write_section("standings", "Classement", STANDINGS_COLUMNS,
+                                               lambda: standings_rows(standings)))
+            manifest["standings"] = digest
+
+        # Rondes, de la plus récente à la plus ancienne
+        indexes: dict[Fencer, int] | dict[Team, int] = {participant: i
+                                                        for i, participant in enumerate(tournament.registry)}
+        for i in reversed(range(len(tournament.rounds))):
+            section: str = f"round-{i + 1:03d}"
+            sections.append(section)
+            digest = zlib.crc32(round_block(tournament, i, indexes))
+            if manifest.get(section) != digest:
+                written.extend(self._write_section(section, f"Ronde {i + 1}", MATCHES_COLUMNS,
+                                                   lambda i=i: matches_rows(tournament.rounds[i])))
+                manifest[section] = digest
+
+        # Sections des rondes annulées
+        for section in set(manifest).difference(sections, ("formats", "page")):
+            del manifest[section]
+            for extension in self._formats:
+                path: str = self._section_path(section, extension)
+                if os.path.exists(path):
+                    os.remove(path)
+                    written.append(path)
+
+        # Page HTML
+        if "html" in self._formats:
+            digest = zlib.crc32(repr((tournament.name, tournament.category,
+                                      [manifest[section] for section in sections])).encode("utf-8"))
+            if manifest.get("page") != digest:
+                written.append(self._write_page(sections))
+                manifest["page"] = digest
+
+        with open_atomically(os.path.join(self._directory, MANIFEST), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=1, sort_keys=True)
+        return written
+
+    def _read_manifest(self) -> dict[str, int | list[str]]:
+        """
+        Lit les empreintes des sections exportées.
+
+        :return: Formats et empreintes, par section, vides si le dossier n'a jamais été exporté.
+        """
+        try:
+            with open(os.path.join(self._directory, MANIFEST), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+    def _section_path(self, section: str, extension: str) -> str:
+        """
+        Chemin du fichier d'une section.
+
+        :param section: Identifiant de la section.
+        :param extension: Format du fichier.
+        :return: Chemin du fichier, les fragments HTML étant rangés à part.
+        """
+        if extension == "html":
+            return os.path.join(self._directory, FRAGMENTS, f"{section}.html")
+        return os.path.join(self._directory, f"{section}.{extension}")
+
+    def _write_section(self, section: str, title: str, columns: dict[str, str], rows) -> list[str]:
+        """
+        Écrit une section dans chaque format.
+
+        :param section: Identifiant de la section.
+        :param title: Titre de la section.
+        :param columns: Colonnes, avec leur intitulé.
+        :param rows: Fonction renvoyant un nouvel itérateur sur les lignes de la section.
+        :return: Chemins des fichiers écrits.
+        """
+        paths: list[str] = list()
+        for extension in sorted(self._formats):
+            path: str = self._section_path(section, extension)
+            with open_atomically(path, "w", encoding="utf-8", newline="") as file:
+                if extension == "csv":
+                    write_csv(rows(), columns, file)
+                elif extension == "jsonl":
+                    write_jsonl(rows(), file)
+                else:
+                    write_html(rows(), columns, section, title, file)
+            paths.append(path)
+        return paths
+
+    def _write_page(self, sections: list[str]) -> str:
+        """
+        Assemble la page HTML en recopiant les fragments des sections.
+
+        :param sections: Identifiants des sections, dans l'ordre de la page.
+        :return: Chemin de la page.
+        """
+        tournament: Tournament = self._tournament
+        title: str = escape(f"{tournament.name} — {tournament.category}")
+        path: str = os.path.join(self._directory, "index.html")
+        with open_atomically(path, "w", encoding="utf-8", newline="") as page:
+            page.write(f'<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n'
+                       f'</head>\n<body>\n<h1>{title}</h1>\n')
+            for section in sections:
+                with open(self._section_path(section, "html"), "r", encoding="utf-8", newline="") as fragment:
+                    shutil.copyfileobj(fragment, page)
+            page.write("</body>\n</html>\n")
+        return path
@@ -0,0 +1,275 @@
+from typing import NamedTuple
+
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.tournament import Tournament
+
+from storage.database import Database
+
+
+#: Schéma de l'index des assauts : deux lignes par assaut, une du point de vue de chaque tireur
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS bouts (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    season TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    licence INTEGER NOT NULL,
+    opponent_licence INTEGER NOT NULL,
+    rank INTEGER,
+    opponent_rank INTEGER,
+    touches_scored INTEGER NOT NULL,
+    touches_received INTEGER NOT NULL,
+    outcome INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS indexed_tournaments (
+    tournament_id INTEGER PRIMARY KEY REFERENCES tournaments (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS bouts_opponent ON bouts (licence, opponent_licence);
+CREATE INDEX IF NOT EXISTS bouts_season ON bouts (licence, season, tournament_id, round);
+CREATE INDEX IF NOT EXISTS bouts_tournament ON bouts (tournament_id);
+"""
+
+#: Résultat d'un assaut : victoire
+VICTORY: int = 1
+#: Résultat d'un assaut : match nul
+DRAW: int = 0
+#: Résultat d'un assaut : défaite
+DEFEAT: int = -1
+
+
+class Bout(NamedTuple):
+    """
+    Assaut d'un tireur, vu de son côté.
+
+    :param int tournament_id: Identifiant de la compétition.
+    :param str season: Saison de la compétition.
+    :param int round: Numéro de la ronde.
+    :param int opponent: Licence de l'adversaire.
+    :param int|None rank: Rang du tireur au début de la ronde.
+    :param int|None opponent_rank: Rang de l'adversaire au début de la ronde.
+    :param int touches_scored: Touches portées.
+    :param int touches_received: Touches reçues.
+    :param int outcome: Résultat : `VICTORY`, `DRAW` ou `DEFEAT`.
+    """
+    #: Identifiant de la compétition
+    tournament_id: int
+    #: Saison de la compétition
+    season: str
+    #: Numéro de la ronde
+    round: int
+    #: Licence de l'adversaire
+    opponent: int
+    #: Rang du tireur au début de la ronde
+    rank: int | None
+    #: Rang de l'adversaire au début de la ronde
+    opponent_rank: int | None
+    #: Touches portées
+    touches_scored: int
+    #: Touches reçues
+    touches_received: int
+    #: Résultat : `VICTORY`, `DRAW` ou `DEFEAT`
+    outcome: int
+
+
+class Record(NamedTuple):
+    """
+    Bilan d'un ensemble d'assauts.
+
+    :param int bouts: Nombre d'assauts.
+    :param int victories: Victoires.
+    :param int draws: Matchs nuls.
+    :param int defeats: Défaites.
+    :param int touches_scored: Touches portées.
+    :param int touches_received: Touches reçues.
+    """
+    #: Nombre d'assauts
+    bouts: int
+    #: Victoires
+    victories: int
+    #: Matchs nuls
+    draws: int
+    #: Défaites
+    defeats: int
+    #: Touches portées
+    touches_scored: int
+    #: Touches reçues
+    touches_received: int
+
+    @property
+    def win_rate(self) -> float | None:
+        """
+        Taux de victoire, les matchs nuls comptant pour moitié.
+        """
+        if self.bouts == 0:
+            return None
+        return (self.victories + self.draws / 2) / self.bouts
+
+
+#: Agrégats d'un bilan, dans l'ordre des champs de `Record`
+RECORD_COLUMNS: str = f"""
+COUNT(*),
+COALESCE(SUM(outcome = {VICTORY}), 0),
+COALESCE(SUM(outcome = {DRAW}), 0),
+COALESCE(SUM(outcome = {DEFEAT}), 0),
+COALESCE(SUM(touches_scored), 0),
+COALESCE(SUM(touches_received), 0)
+"""
+
+
+def _outcome(score: Score, opponent_score: Score) -> int:
+    """
+    Résultat d'un assaut, selon la même comparaison que la validation des matchs.
+
+    :param score: Score du tireur.
+    :param opponent_score: Score de l'adversaire.
+    :return: `VICTORY`, `DRAW` ou `DEFEAT`.
+    """
+    if score > opponent_score:
+        return VICTORY
+    if score < opponent_score:
+        return DEFEAT
+    return DRAW
+
+
+class History:
+    """
+    Classe représentant le moteur de requêtes sur l'historique des assauts des compétitions d'une base.
+
+    Les assauts validés entre deux tireurs licenciés des compétitions individuelles sont indexés par licence, avec le
+    rang des deux tireurs au début de la ronde. L'index est complété à chaque requête par les compétitions enregistrées
+    depuis, et une compétition remplacée dans la base est réindexée.
+
+    :param Database database: Base des compétitions.
+    """
+    #: Base des compétitions
+    _database: Database
+
+    def __init__(self, database: Database) -> None:
+        """
+        Initialise un nouveau moteur de requêtes, en créant l'index si nécessaire.
+        """
+        self._database = database
+        with database.connection as connection:
+            connection.executescript(SCHEMA)
+
+    @property
+    def database(self) -> Database:
+        return self._database
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(database={self._database!r})"
+
+    def refresh(self) -> int:
+        """
+        Indexe les compétitions de la base qui ne le sont pas encore.
+
+        :return: Nombre de compétitions indexées.
+        """
+        connection = self._database.connection
+        pending: list[tuple[int, str]] = connection.execute(
+            "SELECT id, season FROM tournaments WHERE id NOT IN (SELECT tournament_id FROM indexed_tournaments) "
+            "ORDER BY id").fetchall()
+        for tournament_id, season in pending:
+            self._index(tournament_id, season, self._database.load_tournament(tournament_id))
+        return len(pending)
+
+    def _index(self, tournament_id: int, season: str, tournament: Tournament) -> None:
+        """
+        Indexe les assauts d'une compétition.
+
+        :param tournament_id: Identifiant de la compétition.
+        :param season: Saison de la compétition.
+        :param tournament: Compétition chargée depuis la base.
+        """
+        rows: list[tuple] = list()
+        if tournament.kind == "Individuelle":
+            for played_round in tournament.rounds:
+                ranks: dict[int, int] = {id(standing.participant): standing.rank
+                                         for standing in tournament.standings(as_of_round=played_round.number - 1)}
+                for match in played_round.matches:
+                    fencer1: Fencer | None = match.participant1
+                    fencer2: Fencer | None = match.participant2
+                    if (not match.is_validated) or (fencer1 is None) or (fencer2 is None)\
+                            or (fencer1.licence is None) or (fencer2.licence is None):
+                        continue
+                    rank1: int | None = ranks.get(id(fencer1))
+                    rank2: int | None = ranks.get(id(fencer2))
+                    outcome: int = _outcome(match.score1, match.score2)
+                    rows.append((tournament_id, season, played_round.number, fencer1.licence, fencer2.licence,
+                                 rank1, rank2, match.score1.touches, match.score2.touches, outcome))
+                    rows.append((tournament_id, season, played_round.number, fencer2.licence, fencer1.licence,
+                                 rank2, rank1, match.score2.touches, match.score1.touches, -outcome))
+
+        with self._database.connection as connection:
+            connection.execute("DELETE FROM bouts WHERE tournament_id = ?", (tournament_id,))
+            connection.executemany("INSERT INTO bouts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            connection.execute("INSERT OR REPLACE INTO indexed_tournaments VALUES (?)", (tournament_id,))
+
+    def head_to_head(self, licence: int, opponent: int) -> Record:
+        """
+        Bilan des assauts d'un tireur contre un adversaire, toutes compétitions confondues.
+
+        :param licence: Licence du tireur.
+        :param opponent: Licence de l'adversaire.
+        :return: Bilan du tireur.
+        """
+        self.refresh()
+        return Record(*self._database.connection.execute(
+            f"SELECT {RECORD_COLUMNS} FROM bouts WHERE licence = ? AND opponent_licence = ?",
+            (licence, opponent)).fetchone())
+
+    def opponents(self, licence: int, *,
+                  season: str | None = None) -> dict[int, Record]:
+        """
+        Bilans d'un tireur contre chacun de ses adversaires.
+
+        :param licence: Licence du tireur.
+        :param season: Saison des compétitions, ou `None` pour toutes les saisons.
+        :return: Bilans, par licence d'adversaire.
+        """
+        self.refresh()
+        query: str = f"SELECT opponent_licence, {RECORD_COLUMNS} FROM bouts WHERE licence = ?"
+        parameters: tuple = (licence,)
+        if season is not None:
+            query += " AND season = ?"
+            parameters += (season,)
+        return {row[0]: Record(*row[1:])
+                for row in self._database.connection.execute(query + " GROUP BY opponent_licence", parameters)}
+
+    def win_rates_by_opponent_rank(self, licence: int, *,
+                                   season: str | None = None,
+                                   bucket_size: int = 8) -> dict[tuple[int, int], Record]:
+        """
+        Bilans d'un tireur selon le rang de ses adversaires au début de chaque ronde.
+
+        :param licence: Licence du tireur.
+        :param season: Saison des compétitions, ou `None` pour toutes les saisons.
+        :param bucket_size: Nombre de rangs par tranche.
+        :return: Bilans, par tranche de rangs ``(premier, dernier)``.
+        """
+        if bucket_size <= 0:
+            raise ValueError("Le paramètre `bucket_size` doit être strictement supérieur à `0`.")
+        self.refresh()
+        query: str = f"SELECT (opponent_rank - 1) / ?, {RECORD_COLUMNS} FROM bouts " \
+                     f"WHERE licence = ? AND opponent_rank IS NOT NULL"
+        parameters: tuple = (bucket_size, licence)
+        if season is not None:
+            query += " AND season = ?"
+            parameters += (season,)
+        return {(row[0] * bucket_size + 1, (row[0] + 1) * bucket_size): Record(*row[1:])
+                for row in self._database.connection.execute(query + " GROUP BY 1 ORDER BY 1", parameters)}
+
+    def season(self, licence: int, season: str) -> list[Bout]:
+        """
+        Historique complet des assauts d'un tireur sur une saison.
+
+        :param licence: Licence du tireur.
+        :param season: Saison des compétitions.
+        :return: Assauts du tireur, par compétition et ronde.
+        """
+        self.refresh()
+        return [Bout(*row) for row in self._database.connection.execute(
+            "SELECT tournament_id, season, round, opponent_licence, rank, opponent_rank, touches_scored, "
+            "touches_received, outcome FROM bouts WHERE licence = ? AND season = ? ORDER BY tournament_id, round",
+            (licence, season))]
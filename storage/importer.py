@@ -0,0 +1,327 @@
+import codecs
+import csv
+import re
+import unicodedata
+
+from collections.abc import Iterable, Iterator
+
+from datetime import date, datetime
+
+from itertools import islice
+
+from typing import NamedTuple, TextIO
+
+from competition.fencer import Fencer
+from competition.team import Team
+from competition.tournament import Tournament
+
+
+#: Colonnes reconnues, par intitulé normalisé : exports CSV et fédéraux
+COLUMNS: dict[str, str] = {"nom": "lastname",
+                           "lastname": "lastname",
+                           "prenom": "firstname",
+                           "firstname": "firstname",
+                           "sexe": "gender",
+                           "gender": "gender",
+                           "age": "age",
+                           "date de naissance": "birthdate",
+                           "date naissance": "birthdate",
+                           "naissance": "birthdate",
+                           "ne le": "birthdate",
+                           "birthdate": "birthdate",
+                           "club": "club",
+                           "nom club": "club",
+                           "licence": "licence",
+                           "no licence": "licence",
+                           "n licence": "licence",
+                           "numero licence": "licence",
+                           "numero de licence": "licence",
+                           "license": "licence",
+                           "equipe": "team",
+                           "team": "team"}
+
+#: Sexes reconnus, par valeur normalisée
+GENDERS: dict[str, str] = {"m": "Masculin",
+                           "h": "Masculin",
+                           "masculin": "Masculin",
+                           "homme": "Masculin",
+                           "f": "Féminin",
+                           "d": "Féminin",
+                           "feminin": "Féminin",
+                           "femme": "Féminin",
+                           "dame": "Féminin",
+                           "a": "Autre",
+                           "x": "Autre",
+                           "autre": "Autre"}
+
+#: Formats de date de naissance reconnus
+DATE_FORMATS: tuple[str, ...] = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y")
+
+#: Taille de l'échantillon lu pour détecter l'encodage et le séparateur
+SAMPLE_SIZE: int = 1 << 16
+
+
+class Registration(NamedTuple):
+    """
+    Inscription valide lue dans un fichier.
+
+    :param int line: Numéro de ligne dans le fichier.
+    :param Fencer fencer: Tireur inscrit.
+    :param str|None team: Nom de l'équipe du tireur, pour une compétition par équipe.
+    """
+    #: Numéro de ligne dans le fichier
+    line: int
+    #: Tireur inscrit
+    fencer: Fencer
+    #: Nom de l'équipe du tireur, pour une compétition par équipe
+    team: str | None
+
+
+class RowError(NamedTuple):
+    """
+    Erreur d'une ligne d'un fichier d'inscriptions.
+
+    :param int line: Numéro de ligne dans le fichier.
+    :param str message: Description de l'erreur.
+    """
+    #: Numéro de ligne dans le fichier
+    line: int
+    #: Description de l'erreur
+    message: str
+
+    def __str__(self) -> str:
+        return f"Ligne {self.line} : {self.message}"
+
+
+def normalize(text: str) -> str:
+    """
+    Normalise un intitulé ou une valeur : minuscules, sans accents ni ponctuation.
+
+    :param text: Texte à normaliser.
+    :return: Texte normalisé.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(character for character in text if not unicodedata.combining(character))
+    return " ".join(re.split(r"[^0-9a-z]+", text)).strip()
+
+
+def detect_encoding(path: str) -> str:
+    """
+    Détecte l'encodage d'un fichier d'inscriptions : UTF-8, sinon Windows-1252 pour les exports fédéraux.
+
+    :param path: Chemin du fichier.
+    :return: Nom de l'encodage.
+    """
+    with open(path, "rb") as file:
+        sample: bytes = file.read(SAMPLE_SIZE)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "cp1252"
+    return "utf-8-sig"
+
+
+def read_rows(file: TextIO) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Lit les lignes d'un fichier d'inscriptions ouvert, une à une, en détectant le séparateur.
+
+    :param file: Fichier texte ouvert en lecture, avec une ligne d'en-tête.
+    :return: Numéros de ligne et valeurs des colonnes reconnues.
+    """
+    # Séparateur
+    sample: str = file.read(SAMPLE_SIZE)
+    file.seek(0)
+    try:
+        dialect: type[csv.Dialect] = csv.Sniffer().sniff(sample.partition("\n")[0], delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+
+    # En-tête
+    reader = csv.reader(file, dialect)
+    header: list[str] | None = next(reader, None)
+    if header is None:
+        raise ValueError("Le fichier d'inscriptions est vide.")
+    fields: list[str | None] = [COLUMNS.get(normalize(title)) for title in header]
+    missing: set[str] = {"lastname", "firstname"}.difference(fields)
+    if missing:
+        raise ValueError("Le fichier d'inscriptions doit contenir les colonnes `Nom` et `Prénom`.")
+
+    # Lignes
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield reader.line_num, {field: value.strip() for field, value in zip(fields, values) if field is not None}
+
+
+def parse_rows(rows: Iterable[tuple[int, dict[str, str]]], tournament: Tournament, *,
+               reference: date | None = None) -> Iterator[Registration | RowError]:
+    """
+    Valide les lignes d'un fichier d'inscriptions, en signalant toutes les erreurs de chaque ligne.
+
+    :param rows: Numéros de ligne et valeurs des colonnes reconnues.
+    :param tournament: Compétition des inscriptions.
+    :param reference: Date de calcul des âges depuis les dates de naissance, aujourd'hui par défaut.
+    :return: Inscriptions valides et erreurs, dans l'ordre du fichier.
+    """
+    if reference is None:
+        reference = date.today()
+    default_gender: str | None = {"Hommes": "Masculin", "Dames": "Féminin"}.get(tournament.gender)
+    has_team: bool = tournament.kind == "Équipe"
+
+    for line, row in rows:
+        errors: list[str] = list()
+        lastname: str = row.get("lastname", "").upper()
+        firstname: str = row.get("firstname", "").title()
+        if not lastname:
+            errors.append("nom manquant")
+        if not firstname:
+            errors.append("prénom manquant")
+
+        # Sexe
+        gender: str | None = GENDERS.get(normalize(row.get("gender", "")), default_gender)
+        if gender is None:
+            errors.append(f"sexe invalide `{row.get('gender', '')}`" if row.get("gender") else "sexe manquant")
+
+        # Âge, éventuellement depuis la date de naissance
+        age: int | None = None
+        if row.get("age"):
+            if row["age"].isdecimal() and (int(row["age"]) > 0):
+                age = int(row["age"])
+            else:
+                errors.append(f"âge invalide `{row['age']}`")
+        elif row.get("birthdate"):
+            for date_format in DATE_FORMATS:
+                try:
+                    birthdate: date = datetime.strptime(row["birthdate"], date_format).date()
+                except ValueError:
+                    continue
+                age = reference.year - birthdate.year - ((reference.month, reference.day) <
+                                                         (birthdate.month, birthdate.day))
+                break
+            if (age is None) or (age <= 0):
+                errors.append(f"date de naissance invalide `{row['birthdate']}`")
+                age = None
+        else:
+            errors.append("âge manquant")
+
+        # Club et licence
+        club: str | None = row.get("club") or None
+        licence: int | None = None
+        if row.get("licence"):
+            if row["licence"].isdecimal() and (int(row["licence"]) > 0):
+                licence = int(row["licence"])
+            else:
+                errors.append(f"licence invalide `{row['licence']}`")
+        elif tournament.licences_are_needed:
+            errors.append("licence manquante")
+        if (club is None) and tournament.licences_are_needed:
+            errors.append("club manquant")
+
+        # Équipe
+        team: str | None = row.get("team") or None
+        if has_team and (team is None):
+            errors.append("équipe manquante")
+
+        if errors:
+            message: str = ", ".join(errors)
+            yield RowError(line, message[0].upper() + message[1:] + ".")
+        else:
+            yield Registration(line, Fencer(lastname, firstname, gender, age, club=club, licence=licence,
+                                            has_team=has_team), team)
+
+
+def check_duplicates(items: Iterable[Registration | RowError],
+                     tournament: Tournament) -> Iterator[Registration | RowError]:
+    """
+    Signale les tireurs déjà inscrits ou présents plusieurs fois, par nom complet ou par licence.
+
+    :param items: Inscriptions valides et erreurs.
+    :param tournament: Compétition des inscriptions.
+    :return: Inscriptions valides et erreurs, dans l'ordre du fichier.
+    """
+
+    def where(line: int) -> str:
+        return f"ligne {line}" if line else "compétition"
+
+    fencers: list[Fencer] = list()
+    for participant in tournament.registry:
+        fencers.extend(participant.fencers if isinstance(participant, Team) else (participant,))
+    names: dict[tuple[str, str], int] = {fencer.name: 0 for fencer in fencers}
+    licences: dict[int, int] = {fencer.licence: 0 for fencer in fencers if fencer.licence is not None}
+
+    for item in items:
+        if isinstance(item, RowError):
+            yield item
+            continue
+        fencer: Fencer = item.fencer
+        if fencer.name in names:
+            yield RowError(item.line, f"Tireur déjà inscrit ({where(names[fencer.name])}).")
+        elif fencer.licence in licences:
+            yield RowError(item.line, f"Licence déjà utilisée ({where(licences[fencer.licence])}).")
+        else:
+            names[fencer.name] = item.line
+            if fencer.licence is not None:
+                licences[fencer.licence] = item.line
+            yield item
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Regroupe les éléments d'un itérable par lots.
+
+    :param iterable: Éléments à regrouper.
+    :param size: Taille des lots.
+    :return: Lots d'éléments.
+    """
+    iterator: Iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def import_registrations(path: str, tournament: Tournament, *,
+                         encoding: str | None = None,
+                         reference: date | None = None,
+                         batch_size: int = 1024) -> tuple[int, list[RowError]]:
+    """
+    Importe les inscriptions d'un fichier CSV ou d'un export fédéral, ligne par ligne, sans le charger en mémoire.
+
+    Les lignes valides sont inscrites par lots, les lignes invalides ignorées et signalées toutes ensemble. Pour une
+    compétition par équipe, les équipes sont constituées à partir de la colonne `Équipe` et inscrites en fin de
+    fichier.
+
+    :param path: Chemin du fichier.
+    :param tournament: Compétition des inscriptions.
+    :param encoding: Encodage du fichier, détecté par défaut.
+    :param reference: Date de calcul des âges depuis les dates de naissance, aujourd'hui par défaut.
+    :param batch_size: Nombre d'inscriptions par lot.
+    :return: Nombre de participants inscrits et erreurs, par numéro de ligne.
+    """
+    if batch_size <= 0:
+        raise ValueError("Le paramètre `batch_size` doit être strictement supérieur à `0`.")
+    if encoding is None:
+        encoding = detect_encoding(path)
+
+    added: int = 0
+    errors: list[RowError] = list()
+    teams: dict[str, tuple[str, set[Fencer]]] = dict()
+    registered_teams: set[str] = {normalize(team.name) for team in tournament.registry if isinstance(team, Team)}
+    with open(path, "r", encoding=encoding, newline="") as file:
+        items: Iterator[Registration | RowError] = check_duplicates(
+            parse_rows(read_rows(file), tournament, reference=reference), tournament)
+        for batch in batched(items, batch_size):
+            fencers: list[Fencer] = list()
+            for item in batch:
+                if isinstance(item, RowError):
+                    errors.append(item)
+                elif item.team is None:
+                    fencers.append(item.fencer)
+                elif normalize(item.team) in registered_teams:
+                    errors.append(RowError(item.line, f"Équipe `{item.team}` déjà inscrite."))
+                else:
+                    teams.setdefault(normalize(item.team), (item.team, set()))[1].add(item.fencer)
+            added += tournament.add_participants(fencers)
+
+    # Équipes
+    for batch in batched((Team(name, fencers=fencers) for name, fencers in teams.values()), batch_size):
+        added += tournament.add_participants(batch)
+    return added, errors
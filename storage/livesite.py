@@ -0,0 +1,544 @@
+import os
+import zlib
+
+from bisect import bisect_left, insort
+
+from html import escape
+
+from threading import Thread
+
+from competition.events import Change, EventBus, Subscription
+from competition.snapshots import MatchSnapshot, ParticipantSnapshot, TournamentSnapshot
+from competition.standings import Standing
+
+from storage.tournamentfile import write_atomically
+
+
+#: Nombre de lignes du classement par page, par défaut
+DEFAULT_PAGE_SIZE: int = 50
+#: Intervalle de rechargement des pages par les navigateurs, en secondes, par défaut
+DEFAULT_REFRESH: int = 30
+
+#: Dossier des pages des tireurs/équipes
+PARTICIPANTS: str = "participants"
+
+
+def participant_name(participant: ParticipantSnapshot | None) -> str:
+    """
+    Nom affiché d'un instantané de tireur/équipe.
+
+    :param participant: Instantané du tireur/équipe, ou `None` pour une exemption.
+    :return: Nom affiché.
+    """
+    if participant is None:
+        return "Exempt.e"
+    if isinstance(participant.name, tuple):
+        return " ".join(participant.name)
+    return participant.name
+
+
+def score_text(score: tuple[int, str | None] | None) -> str:
+    """
+    Représentation d'un instantané de score.
+
+    :param score: Touches et statut, ou `None`.
+    :return: Statut éventuel suivi des touches, ou une chaîne vide.
+    """
+    if score is None:
+        return ""
+    touches, status = score
+    return f"{status or ''}{touches}"
+
+
+def standing_key(participant: ParticipantSnapshot) -> tuple:
+    """
+    Clé de tri d'un instantané de tireur/équipe dans le classement, dans l'ordre de `rank`.
+
+    :param participant: Instantané du tireur/équipe.
+    :return: Score opposé, nom et indice dans le registre.
+    """
+    return -participant.victories, -participant.indicator, -participant.touches_scored, participant.name, \
+        participant.index
+
+
+def standings_page(position: int, page_size: int) -> str:
+    """
+    Chemin relatif de la page du classement contenant une position.
+
+    :param position: Position dans le classement, à partir de 0.
+    :param page_size: Nombre de lignes par page.
+    :return: Chemin relatif de la page.
+    """
+    return f"standings-{position // page_size + 1:03d}.html"
+
+
+def round_page(number: int) -> str:
+    """
+    Chemin relatif de la page d'une ronde.
+
+    :param number: Numéro de la ronde.
+    :return: Chemin relatif de la page.
+    """
+    return f"round-{number:03d}.html"
+
+
+def participant_page(index: int) -> str:
+    """
+    Chemin relatif de la page d'un.e tireur/équipe.
+
+    :param index: Indice du tireur/équipe dans le registre.
+    :return: Chemin relatif de la page.
+    """
+    return f"{PARTICIPANTS}/{index:05d}.html"
+
+
+class LiveSite:
+    """
+    Classe représentant le site statique des résultats en direct d'une compétition, servi par un serveur web local.
+
+    Le site suit le bus d'événements de la compétition : il tient à jour une copie du registre, des rondes et du
+    classement à partir des changements reçus, et retient de quels tireurs/équipes dépend chaque page. Après chaque
+    lot, seules les pages touchées sont régénérées : les pages des tireurs/équipes concerné.e.s, les rondes de leurs
+    matchs et les pages du classement entre leurs anciennes et nouvelles positions. Seules celles dont le contenu a
+    changé sont réécrites, chacune remplacée atomiquement pour ne jamais servir de page incomplète.
+
+    Les pages sont l'accueil, le classement découpé en pages de taille fixe, une page par ronde et une page par
+    tireur/équipe.
+
+    :param EventBus bus: Bus d'événements de la compétition.
+    :param str directory: Dossier du site.
+    :param int page_size: Nombre de lignes du classement par page.
+    :param int refresh: Intervalle de rechargement des pages par les navigateurs, en secondes, ou `0`.
+    """
+    #: Bus d'événements de la compétition
+    _bus: EventBus
+    #: Dossier du site
+    _directory: str
+    #: Nombre de lignes du classement par page
+    _page_size: int
+    #: Intervalle de rechargement des pages par les navigateurs, en secondes
+    _refresh: int
+    #: Abonnement au bus d'événements
+    _subscription: Subscription | None
+    #: Nom de la compétition
+    _name: str
+    #: Tireurs/Équipes, par indice dans le registre
+    _registry: dict[int, ParticipantSnapshot]
+    #: Matchs de chaque ronde
+    _rounds: list[list[MatchSnapshot]]
+    #: Clés de tri des tireurs/équipes classé.e.s, triées
+    _keys: list[tuple]
+    #: Clés de tri, par indice dans le registre
+    _keys_by_index: dict[int, tuple]
+    #: Matchs de chaque tireur/équipe : numéro de ronde et table, par indice dans le registre
+    _bouts: dict[int, list[tuple[int, int]]]
+    #: Empreintes des pages écrites, par chemin relatif
+    _digests: dict[str, int]
+    #: Fil de génération
+    _thread: Thread | None
+    #: Dernière erreur de génération
+    _error: Exception | None
+
+    def __init__(self, bus: EventBus, directory: str, *,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 refresh: int = DEFAULT_REFRESH) -> None:
+        """
+        Initialise un nouveau site.
+        """
+        self._bus = bus
+        self._directory = directory
+        if page_size <= 0:
+            raise ValueError("Le paramètre `page_size` doit être strictement supérieur à `0`.")
+        self._page_size = page_size
+        if refresh < 0:
+            raise ValueError("Le paramètre `refresh` doit être supérieur ou égal à `0`.")
+        self._refresh = refresh
+        self._subscription = None
+        self._name = ""
+        self._registry = dict()
+        self._rounds = list()
+        self._keys = list()
+        self._keys_by_index = dict()
+        self._bouts = dict()
+        self._digests = dict()
+        self._thread = None
+        self._error = None
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    @property
+    def error(self) -> Exception | None:
+        return self._error
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Activité du fil de génération.
+        """
+        return (self._thread is not None) and self._thread.is_alive()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(directory={self._directory!r}, page_size={self._page_size}, "\
+               f"pages={len(self._digests)})"
+
+    def open(self) -> None:
+        """
+        S'abonne au bus d'événements, le premier lot générant le site complet.
+        """
+        if self._subscription is None:
+            self._subscription = self._bus.subscribe()
+
+    def close(self) -> None:
+        """
+        Résilie l'abonnement au bus d'événements, après quoi `update` écrit les derniers changements reçus.
+        """
+        if self._subscription is not None:
+            self._bus.unsubscribe(self._subscription)
+
+    def update(self) -> list[str]:
+        """
+        Régénère les pages touchées par les changements reçus, dans le fil appelant.
+
+        :return: Chemins des fichiers réécrits ou supprimés.
+        """
+        self.open()
+        return self._apply(self._subscription.poll())
+
+    def start(self) -> None:
+        """
+        Démarre la génération du site dans un fil dédié, au fil des lots du bus d'événements.
+        """
+        if self.is_running:
+            return
+        self._subscription = None
+        self.open()
+        self._thread = Thread(target=self._run, name=f"LiveSite({os.path.basename(self._directory)})", daemon=True)
+        self._thread.start()
+
+    def stop(self, *,
+             timeout: float | None = None) -> None:
+        """
+        Arrête la génération du site, après avoir écrit les derniers changements reçus.
+
+        :param timeout: Durée maximale d'attente du fil de génération, en secondes.
+        """
+        self.close()
+        if self.is_running:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """
+        Boucle du fil de génération.
+        """
+        subscription: Subscription = self._subscription
+        while changes := subscription.get():
+            try:
+                self._apply(changes)
+                self._error = None
+            except OSError as error:
+                # La page sera réécrite à la prochaine génération complète
+                self._error = error
+
+    # Suivi des changements
+
+    def _apply(self, changes: list[Change]) -> list[str]:
+        """
+        Applique un lot de changements, puis régénère les pages touchées.
+
+        :param changes: Changements du lot.
+        :return: Chemins des fichiers réécrits ou supprimés.
+        """
+        pages: set[str] = set()
+        rows: int = len(self._keys)
+        for change in changes:
+            if change.kind == "reset":
+                pages.update(self._reset(change.value))
+                rows = len(self._keys)
+            elif change.kind.startswith("participant_"):
+                pages.update(self._set_participant(change.key, change.value))
+            elif change.kind == "round_paired":
+                pages.update(self._set_round(change.key, change.value.matches))
+            elif change.kind.startswith("match_"):
+                pages.update(self._set_match(*change.key, change.value))
+            elif change.kind == "standing_changed":
+                pages.update(self._set_standing(change.key, change.value))
+
+        # Intervalles des pages du classement, affichés sur l'accueil
+        if len(self._keys) != rows:
+            pages.add("index.html")
+        return self._write(pages)
+
+    def _reset(self, snapshot: TournamentSnapshot) -> set[str]:
+        """
+        Reconstruit l'état du site à partir d'un instantané complet.
+
+        :param snapshot: Instantané de la compétition.
+        :return: Toutes les pages du site.
+        """
+        self._name = snapshot.name
+        self._registry = {participant.index: participant for participant in snapshot.registry}
+        self._rounds = list()
+        self._bouts = dict()
+        for played_round in snapshot.rounds:
+            self._set_round(played_round.number, played_round.matches)
+        self._keys_by_index = {participant.index: standing_key(participant) for participant in snapshot.participants}
+        self._keys = sorted(self._keys_by_index.values())
+        pages: set[str] = {"index.html"}
+        pages.update(standings_page(position, self._page_size) for position in range(0, len(self._keys),
+                                                                                      self._page_size))
+        pages.update(round_page(number) for number in range(1, len(self._rounds) + 1))
+        pages.update(participant_page(index) for index in self._registry)
+        return pages
+
+    def _set_participant(self, index: int, participant: ParticipantSnapshot) -> set[str]:
+        """
+        Met à jour un.e tireur/équipe.
+
+        :return: Pages touchées.
+        """
+        old: ParticipantSnapshot | None = self._registry.get(index)
+        self._registry[index] = participant
+        pages: set[str] = {participant_page(index)}
+
+        # Renommage : pages qui citent le tireur/équipe
+        if (old is not None) and ((old.name, old.club) != (participant.name, participant.club)):
+            for number, table in self._bouts.get(index, ()):
+                pages.add(round_page(number))
+                match: MatchSnapshot = self._rounds[number - 1][table - 1]
+                for opponent in (match.participant1, match.participant2):
+                    if opponent is not None:
+                        pages.add(participant_page(opponent))
+            if index in self._keys_by_index:
+                pages.add(standings_page(bisect_left(self._keys, self._keys_by_index[index]), self._page_size))
+        return pages
+
+    def _set_round(self, number: int, matches) -> set[str]:
+        """
+        Ajoute une ronde appariée.
+
+        :return: Pages touchées.
+        """
+        pages: set[str] = {"index.html", round_page(number)}
+        self._rounds.append(list(matches))
+        for table, match in enumerate(self._rounds[-1], start=1):
+            for index in (match.participant1, match.participant2):
+                if index is not None:
+                    self._bouts.setdefault(index, list()).append((number, table))
+                    pages.add(participant_page(index))
+        return pages
+
+    def _set_match(self, number: int, table: int, match: MatchSnapshot) -> set[str]:
+        """
+        Met à jour un match.
+
+        :return: Pages touchées.
+        """
+        self._rounds[number - 1][table - 1] = match
+        pages: set[str] = {round_page(number)}
+        pages.update(participant_page(index) for index in (match.participant1, match.participant2)
+                     if index is not None)
+        return pages
+
+    def _set_standing(self, index: int, standing: Standing | None) -> set[str]:
+        """
+        Replace un.e tireur/équipe dans le classement.
+
+        :return: Pages du classement entre son ancienne et sa nouvelle position, dont les lignes sont décalées.
+        """
+        positions: list[int] = list()
+        key: tuple | None = self._keys_by_index.pop(index, None)
+        if key is not None:
+            position: int = bisect_left(self._keys, key)
+            del self._keys[position]
+            positions.append(position)
+        if standing is not None:
+            key = standing_key(standing.participant)
+            insort(self._keys, key)
+            self._keys_by_index[index] = key
+            positions.append(bisect_left(self._keys, key))
+        if not positions:
+            return set()
+
+        # Une ligne ajoutée ou supprimée décale tout le reste du classement
+        end: int = max(positions) if len(positions) == 2 else max(len(self._keys) - 1, positions[0])
+        return {standings_page(position, self._page_size)
+                for position in range(min(positions) - min(positions) % self._page_size, end + 1, self._page_size)}
+
+    def _standings_pages(self) -> int:
+        """
+        Nombre de pages du classement.
+        """
+        return max(1, -(-len(self._keys) // self._page_size))
+
+    # Écriture des pages
+
+    def _write(self, pages: set[str]) -> list[str]:
+        """
+        Régénère des pages et réécrit celles dont le contenu a changé, puis supprime les pages disparues.
+
+        :param pages: Chemins relatifs des pages touchées.
+        :return: Chemins des fichiers réécrits ou supprimés.
+        """
+        written: list[str] = list()
+        for page in sorted(pages):
+            content: bytes | None = self._render(page)
+            path: str = os.path.join(self._directory, *page.split("/"))
+
+            # Page disparue : ronde annulée, fin du classement
+            if content is None:
+                if page in self._digests:
+                    del self._digests[page]
+                    if os.path.exists(path):
+                        os.remove(path)
+                        written.append(path)
+                continue
+
+            digest: int = zlib.crc32(content)
+            if self._digests.get(page) == digest:
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomically(path, content)
+            self._digests[page] = digest
+            written.append(path)
+
+        # Pages disparues après une reconstruction complète
+        if "index.html" in pages:
+            for page in [page for page in self._digests if self._render_is_stale(page)]:
+                written.extend(self._write({page}))
+        return written
+
+    def _render_is_stale(self, page: str) -> bool:
+        """
+        Disparition d'une page écrite : ronde annulée, page du classement au-delà de la dernière ou inscription
+        annulée.
+        """
+        if page.startswith("round-"):
+            return int(page[6:9]) > len(self._rounds)
+        if page.startswith("standings-"):
+            return int(page[10:13]) > self._standings_pages()
+        if page.startswith(PARTICIPANTS):
+            return int(page[len(PARTICIPANTS) + 1:-5]) not in self._registry
+        return False
+
+    def _render(self, page: str) -> bytes | None:
+        """
+        Génère le contenu d'une page.
+
+        :param page: Chemin relatif de la page.
+        :return: Contenu de la page, ou `None` si elle n'existe plus.
+        """
+        if page == "index.html":
+            return self._render_index()
+        if page.startswith("standings-"):
+            number: int = int(page[10:13])
+            return None if number > self._standings_pages() else self._render_standings(number)
+        if page.startswith("round-"):
+            number: int = int(page[6:9])
+            return None if number > len(self._rounds) else self._render_round(number)
+        index: int = int(page[len(PARTICIPANTS) + 1:-5])
+        return self._render_participant(index) if index in self._registry else None
+
+    def _document(self, title: str, body: str, root: str = "") -> bytes:
+        """
+        Assemble une page HTML.
+
+        :param title: Titre de la page.
+        :param body: Corps de la page, déjà échappé.
+        :param root: Préfixe des liens vers la racine du site.
+        :return: Contenu de la page.
+        """
+        refresh: str = f'<meta http-equiv="refresh" content="{self._refresh}">\n' if self._refresh else ""
+        return (f'<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="utf-8">\n'
+                f'<meta name="viewport" content="width=device-width, initial-scale=1">\n{refresh}'
+                f'<title>{escape(title)}</title>\n</head>\n<body>\n'
+                f'<nav><a href="{root}index.html">{escape(self._name)}</a> · '
+                f'<a href="{root}{standings_page(0, self._page_size)}">Classement</a></nav>\n'
+                f'<h1>{escape(title)}</h1>\n{body}</body>\n</html>\n').encode("utf-8")
+
+    def _link(self, index: int | None, root: str = "") -> str:
+        """
+        Lien vers la page d'un.e tireur/équipe.
+        """
+        if index is None:
+            return escape(participant_name(None))
+        return f'<a href="{root}{participant_page(index)}">{escape(participant_name(self._registry[index]))}</a>'
+
+    def _render_index(self) -> bytes:
+        """
+        Génère la page d'accueil : pages du classement et rondes.
+        """
+        body: list[str] = ["<h2>Classement</h2>\n<ul>\n"]
+        for number in range(1, self._standings_pages() + 1):
+            first: int = (number - 1) * self._page_size + 1
+            last: int = max(first, min(number * self._page_size, len(self._keys)))
+            body.append(f'<li><a href="{standings_page(first - 1, self._page_size)}">{first} – {last}</a></li>\n')
+        body.append("</ul>\n<h2>Rondes</h2>\n<ul>\n")
+        for number in range(len(self._rounds), 0, -1):
+            body.append(f'<li><a href="{round_page(number)}">Ronde {number}</a></li>\n')
+        body.append("</ul>\n")
+        return self._document(self._name, "".join(body))
+
+    def _render_standings(self, number: int) -> bytes:
+        """
+        Génère une page du classement.
+        """
+        body: list[str] = ["<table>\n<thead><tr><th>Rang</th><th>Nom</th><th>Club</th><th>Victoires</th>"
+                           "<th>Indice</th><th>Touches portées</th><th>Touches reçues</th></tr></thead>\n<tbody>\n"]
+        for key in self._keys[(number - 1) * self._page_size:number * self._page_size]:
+            participant: ParticipantSnapshot = self._registry[key[-1]]
+            body.append(f"<tr><td>{bisect_left(self._keys, key[:3]) + 1}</td><td>{self._link(participant.index)}</td>"
+                        f"<td>{escape(participant.club or '')}</td><td>{participant.victories}</td>"
+                        f"<td>{participant.indicator}</td><td>{participant.touches_scored}</td>"
+                        f"<td>{participant.touches_received}</td></tr>\n")
+        body.append("</tbody>\n</table>\n<p>")
+        if number > 1:
+            body.append(f'<a href="{standings_page((number - 2) * self._page_size, self._page_size)}">Précédent</a> ')
+        if number < self._standings_pages():
+            body.append(f'<a href="{standings_page(number * self._page_size, self._page_size)}">Suivant</a>')
+        body.append("</p>\n")
+        return self._document(f"Classement — page {number}", "".join(body))
+
+    def _render_round(self, number: int) -> bytes:
+        """
+        Génère la page d'une ronde : appariements, puis résultats une fois validés.
+        """
+        body: list[str] = ["<table>\n<thead><tr><th>Table</th><th>Tireur/Équipe 1</th><th>Score</th>"
+                           "<th>Tireur/Équipe 2</th></tr></thead>\n<tbody>\n"]
+        for table, match in enumerate(self._rounds[number - 1], start=1):
+            score: str = f"{score_text(match.score1)} – {score_text(match.score2)}" if match.is_validated else ""
+            body.append(f"<tr><td>{table}</td><td>{self._link(match.participant1)}</td><td>{escape(score)}</td>"
+                        f"<td>{self._link(match.participant2)}</td></tr>\n")
+        body.append("</tbody>\n</table>\n")
+        return self._document(f"Ronde {number}", "".join(body))
+
+    def _render_participant(self, index: int) -> bytes:
+        """
+        Génère la page d'un.e tireur/équipe : score et matchs. Le rang, qui change avec ceux des autres, n'est affiché
+        que sur le classement.
+        """
+        participant: ParticipantSnapshot = self._registry[index]
+        body: list[str] = ["<p>"]
+        if participant.club:
+            body.append(f"{escape(participant.club)} · ")
+        if not participant.is_active:
+            body.append("Retiré.e · ")
+        body.append(f"{participant.victories} victoires, indice {participant.indicator}, "
+                    f"{participant.touches_scored} touches portées, {participant.touches_received} touches reçues"
+                    f"</p>\n<table>\n<thead><tr><th>Ronde</th><th>Adversaire</th><th>Score</th></tr></thead>\n"
+                    f"<tbody>\n")
+        for number, table in self._bouts.get(index, ()):
+            match: MatchSnapshot = self._rounds[number - 1][table - 1]
+            first: bool = match.participant1 == index
+            opponent: int | None = match.participant2 if first else match.participant1
+            scores = (match.score1, match.score2) if first else (match.score2, match.score1)
+            score: str = f"{score_text(scores[0])} – {score_text(scores[1])}" if match.is_validated else ""
+            body.append(f'<tr><td><a href="../{round_page(number)}">{number}</a></td>'
+                        f"<td>{self._link(opponent, '../')}</td><td>{escape(score)}</td></tr>\n")
+        body.append("</tbody>\n</table>\n")
+        return self._document(participant_name(participant), "".join(body), "../")
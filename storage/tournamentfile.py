@@ -0,0 +1,953 @@
+import os
+import struct
+import sys
+
+from array import array
+
+from collections.abc import Iterable, Iterator, MutableSequence, Sequence
+
+from contextlib import contextmanager
+
+from io import BytesIO
+
+from mmap import mmap, ACCESS_READ
+
+from tempfile import NamedTemporaryFile
+
+from typing import BinaryIO, IO, NamedTuple
+
+from assault.match import Match
+from assault.round import Round
+from assault.score import Score
+
+from competition.fencer import Fencer
+from competition.snapshots import MatchSnapshot, ParticipantSnapshot, RoundSnapshot, TournamentSnapshot, score_snapshot
+from competition.standings import Checkpoint
+from competition.team import Team
+from competition.tournament import Tournament
+
+
+#: Signature des fichiers de compétition
+MAGIC: bytes = b"LFTN"
+#: Version du format des fichiers de compétition
+VERSION: int = 1
+#: Extension des fichiers de compétition
+EXTENSION: str = ".lft"
+
+#: Armes, par code
+WEAPONS: tuple[str, ...] = ("Fleuret", "Épée", "Sabre", "Laser", "Multi")
+#: Sexes des compétitions, par code
+TOURNAMENT_GENDERS: tuple[str, ...] = ("Hommes", "Dames", "Mixte")
+#: Types de compétition, par code
+KINDS: tuple[str, ...] = ("Individuelle", "Équipe")
+#: Sexes des tireurs, par code
+FENCER_GENDERS: tuple[str, ...] = ("Masculin", "Féminin", "Autre")
+#: Statuts des scores, par code
+STATUSES: tuple[str | None, ...] = (None, "V", "D", "N")
+
+#: Code d'un score absent
+NO_SCORE: int = 0xFF
+#: Code d'un participant absent
+NO_PARTICIPANT: int = -1
+#: Code d'une image clé
+KEYFRAME: int = 0xFFFFFFFF
+
+#: Drapeau de participation
+ACTIVE: int = 0b01
+#: Drapeau d'exemption
+EXEMPTED: int = 0b10
+
+#: Structure de l'en-tête : signature, version, arme, sexe, type, options, score maximum, nombres de participants,
+#: de tireurs, de rondes et de matchs, position et taille de l'index, longueurs du nom et de la catégorie
+HEADER: struct.Struct = struct.Struct("<4sHBBBBHIIIIQHHH")
+#: Structure d'une entrée de l'index : étiquette, numéro, position et longueur du bloc
+INDEX_ENTRY: struct.Struct = struct.Struct("<4sIQQ")
+#: Structure d'un compteur
+COUNT: struct.Struct = struct.Struct("<I")
+
+
+class Header(NamedTuple):
+    """
+    En-tête d'un fichier de compétition, lisible sans analyser le corps du fichier.
+
+    :param int version: Version du format.
+    :param str name: Nom de la compétition.
+    :param str weapon: Arme de la compétition.
+    :param str gender: Sexe de la compétition.
+    :param str category: Catégorie de la compétition.
+    :param str kind: Type de compétition : `Individuelle` ou `Équipe`.
+    :param int maximum_score: Score maximum des matchs.
+    :param bool licences_are_needed: Exigence des licences des tireurs.
+    :param bool draws_are_allowed: Autorisation des matchs nuls.
+    :param int participants: Nombre de tireurs/équipes du registre.
+    :param int fencers: Nombre de tireurs, équipiers compris.
+    :param int rounds: Nombre de rondes.
+    :param int matches: Nombre de matchs.
+    :param int index_offset: Position de l'index.
+    :param int index_count: Nombre de blocs de l'index.
+    """
+    #: Version du format
+    version: int
+    #: Nom de la compétition
+    name: str
+    #: Arme de la compétition
+    weapon: str
+    #: Sexe de la compétition
+    gender: str
+    #: Catégorie de la compétition
+    category: str
+    #: Type de compétition : `Individuelle` ou `Équipe`
+    kind: str
+    #: Score maximum des matchs
+    maximum_score: int
+    #: Exigence des licences des tireurs
+    licences_are_needed: bool
+    #: Autorisation des matchs nuls
+    draws_are_allowed: bool
+    #: Nombre de tireurs/équipes du registre
+    participants: int
+    #: Nombre de tireurs, équipiers compris
+    fencers: int
+    #: Nombre de rondes
+    rounds: int
+    #: Nombre de matchs
+    matches: int
+    #: Position de l'index
+    index_offset: int
+    #: Nombre de blocs de l'index
+    index_count: int
+
+
+class Block(NamedTuple):
+    """
+    Entrée de l'index d'un fichier de compétition.
+
+    :param bytes tag: Étiquette du bloc.
+    :param int number: Numéro du bloc, pour les blocs par ronde.
+    :param int offset: Position du bloc.
+    :param int length: Longueur du bloc.
+    """
+    #: Étiquette du bloc
+    tag: bytes
+    #: Numéro du bloc, pour les blocs par ronde
+    number: int
+    #: Position du bloc
+    offset: int
+    #: Longueur du bloc
+    length: int
+
+
+class Capture(NamedTuple):
+    """
+    Contenu d'une compétition à enregistrer, capturé par le fil qui la possède, encodable depuis un autre fil.
+
+    Les scores et les rondes sont ceux d'un instantané immuable, les tireurs/équipes ceux du registre, leur identité
+    n'étant pas journalisée.
+
+    :param TournamentSnapshot snapshot: Instantané de la compétition.
+    :param str weapon: Arme de la compétition.
+    :param str gender: Sexe de la compétition.
+    :param str category: Catégorie de la compétition.
+    :param bool licences_are_needed: Exigence des licences des tireurs.
+    :param tuple[Fencer,...]|tuple[Team,...] registry: Tireurs/Équipes du registre.
+    :param tuple[tuple[Fencer,...],...] members: Tireurs de chaque équipe, par nom complet.
+    :param tuple[Checkpoint,...] checkpoints: Points de contrôle des rondes de l'instantané.
+    """
+    #: Instantané de la compétition
+    snapshot: TournamentSnapshot
+    #: Arme de la compétition
+    weapon: str
+    #: Sexe de la compétition
+    gender: str
+    #: Catégorie de la compétition
+    category: str
+    #: Exigence des licences des tireurs
+    licences_are_needed: bool
+    #: Tireurs/Équipes du registre
+    registry: tuple[Fencer, ...] | tuple[Team, ...]
+    #: Tireurs de chaque équipe, par nom complet
+    members: tuple[tuple[Fencer, ...], ...]
+    #: Points de contrôle des rondes de l'instantané
+    checkpoints: tuple[Checkpoint, ...]
+
+
+def _pack(typecode: str, values) -> bytes:
+    """
+    Encode une colonne en petit-boutiste.
+
+    :param typecode: Type des valeurs, au sens du module `array`.
+    :param values: Valeurs de la colonne.
+    :return: Colonne encodée.
+    """
+    column: array = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack(typecode: str, buffer: memoryview, offset: int, count: int) -> tuple[array, int]:
+    """
+    Décode une colonne petit-boutiste.
+
+    :param typecode: Type des valeurs, au sens du module `array`.
+    :param buffer: Contenu du fichier.
+    :param offset: Position de la colonne.
+    :param count: Nombre de valeurs de la colonne.
+    :return: Colonne décodée et position suivante.
+    """
+    column: array = array(typecode)
+    end: int = offset + count * column.itemsize
+    column.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, end
+
+
+def _count(buffer: memoryview, offset: int) -> tuple[int, int]:
+    """
+    Décode un compteur.
+
+    :param buffer: Contenu du fichier.
+    :param offset: Position du compteur.
+    :return: Compteur et position suivante.
+    """
+    return COUNT.unpack_from(buffer, offset)[0], offset + COUNT.size
+
+
+class _Strings:
+    """
+    Table des chaînes d'un fichier de compétition, en cours d'écriture.
+    """
+    #: Indices des chaînes
+    _indexes: dict[str, int]
+
+    def __init__(self) -> None:
+        """
+        Initialise une nouvelle table des chaînes.
+        """
+        self._indexes = dict()
+
+    def index(self, string: str | None) -> int:
+        """
+        Cherche ou ajoute une chaîne à la table.
+
+        :param string: Chaîne, ou `None`.
+        :return: Indice de la chaîne, ou ``-1`` pour `None`.
+        """
+        if string is None:
+            return -1
+        return self._indexes.setdefault(string, len(self._indexes))
+
+    def encode(self) -> bytes:
+        """
+        Encode la table des chaînes.
+
+        :return: Bloc de la table des chaînes.
+        """
+        encoded: list[bytes] = [string.encode("utf-8") for string in self._indexes]
+        offsets: list[int] = [0]
+        for string in encoded:
+            offsets.append(offsets[-1] + len(string))
+        return COUNT.pack(len(encoded)) + _pack("I", offsets) + b"".join(encoded)
+
+
+def _encode_scores(registry: Sequence[ParticipantSnapshot], subjects: list[int]) -> bytes:
+    """
+    Encode le bloc des participants et de leurs scores.
+
+    :param registry: Instantanés des tireurs/équipes du registre.
+    :param subjects: Indices des tireurs/équipes dans leur bloc.
+    :return: Bloc des participants.
+    """
+    flags: bytearray = bytearray(len(registry))
+    opponents: list[int] = list()
+    offsets: list[int] = [0]
+    for i, participant in enumerate(registry):
+        if participant.is_active:
+            flags[i] |= ACTIVE
+        if participant.has_been_exempted:
+            flags[i] |= EXEMPTED
+        opponents.extend(participant.opponents)
+        offsets.append(len(opponents))
+    return b"".join((COUNT.pack(len(registry)),
+                     _pack("I", subjects),
+                     bytes(flags),
+                     _pack("d", (participant.victories for participant in registry)),
+                     _pack("q", (participant.touches_scored for participant in registry)),
+                     _pack("q", (participant.touches_received for participant in registry)),
+                     _pack("I", offsets),
+                     _pack("I", opponents)))
+
+
+def encode_checkpoint(checkpoint: Checkpoint) -> bytes:
+    """
+    Encode le bloc d'un point de contrôle.
+
+    :param checkpoint: Point de contrôle.
+    :return: Bloc du point de contrôle.
+    """
+    if checkpoint.indexes is None:
+        head: bytes = COUNT.pack(checkpoint.size) + COUNT.pack(KEYFRAME)
+    else:
+        head: bytes = COUNT.pack(checkpoint.size) + COUNT.pack(len(checkpoint.indexes)) + _pack("I", checkpoint.indexes)
+    return b"".join((head,
+                     checkpoint.flags,
+                     _pack("d", checkpoint.victories),
+                     _pack("q", checkpoint.touches_scored),
+                     _pack("q", checkpoint.touches_received)))
+
+
+def _encode_columns(matches: Sequence[MatchSnapshot]) -> bytes:
+    """
+    Encode le bloc des matchs d'une ronde, depuis leurs instantanés.
+
+    :param matches: Instantanés des matchs de la ronde.
+    :return: Bloc de la ronde.
+    """
+
+    def participant_code(participant: int | None) -> int:
+        return NO_PARTICIPANT if participant is None else participant
+
+    def status_code(score: tuple[int, str | None] | None) -> int:
+        return NO_SCORE if score is None else STATUSES.index(score[1])
+
+    return b"".join((COUNT.pack(len(matches)),
+                     _pack("i", (participant_code(match.participant1) for match in matches)),
+                     _pack("i", (participant_code(match.participant2) for match in matches)),
+                     _pack("H", (0 if match.score1 is None else match.score1[0] for match in matches)),
+                     bytes(status_code(match.score1) for match in matches),
+                     _pack("H", (0 if match.score2 is None else match.score2[0] for match in matches)),
+                     bytes(status_code(match.score2) for match in matches),
+                     bytes(match.is_validated for match in matches)))
+
+
+def _encode_round(matches: list[Match], indexes: dict[Fencer, int] | dict[Team, int]) -> bytes:
+    """
+    Encode le bloc des matchs d'une ronde.
+
+    :param matches: Matchs de la ronde.
+    :param indexes: Indices des tireurs/équipes dans le registre.
+    :return: Bloc de la ronde.
+    """
+
+    def participant_code(participant: Fencer | Team | None) -> int | None:
+        return None if participant is None else indexes[participant]
+
+    return _encode_columns([MatchSnapshot(participant_code(match.participant1), participant_code(match.participant2),
+                                          score_snapshot(match.score1), score_snapshot(match.score2),
+                                          match.is_validated, match.version)
+                            for match in matches])
+
+
+def _encode_round_snapshot(round_snapshot: RoundSnapshot) -> bytes:
+    """
+    Encode le bloc d'une ronde depuis son instantané, recopié tel quel si elle n'a pas été décodée depuis le
+    chargement de la compétition.
+
+    :param round_snapshot: Instantané de la ronde.
+    :return: Bloc de la ronde.
+    """
+    if isinstance(round_snapshot.matches, EncodedMatches):
+        return round_snapshot.matches.block
+    return _encode_columns(round_snapshot.matches)
+
+
+class RoundHistory(MutableSequence):
+    """
+    Classe représentant les rondes d'une compétition chargée depuis un fichier, décodées à la demande.
+
+    Les blocs des rondes sont conservés encodés, quelques octets par match, et chaque ronde n'est décodée en matchs
+    qu'au premier accès. Les rondes décodées sont conservées et remplacent leur bloc.
+
+    :param list[bytes] blocks: Blocs encodés des rondes, par numéro de ronde.
+    :param list[Fencer]|list[Team] registry: Registre des tireurs/équipes.
+    :param int maximum_score: Score maximum des matchs.
+    :param bool draws_are_allowed: Autorisation des matchs nuls.
+    """
+    #: Blocs encodés des rondes non décodées
+    _blocks: list[bytes | None]
+    #: Rondes décodées
+    _rounds: list[Round | None]
+    #: Registre des tireurs/équipes
+    _registry: list[Fencer] | list[Team]
+    #: Score maximum des matchs
+    _maximum_score: int
+    #: Autorisation des matchs nuls
+    _draws_are_allowed: bool
+
+    def __init__(self, blocks: Iterable[bytes], registry: list[Fencer] | list[Team],
+                 maximum_score: int, draws_are_allowed: bool) -> None:
+        """
+        Initialise de nouvelles rondes décodées à la demande.
+        """
+        self._blocks = list(blocks)
+        self._rounds = [None] * len(self._blocks)
+        self._registry = registry
+        self._maximum_score = maximum_score
+        self._draws_are_allowed = draws_are_allowed
+
+    def __len__(self) -> int:
+        return len(self._rounds)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(rounds={len(self._rounds)}, "\
+               f"decoded={sum(played_round is not None for played_round in self._rounds)})"
+
+    def __getitem__(self, index: int | slice) -> Round | list[Round]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._rounds)))]
+        played_round: Round | None = self._rounds[index]
+        if played_round is None:
+            i: int = index % len(self._rounds)
+            block: bytes = self._blocks[i]
+            played_round = decode_round(memoryview(block), Block(b"ROND", i + 1, 0, len(block)), self._registry,
+                                        self._maximum_score, self._draws_are_allowed)
+            self._rounds[i] = played_round
+            self._blocks[i] = None
+        return played_round
+
+    def __setitem__(self, index: int | slice, value: Round | Iterable[Round]) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            self._blocks[index] = [None] * len(value)
+        else:
+            self._blocks[index] = None
+        self._rounds[index] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self._blocks[index]
+        del self._rounds[index]
+
+    def insert(self, index: int, value: Round) -> None:
+        self._blocks.insert(index, None)
+        self._rounds.insert(index, value)
+
+    def encoded(self, index: int) -> bytes | None:
+        """
+        Bloc encodé d'une ronde, si elle n'a pas encore été décodée.
+
+        :param index: Indice de la ronde.
+        :return: Bloc de la ronde, ou `None` si elle a été décodée.
+        """
+        return self._blocks[index]
+
+    def snapshot(self, index: int) -> RoundSnapshot | None:
+        """
+        Instantané d'une ronde dont les matchs sont lus dans son bloc au premier accès, sans la décoder en matchs.
+
+        :param index: Indice de la ronde.
+        :return: Instantané de la ronde, ou `None` si elle a été décodée.
+        """
+        block: bytes | None = self._blocks[index]
+        if block is None:
+            return None
+        return RoundSnapshot(index % len(self._blocks) + 1, EncodedMatches(block))
+
+
+class EncodedMatches(Sequence):
+    """
+    Classe représentant les instantanés des matchs d'une ronde non décodée, lus dans son bloc au premier accès.
+
+    Le bloc étant immuable, la lecture peut se faire depuis n'importe quel fil d'exécution, sans verrou.
+
+    :param bytes block: Bloc encodé de la ronde.
+    """
+    #: Bloc encodé de la ronde
+    _block: bytes
+    #: Instantanés des matchs, une fois lus
+    _matches: tuple[MatchSnapshot, ...] | None
+
+    def __init__(self, block: bytes) -> None:
+        """
+        Initialise de nouveaux instantanés de matchs.
+        """
+        self._block = block
+        self._matches = None
+
+    @property
+    def block(self) -> bytes:
+        return self._block
+
+    def __len__(self) -> int:
+        return COUNT.unpack_from(self._block, 0)[0]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(matches={len(self)}, decoded={self._matches is not None})"
+
+    def __getitem__(self, index: int | slice) -> MatchSnapshot | tuple[MatchSnapshot, ...]:
+        return self.decoded[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return self.decoded == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(self.decoded)
+
+    @property
+    def decoded(self) -> tuple[MatchSnapshot, ...]:
+        """
+        Instantanés des matchs, lus dans le bloc au premier accès.
+        """
+        if self._matches is None:
+            columns: tuple[array, ...] = _decode_round_columns(memoryview(self._block), 0)
+            self._matches = tuple(
+                MatchSnapshot(None if participant1 < 0 else participant1, None if participant2 < 0 else participant2,
+                              None if status1 == NO_SCORE else (touches1, STATUSES[status1]),
+                              None if status2 == NO_SCORE else (touches2, STATUSES[status2]),
+                              bool(validation), 0)
+                for participant1, participant2, touches1, status1, touches2, status2, validation in zip(*columns))
+        return self._matches
+
+
+def round_block(tournament: Tournament, index: int, indexes: dict[Fencer, int] | dict[Team, int]) -> bytes:
+    """
+    Bloc d'une ronde, recopié tel quel si elle n'a pas été décodée depuis le chargement de la compétition.
+
+    :param tournament: Compétition de la ronde.
+    :param index: Indice de la ronde.
+    :param indexes: Indices des tireurs/équipes dans le registre.
+    :return: Bloc de la ronde.
+    """
+    if isinstance(tournament.rounds, RoundHistory):
+        encoded: bytes | None = tournament.rounds.encoded(index)
+        if encoded is not None:
+            return encoded
+    return _encode_round(tournament.rounds[index].matches, indexes)
+
+
+def capture(tournament: Tournament) -> Capture:
+    """
+    Capture le contenu d'une compétition à enregistrer, sans l'encoder.
+
+    La capture est faite par le fil qui possède la compétition, en temps constant pour une compétition individuelle :
+    l'encodage, proportionnel à la taille de la compétition, peut ensuite être fait depuis un autre fil.
+
+    :param tournament: Compétition à enregistrer.
+    :return: Contenu de la compétition.
+    """
+    snapshot: TournamentSnapshot = tournament.snapshot
+    registry: tuple[Fencer, ...] | tuple[Team, ...] = tuple(tournament.registry[:len(snapshot.registry)])
+    members: tuple[tuple[Fencer, ...], ...] = ()
+    if tournament.kind == "Équipe":
+        members = tuple(tuple(team.fencers_sorted_by_name) for team in registry)
+    return Capture(snapshot, tournament.weapon, tournament.gender, tournament.category,
+                   tournament.licences_are_needed, registry, members,
+                   tuple(tournament.checkpoints[:len(snapshot.rounds)]))
+
+
+def dump(content: Tournament | Capture, file: BinaryIO) -> None:
+    """
+    Écrit une compétition dans un fichier binaire ouvert, positionnable.
+
+    Les scores et les rondes écrits sont ceux du dernier instantané publié de la compétition.
+
+    :param content: Compétition à écrire, ou son contenu capturé par `capture`.
+    :param file: Fichier binaire ouvert en écriture.
+    """
+    if isinstance(content, Tournament):
+        content = capture(content)
+    snapshot: TournamentSnapshot = content.snapshot
+    registry: tuple[Fencer, ...] | tuple[Team, ...] = content.registry
+    strings: _Strings = _Strings()
+
+    # Tireurs et équipes
+    teams: tuple[Team, ...] = ()
+    fencers: list[Fencer] = list()
+    if snapshot.kind == "Équipe":
+        teams = registry
+        for team_members in content.members:
+            fencers.extend(team_members)
+    else:
+        fencers = list(registry)
+
+    fencers_block: bytes = b"".join((COUNT.pack(len(fencers)),
+                                     _pack("I", (strings.index(fencer.lastname) for fencer in fencers)),
+                                     _pack("I", (strings.index(fencer.firstname) for fencer in fencers)),
+                                     bytes(FENCER_GENDERS.index(fencer.gender) for fencer in fencers),
+                                     _pack("H", (fencer.age for fencer in fencers)),
+                                     _pack("i", (strings.index(fencer.club) for fencer in fencers)),
+                                     _pack("Q", (fencer.licence or 0 for fencer in fencers)),
+                                     bytes(fencer.has_team for fencer in fencers)))
+
+    # Les tireurs de chaque équipe se suivent dans le bloc des tireurs
+    members_offsets: list[int] = [0]
+    for team_members in content.members:
+        members_offsets.append(members_offsets[-1] + len(team_members))
+    teams_block: bytes = b"".join((COUNT.pack(len(teams)),
+                                   _pack("I", (strings.index(team.name) for team in teams)),
+                                   _pack("I", members_offsets),
+                                   _pack("I", range(members_offsets[-1]))))
+
+    # Participants et scores
+    subjects: list[int] = list(range(len(registry)))
+    scores_block: bytes = _encode_scores(snapshot.registry, subjects)
+
+    # Blocs
+    blocks: list[tuple[bytes, int, bytes]] = [(b"STRS", 0, strings.encode()),
+                                              (b"FENC", 0, fencers_block),
+                                              (b"TEAM", 0, teams_block),
+                                              (b"PART", 0, scores_block)]
+    for number, checkpoint in enumerate(content.checkpoints):
+        blocks.append((b"CHKP", number, encode_checkpoint(checkpoint)))
+    matches: int = 0
+    for i, round_snapshot in enumerate(snapshot.rounds):
+        encoded: bytes = _encode_round_snapshot(round_snapshot)
+        matches += COUNT.unpack_from(encoded)[0]
+        blocks.append((b"ROND", i + 1, encoded))
+
+    # En-tête
+    name: bytes = snapshot.name.encode("utf-8")
+    category: bytes = content.category.encode("utf-8")
+    offset: int = HEADER.size + len(name) + len(category)
+    index: list[Block] = list()
+    for tag, number, data in blocks:
+        index.append(Block(tag, number, offset, len(data)))
+        offset += len(data)
+    options: int = (content.licences_are_needed << 0) | (snapshot.draws_are_allowed << 1)
+    file.write(HEADER.pack(MAGIC, VERSION,
+                           WEAPONS.index(content.weapon), TOURNAMENT_GENDERS.index(content.gender),
+                           KINDS.index(snapshot.kind), options, snapshot.maximum_score,
+                           len(registry), len(fencers), len(snapshot.rounds), matches,
+                           offset, len(index), len(name), len(category)))
+    file.write(name)
+    file.write(category)
+
+    # Corps et index
+    for _, _, data in blocks:
+        file.write(data)
+    for block in index:
+        file.write(INDEX_ENTRY.pack(*block))
+
+
+def dumps(content: Tournament | Capture) -> bytes:
+    """
+    Encode une compétition au format binaire.
+
+    :param content: Compétition à encoder, ou son contenu capturé par `capture`.
+    :return: Contenu du fichier de compétition.
+    """
+    buffer: BytesIO = BytesIO()
+    dump(content, buffer)
+    return buffer.getvalue()
+
+
+def _file_mode(path: str) -> int:
+    """
+    Droits d'accès à donner au fichier qui remplace un fichier : ceux du fichier existant, ou ceux d'un nouveau
+    fichier selon le masque de création courant.
+
+    :param path: Chemin du fichier.
+    :return: Droits d'accès.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask: int = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def open_atomically(path: str, mode: str = "wb", **kwargs) -> Iterator[IO]:
+    """
+    Ouvre un fichier temporaire en écriture, qui remplace atomiquement le fichier visé à la fermeture, ou est
+    supprimé en cas d'erreur. Le fichier temporaire, créé lisible par son seul propriétaire, reçoit auparavant les
+    droits d'accès du fichier visé, ou ceux d'un nouveau fichier.
+
+    :param path: Chemin du fichier.
+    :param mode: Mode d'ouverture en écriture.
+    :param kwargs: Paramètres d'ouverture supplémentaires, par exemple `encoding` et `newline` en mode texte.
+    :return: Fichier temporaire ouvert.
+    """
+    directory: str = os.path.dirname(os.path.abspath(path))
+    with NamedTemporaryFile(mode, dir=directory, prefix=".", suffix=".tmp", delete=False, **kwargs) as file:
+        try:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+            os.chmod(file.name, _file_mode(path))
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+
+
+def write_atomically(path: str, content: bytes) -> None:
+    """
+    Écrit un fichier en remplaçant atomiquement l'éventuel fichier existant.
+
+    :param path: Chemin du fichier.
+    :param content: Contenu du fichier.
+    """
+    with open_atomically(path) as file:
+        file.write(content)
+
+
+def save(tournament: Tournament, path: str) -> None:
+    """
+    Enregistre une compétition dans un fichier, de manière atomique.
+
+    :param tournament: Compétition à enregistrer.
+    :param path: Chemin du fichier.
+    """
+    write_atomically(path, dumps(tournament))
+
+
+def _parse_header(buffer: bytes | memoryview) -> tuple[Header, int]:
+    """
+    Analyse l'en-tête d'un fichier de compétition.
+
+    :param buffer: Début du contenu du fichier.
+    :return: En-tête et taille de l'en-tête.
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("Le fichier n'est pas un fichier de compétition : en-tête tronqué.")
+    (magic, version, weapon, gender, kind, options, maximum_score, participants, fencers, rounds, matches,
+     index_offset, index_count, name_length, category_length) = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Le fichier n'est pas un fichier de compétition : signature invalide.")
+    if version > VERSION:
+        raise ValueError(f"La version `{version}` du fichier de compétition n'est pas prise en charge.")
+    size: int = HEADER.size + name_length + category_length
+    if len(buffer) < size:
+        raise ValueError("Le fichier n'est pas un fichier de compétition : en-tête tronqué.")
+    name: str = bytes(buffer[HEADER.size:HEADER.size + name_length]).decode("utf-8")
+    category: str = bytes(buffer[HEADER.size + name_length:size]).decode("utf-8")
+    return Header(version, name, WEAPONS[weapon], TOURNAMENT_GENDERS[gender], category, KINDS[kind], maximum_score,
+                  bool(options & 0b01), bool(options & 0b10), participants, fencers, rounds, matches,
+                  index_offset, index_count), size
+
+
+def read_header(path: str) -> Header:
+    """
+    Lit l'en-tête d'un fichier de compétition, sans lire le reste du fichier.
+
+    :param path: Chemin du fichier.
+    :return: En-tête du fichier.
+    """
+    with open(path, "rb") as file:
+        fixed: bytes = file.read(HEADER.size)
+        if len(fixed) < HEADER.size:
+            raise ValueError("Le fichier n'est pas un fichier de compétition : en-tête tronqué.")
+        name_length, category_length = struct.unpack_from("<HH", fixed, HEADER.size - 4)
+        return _parse_header(fixed + file.read(name_length + category_length))[0]
+
+
+def _read_index(buffer: memoryview, header: Header) -> list[Block]:
+    """
+    Lit l'index d'un fichier de compétition.
+
+    :param buffer: Contenu du fichier.
+    :param header: En-tête du fichier.
+    :return: Entrées de l'index.
+    """
+    if header.index_offset + header.index_count * INDEX_ENTRY.size > len(buffer):
+        raise ValueError("Le fichier de compétition est tronqué : index incomplet.")
+    return [Block(*INDEX_ENTRY.unpack_from(buffer, header.index_offset + i * INDEX_ENTRY.size))
+            for i in range(header.index_count)]
+
+
+def _decode_strings(buffer: memoryview, offset: int) -> list[str]:
+    """
+    Décode la table des chaînes.
+
+    :param buffer: Contenu du fichier.
+    :param offset: Position du bloc.
+    :return: Chaînes de la table.
+    """
+    count, offset = _count(buffer, offset)
+    offsets, offset = _unpack("I", buffer, offset, count + 1)
+    blob: bytes = bytes(buffer[offset:offset + offsets[-1]])
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+
+
+def _decode_fencers(buffer: memoryview, offset: int, strings: list[str]) -> list[Fencer]:
+    """
+    Décode le bloc des tireurs.
+
+    :param buffer: Contenu du fichier.
+    :param offset: Position du bloc.
+    :param strings: Table des chaînes.
+    :return: Tireurs.
+    """
+    count, offset = _count(buffer, offset)
+    lastnames, offset = _unpack("I", buffer, offset, count)
+    firstnames, offset = _unpack("I", buffer, offset, count)
+    genders, offset = _unpack("B", buffer, offset, count)
+    ages, offset = _unpack("H", buffer, offset, count)
+    clubs, offset = _unpack("i", buffer, offset, count)
+    licences, offset = _unpack("Q", buffer, offset, count)
+    teammates, offset = _unpack("B", buffer, offset, count)
+    return [Fencer(strings[lastnames[i]], strings[firstnames[i]], FENCER_GENDERS[genders[i]], ages[i],
+                   club=None if clubs[i] < 0 else strings[clubs[i]],
+                   licence=licences[i] or None,
+                   has_team=bool(teammates[i]))
+            for i in range(count)]
+
+
+def _decode_teams(buffer: memoryview, offset: int, strings: list[str], fencers: list[Fencer]) -> list[Team]:
+    """
+    Décode le bloc des équipes.
+
+    :param buffer: Contenu du fichier.
+    :param offset: Position du bloc.
+    :param strings: Table des chaînes.
+    :param fencers: Tireurs.
+    :return: Équipes.
+    """
+    count, offset = _count(buffer, offset)
+    names, offset = _unpack("I", buffer, offset, count)
+    offsets, offset = _unpack("I", buffer, offset, count + 1)
+    members, offset = _unpack("I", buffer, offset, offsets[-1])
+    return [Team(strings[names[i]], fencers={fencers[j] for j in members[offsets[i]:offsets[i + 1]]})
+            for i in range(count)]
+
+
+def _decode_scores(buffer: memoryview, offset: int,
+                   subjects: list[Fencer] | list[Team]) -> tuple[list[Fencer] | list[Team], set[Fencer] | set[Team]]:
+    """
+    Décode le bloc des participants et restaure leurs scores.
+
+    :param buffer: Contenu du fichier.
+    :param offset: Position du bloc.
+    :param subjects: Tireurs ou équipes, selon le type de compétition.
+    :return: Registre et participants de la compétition.
+    """
+    count, offset = _count(buffer, offset)
+    indexes, offset = _unpack("I", buffer, offset, count)
+    flags, offset = _unpack("B", buffer, offset, count)
+    victories, offset = _unpack("d", buffer, offset, count)
+    touches_scored, offset = _unpack("q", buffer, offset, count)
+    touches_received, offset = _unpack("q", buffer, offset, count)
+    offsets, offset = _unpack("I", buffer, offset, count + 1)
+    opponents, offset = _unpack("I", buffer, offset, offsets[-1])
+
+    registry: list[Fencer] | list[Team] = [subjects[i] for i in indexes]
+    participants: set[Fencer] | set[Team] = set()
+    for i, participant in enumerate(registry):
+        participant.restore(victories[i], touches_scored[i], touches_received[i],
+                            opponents_encountered={registry[j] for j in opponents[offsets[i]:offsets[i + 1]]},
+                            has_been_exempted=bool(flags[i] & EXEMPTED))
+        if flags[i] & ACTIVE:
+            participants.add(participant)
+    return registry, participants
+
+
+def decode_checkpoint(buffer: memoryview, offset: int) -> Checkpoint:
+    """
+    Décode le bloc d'un point de contrôle.
+
+    :param buffer: Contenu du fichier.
+    :param offset: Position du bloc.
+    :return: Point de contrôle.
+    """
+    size, offset = _count(buffer, offset)
+    count, offset = _count(buffer, offset)
+    indexes: array | None = None
+    if count == KEYFRAME:
+        count = size
+    else:
+        indexes, offset = _unpack("I", buffer, offset, count)
+        indexes = array("l", indexes)
+    flags: bytes = bytes(buffer[offset:offset + count])
+    victories, offset = _unpack("d", buffer, offset + count, count)
+    touches_scored, offset = _unpack("q", buffer, offset, count)
+    touches_received, offset = _unpack("q", buffer, offset, count)
+    return Checkpoint(size, indexes, flags, victories, touches_scored, touches_received)
+
+
+def _decode_round_columns(buffer: memoryview, offset: int) -> tuple[array, ...]:
+    """
+    Décode les colonnes du bloc d'une ronde.
+
+    :param buffer: Contenu du bloc.
+    :param offset: Position du bloc.
+    :return: Premiers et seconds participants, touches et statuts des deux scores, et validations des matchs.
+    """
+    count, offset = _count(buffer, offset)
+    columns: list[array] = list()
+    for typecode in ("i", "i", "H", "B", "H", "B", "B"):
+        column, offset = _unpack(typecode, buffer, offset, count)
+        columns.append(column)
+    return tuple(columns)
+
+
+def decode_round(buffer: memoryview, block: Block, registry: list[Fencer] | list[Team],
+                 maximum_score: int, draws_are_allowed: bool) -> Round:
+    """
+    Décode le bloc d'une ronde.
+
+    :param buffer: Contenu du fichier.
+    :param block: Entrée de l'index de la ronde.
+    :param registry: Registre des tireurs/équipes.
+    :param maximum_score: Score maximum des matchs.
+    :param draws_are_allowed: Autorisation des matchs nuls.
+    :return: Ronde.
+    """
+    participants1, participants2, touches1, statuses1, touches2, statuses2, validations = \
+        _decode_round_columns(buffer, block.offset)
+
+    participants: set[Fencer] | set[Team] = set()
+    matches: list[Match] = list()
+    for i in range(len(participants1)):
+        participant1: Fencer | Team | None = None if participants1[i] < 0 else registry[participants1[i]]
+        participant2: Fencer | Team | None = None if participants2[i] < 0 else registry[participants2[i]]
+        score1: Score | None = None if statuses1[i] == NO_SCORE else Score(touches1[i], STATUSES[statuses1[i]])
+        score2: Score | None = None if statuses2[i] == NO_SCORE else Score(touches2[i], STATUSES[statuses2[i]])
+        matches.append(Match(maximum_score, draws_are_allowed,
+                             participant1=participant1, score1=score1, participant2=participant2, score2=score2,
+                             is_validated=bool(validations[i])))
+        participants.update(participant for participant in (participant1, participant2) if participant is not None)
+    return Round(block.number, maximum_score, draws_are_allowed, participants, matches=matches)
+
+
+def load(path: str) -> Tournament:
+    """
+    Charge une compétition depuis un fichier, projeté en mémoire.
+
+    Les participants, les scores et la ronde en cours sont décodés immédiatement, les rondes précédentes au premier
+    accès.
+
+    Les blocs des rondes sont recopiés hors de la projection, qui est fermée avant le retour : une projection gardée
+    ouverte empêcherait sous Windows de remplacer le fichier, ce que font l'enregistrement et la sauvegarde
+    automatique. La copie, quelques octets par match, reste négligeable devant le décodage des participants : 0,2 ms
+    sur 207 ms pour 5000 tireurs et 12 rondes.
+
+    :param path: Chemin du fichier.
+    :return: Compétition chargée.
+    """
+    with open(path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as mapping:
+        with memoryview(mapping) as buffer:
+            header, _ = _parse_header(buffer)
+            blocks: dict[bytes, list[Block]] = dict()
+            for block in _read_index(buffer, header):
+                if block.offset + block.length > len(buffer):
+                    raise ValueError("Le fichier de compétition est tronqué : bloc incomplet.")
+                blocks.setdefault(block.tag, list()).append(block)
+
+            # Tireurs et équipes
+            strings: list[str] = _decode_strings(buffer, blocks[b"STRS"][0].offset)
+            fencers: list[Fencer] = _decode_fencers(buffer, blocks[b"FENC"][0].offset, strings)
+            teams: list[Team] = _decode_teams(buffer, blocks[b"TEAM"][0].offset, strings, fencers)
+
+            # Participants, scores et rondes
+            registry, participants = _decode_scores(buffer, blocks[b"PART"][0].offset,
+                                                    teams if header.kind == "Équipe" else fencers)
+            checkpoints: list[Checkpoint] = [decode_checkpoint(buffer, block.offset)
+                                             for block in sorted(blocks.get(b"CHKP", list()), key=lambda x: x.number)]
+            rounds: RoundHistory = RoundHistory((bytes(buffer[block.offset:block.offset + block.length])
+                                                 for block in sorted(blocks.get(b"ROND", list()),
+                                                                     key=lambda x: x.number)),
+                                                registry, header.maximum_score, header.draws_are_allowed)
+
+    # Seule la ronde en cours est décodée à l'ouverture
+    if rounds:
+        rounds[-1]
+
+    tournament: Tournament = Tournament(header.name, header.weapon, header.gender, header.category, header.kind,
+                                        header.maximum_score, header.licences_are_needed, header.draws_are_allowed)
+    tournament.restore(registry, participants, rounds, checkpoints)
+    return tournament
@@ -2,8 +2,6 @@ from typing import Any
 
 from collections.abc import Iterable
 
-import networkx as nx
-
 
 def max_weighted_matching(nodes: Iterable, edges: Iterable[tuple[Any, Any, int | float]]) -> set[tuple[Any, Any]]:
     """
@@ -13,6 +11,9 @@ def max_weighted_matching(nodes: Iterable, edges: Iterable[tuple[Any, Any, int |
     :param edges: ...
     :return: ...
     """
+    # networkx n'est chargé qu'au premier appariement, pour ne pas ralentir le démarrage
+    import networkx as nx
+
     graph = nx.Graph()
     graph.add_nodes_from(nodes)
     graph.add_weighted_edges_from(edges)
@@ -0,0 +1,360 @@
+import tkinter as tk
+from tkinter.ttk import Frame, Scrollbar, Style, Treeview
+
+from competition.fencer import Fencer
+from competition.journal import Event
+from competition.team import Team
+from competition.tournament import Tournament
+
+
+#: Colonnes du tableau des participants : identifiant, intitulé et largeur
+COLUMNS: tuple[tuple[str, str, int], ...] = (("team", "Equipe", 200),
+                                             ("name", "Nom", 220),
+                                             ("firstname", "Prénom", 200),
+                                             ("age", "Age", 70),
+                                             ("gender", "Sexe", 100),
+                                             ("club", "Club", 200),
+                                             ("licence", "Licence", 120))
+
+#: Hauteur d'une ligne, en pixels
+ROW_HEIGHT: int = 28
+
+#: Ligne du tableau : tireur/équipe, et équipe du tireur pour une compétition par équipe
+Row = tuple[Fencer | Team, Team | None]
+
+
+def participant_rows(participant: Fencer | Team) -> list[Row]:
+    """
+    Lignes d'un.e tireur/équipe : un tireur, ou une équipe suivie de ses tireurs par ordre alphabétique.
+
+    :param participant: Tireur/Équipe.
+    :return: Lignes du tireur/équipe.
+    """
+    if isinstance(participant, Fencer):
+        return [(participant, None)]
+    return [(participant, None)] + [(fencer, participant) for fencer in participant.fencers_sorted_by_name]
+
+
+def row_values(row: Row, columns: tuple[str, ...]) -> tuple:
+    """
+    Valeurs d'une ligne du tableau.
+
+    :param row: Ligne du tableau.
+    :param columns: Colonnes affichées.
+    :return: Valeurs des colonnes.
+    """
+    participant, team = row
+    if isinstance(participant, Team):
+        values: dict[str, object] = {"team": participant.name}
+    else:
+        values = {"team": "" if team is None else team.name, "name": participant.lastname,
+                  "firstname": participant.firstname, "age": participant.age, "gender": participant.gender,
+                  "club": participant.club or "", "licence": participant.licence or ""}
+    return tuple(values.get(column, "") for column in columns)
+
+
+def row_key(row: Row) -> tuple[int, int]:
+    """
+    Clé d'une ligne du tableau, stable d'une reconstruction à l'autre.
+
+    :param row: Ligne du tableau.
+    :return: Identités du tireur/équipe et de son équipe.
+    """
+    return id(row[0]), id(row[1])
+
+
+class ParticipantsView(Frame):
+    """
+    Tableau virtualisé des participants d'une compétition, dans l'ordre d'inscription.
+
+    Seules les lignes visibles existent dans le `Treeview` : leurs valeurs sont remplacées au défilement à partir des
+    lignes du tableau, quel que soit le nombre de participants. Pour une compétition par équipe, chaque équipe est
+    suivie de ses tireurs.
+
+    Le tableau suit le journal de la compétition : de nouvelles inscriptions ajoutent leurs lignes à la fin, alors
+    qu'un retrait, une annulation ou une modification hors du journal reconstruit les lignes, sans toucher au
+    `Treeview` au-delà des lignes visibles. Les changements sont cumulés jusqu'à un unique rafraîchissement, au repos
+    de la boucle Tk.
+
+    :param master: Widget parent.
+    :param Tournament tournament: Compétition affichée.
+    :param bool licence: Affichage des clubs et des licences.
+    :param str style: Style du tableau.
+    """
+    #: Compétition affichée
+    _tournament: Tournament
+    #: Colonnes affichées
+    _columns: tuple[str, ...]
+    #: Lignes du tableau
+    _rows: list[Row]
+    #: Nombre de tireurs/équipes du registre déjà parcouru.e.s
+    _registered: int
+    #: Indice de la première ligne visible
+    _first: int
+    #: Lignes sélectionnées, par clé
+    _selected: dict[tuple[int, int], Row]
+    #: Parité et valeurs affichées, par ligne du `Treeview`
+    _values: list[tuple[int, tuple] | None]
+    #: Rafraîchissement en attente : `None`, `False` pour des ajouts, `True` pour une reconstruction
+    _pending: bool | None
+    #: Rafraîchissement programmé
+    _after_id: str | None
+    #: Tableau
+    _tree: Treeview
+    #: Barre de défilement
+    _scrollbar: Scrollbar
+
+    def __init__(self, master: tk.Misc, tournament: Tournament, *,
+                 licence: bool = False, style: str = "Participants.Treeview") -> None:
+        """
+        Initialise un nouveau tableau.
+        """
+        super().__init__(master)
+
+        # Lignes
+        self._tournament = tournament
+        self._columns = tuple(column for column, _, _ in COLUMNS
+                              if ((column != "team") or (tournament.kind == "Équipe"))
+                              and (licence or (column not in ("club", "licence"))))
+        self._rows = list()
+        self._registered = 0
+        self._first = 0
+        self._selected = dict()
+        self._values = list()
+
+        # Rafraîchissements
+        self._pending = None
+        self._after_id = None
+        tournament.journal.subscribe(self._on_journal)
+
+        # Widgets
+        self._create_table(style)
+
+    @property
+    def tournament(self) -> Tournament:
+        return self._tournament
+
+    @property
+    def rows(self) -> list[Row]:
+        return self._rows
+
+    @property
+    def first(self) -> int:
+        return self._first
+
+    @property
+    def visible_rows(self) -> int:
+        """
+        Nombre de lignes que la hauteur actuelle du tableau permet d'afficher.
+        """
+        height: int = self._tree.winfo_height()
+        if height <= 1:
+            return int(self._tree.cget("height"))
+        return max(1, height // ROW_HEIGHT - 1)
+
+    @property
+    def selection(self) -> list[Row]:
+        """
+        Lignes sélectionnées, dans l'ordre du tableau, y compris celles qui ne sont pas visibles.
+        """
+        return [row for row in self._rows if row_key(row) in self._selected]
+
+    def _create_table(self, style: str) -> None:
+        """
+        Crée le tableau et sa barre de défilement.
+        """
+        # Style
+        Style().configure(style, rowheight=ROW_HEIGHT)
+
+        # Tableau
+        self._tree = Treeview(self, columns=self._columns, show="headings", selectmode="extended", style=style,
+                              height=20)
+        for column, heading, width in COLUMNS:
+            if column in self._columns:
+                self._tree.heading(column, text=heading)
+                self._tree.column(column, width=width, stretch=(column in ("team", "name")),
+                                  anchor=tk.E if column in ("age", "licence") else tk.W)
+        self._tree.tag_configure("1", background="#E8E8E8")
+
+        # Barre de défilement
+        self._scrollbar = Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        # Évènements
+        self._tree.bind("<Configure>", lambda event: self._render())
+        self._tree.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self._tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self._tree.bind("<Button-5>", lambda event: self.scroll(3))
+        self._tree.bind("<Prior>", lambda event: self.scroll(-self.visible_rows) or "break")
+        self._tree.bind("<Next>", lambda event: self.scroll(self.visible_rows) or "break")
+        self._tree.bind("<Home>", lambda event: self.scroll_to(0) or "break")
+        self._tree.bind("<End>", lambda event: self.scroll_to(len(self._rows)) or "break")
+        self._tree.bind("<<TreeviewSelect>>", lambda event: self._on_select())
+
+        # Positionnements
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def destroy(self) -> None:
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._tournament.journal.unsubscribe(self._on_journal)
+        super().destroy()
+
+    def refresh(self) -> None:
+        """
+        Reconstruit les lignes depuis les participants de la compétition et met à jour les lignes visibles.
+        """
+        self._rows = list()
+        self._registered = 0
+        self._append_registered()
+        keys: set[tuple[int, int]] = {row_key(row) for row in self._rows}
+        self._selected = {key: row for key, row in self._selected.items() if key in keys}
+        self._render()
+
+    def _append_registered(self) -> int:
+        """
+        Ajoute les lignes des participant.e.s inscrit.e.s depuis le dernier parcours du registre.
+
+        :return: Position de la première ligne ajoutée.
+        """
+        start: int = len(self._rows)
+        registry: list[Fencer] | list[Team] = self._tournament.registry
+        participants: set[Fencer] | set[Team] = self._tournament.participants
+        for participant in registry[self._registered:]:
+            if participant in participants:
+                self._rows.extend(participant_rows(participant))
+        self._registered = len(registry)
+        return start
+
+    def _on_journal(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Abonnement au journal de la compétition : les nouvelles inscriptions sont ajoutées à la fin, tout autre
+        changement des participants reconstruit les lignes.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        """
+        if operation == "score":
+            return
+        events: tuple[Event, ...] = event if operation == "extend" else (event,)
+        if (operation not in ("record", "extend"))\
+                or any((batch_event.kind == "withdrawal")
+                       or ((batch_event.kind == "registration")
+                           and (self._tournament.participant_index(batch_event.subject) < self._registered))
+                       for batch_event in events):
+            self._pending = True
+        elif any(batch_event.kind == "registration" for batch_event in events):
+            self._pending = bool(self._pending)
+        else:
+            return
+        if self._after_id is None:
+            self._after_id = self.after_idle(self._flush)
+
+    def _flush(self) -> None:
+        """
+        Applique les changements cumulés depuis le dernier rafraîchissement.
+        """
+        pending: bool | None = self._pending
+        self._pending = None
+        self._after_id = None
+        if pending is None:
+            return
+        if pending:
+            self.refresh()
+            return
+        start: int = self._append_registered()
+        self._render((start, len(self._rows)))
+
+    def scroll(self, rows: int) -> None:
+        """
+        Fait défiler le tableau.
+
+        :param rows: Nombre de lignes, négatif vers le haut.
+        """
+        self.scroll_to(self._first + rows)
+
+    def scroll_to(self, first: int) -> None:
+        """
+        Fait défiler le tableau jusqu'à une ligne.
+
+        :param first: Indice de la première ligne visible.
+        """
+        first = max(0, min(first, len(self._rows) - self.visible_rows))
+        if first != self._first:
+            self._first = first
+            self._render()
+
+    def _render(self, span: tuple[int, int] | None = None) -> None:
+        """
+        Ajuste le nombre de lignes du `Treeview` à la hauteur visible, puis y place les valeurs des lignes.
+
+        :param span: Positions ``[début, fin[`` des lignes modifiées, ou `None` pour toutes.
+        """
+        tree: Treeview = self._tree
+        size: int = len(self._rows)
+        visible: int = self.visible_rows
+        first: int = max(0, min(self._first, size - visible))
+        count: int = min(visible, size - first)
+        if (first != self._first) or (span is None):
+            span = (first, first + count)
+        self._first = first
+
+        # Lignes du `Treeview`
+        if len(self._values) > count:
+            tree.delete(*(str(i) for i in range(count, len(self._values))))
+            del self._values[count:]
+        for i in range(len(self._values), count):
+            tree.insert("", tk.END, iid=str(i), tags=(str((first + i) % 2),))
+            self._values.append(None)
+
+        # Cellules modifiées des lignes visibles
+        for row in range(max(span[0], first), min(span[1], first + count)):
+            i: int = row - first
+            values: tuple = row_values(self._rows[row], self._columns)
+            displayed: tuple[int, tuple] | None = self._values[i]
+            if displayed is None:
+                tree.item(str(i), values=values, tags=(str(row % 2),))
+            else:
+                for column, old, new in zip(self._columns, displayed[1], values):
+                    if old != new:
+                        tree.set(str(i), column, new)
+                if displayed[0] != row % 2:
+                    tree.item(str(i), tags=(str(row % 2),))
+            self._values[i] = (row % 2, values)
+
+        # Sélection, qui suit les lignes sélectionnées
+        selection: tuple[str, ...] = tuple(str(i) for i in range(count)
+                                           if row_key(self._rows[first + i]) in self._selected)
+        if tree.selection() != selection:
+            tree.selection_set(selection)
+
+        # Barre de défilement
+        if size:
+            self._scrollbar.set(first / size, (first + count) / size)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action: str, value: str, unit: str | None = None) -> None:
+        """
+        Commande de la barre de défilement.
+
+        :param action: ``'moveto'`` ou ``'scroll'``.
+        :param value: Fraction du tableau, ou nombre d'unités.
+        :param unit: ``'units'`` ou ``'pages'``, pour ``'scroll'``.
+        """
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self._rows)))
+        elif action == "scroll":
+            self.scroll(int(value) * (self.visible_rows if unit == "pages" else 1))
+
+    def _on_select(self) -> None:
+        """
+        Mémorise les lignes sélectionnées parmi les lignes visibles, indépendamment des lignes du `Treeview`.
+        """
+        selection: set[str] = set(self._tree.selection())
+        for i in range(min(len(self._values), len(self._rows) - self._first)):
+            row: Row = self._rows[self._first + i]
+            if str(i) in selection:
+                self._selected[row_key(row)] = row
+            else:
+                self._selected.pop(row_key(row), None)
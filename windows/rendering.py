@@ -0,0 +1,133 @@
+from functools import lru_cache
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    import tkinter as tk
+    from PIL.Image import Image
+    from PIL.ImageFont import FreeTypeFont
+    from PIL.ImageTk import PhotoImage
+
+
+#: Composante sRGB linéarisée, pour chaque valeur de `0` à `255`
+LINEAR_COMPONENTS: tuple[float, ...] = tuple(value / 255 / 12.92 if value / 255 <= 0.04045
+                                             else ((value / 255 + 0.055) / 1.055) ** 2.4
+                                             for value in range(256))
+#: Coefficients de luminance relative des composantes rouge, verte et bleue
+LUMINANCE_FACTORS: tuple[float, float, float] = (0.2126, 0.7152, 0.0722)
+
+#: Police des bannières des compétitions
+BANNER_FONT: str = "arial"
+#: Taille de police des bannières, en points à 96 DPI
+BANNER_FONT_SIZE: int = 20
+#: Taille des bannières, en pixels à 96 DPI
+BANNER_SIZE: tuple[int, int] = (180, 40)
+#: Résolution de référence, en points par pouce
+REFERENCE_DPI: int = 96
+#: Nombre de bannières conservées
+BANNER_CACHE_SIZE: int = 128
+
+
+def rgb(color: str | tuple[int, int, int]) -> tuple[int, int, int]:
+    """
+    Composantes d'une couleur.
+
+    :param color: Couleur hexadécimale ``'#rrggbb'``, ou composantes.
+    :return: Composantes rouge, verte et bleue, de `0` à `255`.
+    """
+    if isinstance(color, str):
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    return tuple(int(component) for component in color)
+
+
+def relative_luminance(color: str | tuple[int, int, int]) -> float:
+    """
+    Luminance relative d'une couleur, depuis la table des composantes linéarisées.
+
+    :param color: Couleur hexadécimale ``'#rrggbb'``, ou composantes.
+    :return: Luminance relative, de `0` à `1`.
+    """
+    return sum(factor * LINEAR_COMPONENTS[component] for factor, component in zip(LUMINANCE_FACTORS, rgb(color)))
+
+
+def get_color_font(color_background: str | tuple[int, int, int]) -> str:
+    """
+    Obtient la couleur hexadécimale de police appropriée, par rapport à la couleur de fond.
+
+    :param color_background: Couleur de fond.
+    :return: Couleur de police
+    """
+    return "#000000" if relative_luminance(color_background) > 0.179 else "#ffffff"
+
+
+def screen_dpi(widget: "tk.Misc") -> int:
+    """
+    Résolution de l'écran d'un widget.
+
+    :param widget: Widget affiché.
+    :return: Résolution, en points par pouce.
+    """
+    return round(widget.winfo_fpixels("1i"))
+
+
+@lru_cache(maxsize=None)
+def font(name: str, size: int) -> "FreeTypeFont":
+    """
+    Police PIL, chargée une seule fois par nom et taille.
+
+    :param name: Nom ou chemin de la police.
+    :param size: Taille, en pixels.
+    :return: Police.
+    """
+    from PIL import ImageFont
+
+    return ImageFont.truetype(name, size)
+
+
+@lru_cache(maxsize=BANNER_CACHE_SIZE)
+def banner(text: str, background: str, foreground: str, *,
+           size: tuple[int, int] = BANNER_SIZE,
+           dpi: int = REFERENCE_DPI) -> "Image":
+    """
+    Bannière d'une compétition, dessinée une seule fois pour un même texte, mêmes couleurs, taille et résolution.
+
+    L'image renvoyée est partagée et ne doit pas être modifiée.
+
+    :param text: Texte de la bannière.
+    :param background: Couleur de fond.
+    :param foreground: Couleur de police.
+    :param size: Taille, en pixels à 96 DPI.
+    :param dpi: Résolution de l'écran, en points par pouce.
+    :return: Image de la bannière.
+    """
+    from PIL import Image, ImageDraw
+
+    scale: float = dpi / REFERENCE_DPI
+    width, height = round(size[0] * scale), round(size[1] * scale)
+    image: Image.Image = Image.new("RGB", (width, height), background)
+    ImageDraw.Draw(image).text((width // 2, height // 2), text, fill=foreground, anchor="mm",
+                               font=font(BANNER_FONT, round(BANNER_FONT_SIZE * scale)))
+    return image
+
+
+def banner_photo(widget: "tk.Misc", text: str, background: str, foreground: str, *,
+                 size: tuple[int, int] = BANNER_SIZE,
+                 dpi: int | None = None) -> "PhotoImage":
+    """
+    Bannière d'une compétition, convertie en image Tk pour la fenêtre racine d'un widget.
+
+    Seule l'image PIL est partagée, par `banner` : une image Tk appartient à l'interpréteur Tcl de sa fenêtre racine
+    et ne peut pas être affichée par une autre. Le widget qui l'affiche doit en garder une référence.
+
+    :param widget: Widget qui affiche la bannière.
+    :param text: Texte de la bannière.
+    :param background: Couleur de fond.
+    :param foreground: Couleur de police.
+    :param size: Taille, en pixels à 96 DPI.
+    :param dpi: Résolution de l'écran, en points par pouce, par défaut celle du widget.
+    :return: Image Tk de la bannière.
+    """
+    from PIL import ImageTk
+
+    return ImageTk.PhotoImage(banner(text, background, foreground, size=size,
+                                     dpi=screen_dpi(widget) if dpi is None else dpi),
+                              master=widget)
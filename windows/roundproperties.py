@@ -3,9 +3,47 @@ from tkinter import ttk
 import tkinter.messagebox as mb
 import tkinter.colorchooser as cc
 
-from itertools import groupby
-import random
-from PIL import Image, ImageDraw, ImageTk, ImageFont
+from queue import Queue, Empty
+from threading import Event, Thread
+
+from assault.match import Match, MatchConflictError
+from assault.round import Round, pair
+from assault.score import Score, parse_bout, parse_sheet
+
+from competition.snapshots import ParticipantSnapshot, TournamentSnapshot
+
+
+#: Intervalle de consultation des messages de l'appariement, en millisecondes
+POLL_INTERVAL: int = 50
+
+#: Nombre maximal d'erreurs de saisie affichées
+MAX_SCORE_ERRORS: int = 30
+
+
+def participant_name(participant: ParticipantSnapshot) -> str:
+    """
+    Nom affiché d'un.e tireur/équipe.
+
+    :param participant: Instantané du tireur/équipe.
+    :return: Nom complet du tireur, ou nom de l'équipe.
+    """
+    return participant.name if isinstance(participant.name, str) else " ".join(participant.name)
+
+
+def pair_snapshot(snapshot: TournamentSnapshot) -> tuple[list[tuple[int, int]], int | None]:
+    """
+    Apparie la prochaine ronde sur un instantané de la compétition, comme `Tournament.new_round`, mais hors du fil de
+    la compétition.
+
+    :param snapshot: Instantané de la compétition.
+    :return: Couples d'indices des tireurs/équipes dans le registre, et indice du tireur/équipe exempté.e, ou `None`.
+    """
+    participants: list[ParticipantSnapshot] = snapshot.participants
+    by_index: dict[int, ParticipantSnapshot] = {participant.index: participant for participant in participants}
+    couples, exempted = pair(participants, lambda participant: [by_index[index] for index in participant.opponents
+                                                                if index in by_index])
+    return [(participant1.index, participant2.index) for participant1, participant2 in couples], \
+        None if exempted is None else exempted.index
 
 
 class RoundProperties(tk.Toplevel):
@@ -20,18 +58,21 @@ class RoundProperties(tk.Toplevel):
         # ...  # RESOLVE
         super().__init__(parent)
         self.parent = parent
+        self.tournament = parent.tournament
 
-        # ...
-        self.pairings = []
-        self.has_bye = []
+        # Matchs de la ronde, une fois appariée, et versions des matchs à la création de la grille
+        self.generation = None
+        self.matches = []
+        self.byes = []
+        self.versions = []
 
-        # ...
-        self.score_label = tk.Label(self, text="Entrer les scores pour la prochaine ronde :")
-        self.score_label.pack()
-        self.score_entry = tk.Entry(self)
-        self.score_entry.pack()
-        self.submit_button = tk.Button(self, text="Envoyer Scores", command=self.submit_scores)
-        self.submit_button.pack()
+        # Appariement
+        self.messages = Queue()
+        self.cancelled = Event()
+        self.worker = None
+
+        # Saisie des scores
+        self.score_entries = []
 
         # Fenêtre
         self.title("Nouvelle ronde")
@@ -42,6 +83,7 @@ class RoundProperties(tk.Toplevel):
         # ...
         self.__create_header()
         self.__create_pairs()
+        self.__create_scores()
         # self.__create_remains()
 
     def __create_header(self) -> None:
@@ -51,70 +93,162 @@ class RoundProperties(tk.Toplevel):
         # NEEDS TTK
 
         # Label
-        label = tk.Label(self, text=f"Ronde n°{self.parent.rounds_id}")
+        label = tk.Label(self, text=f"Ronde n°{len(self.tournament.rounds) + 1}")
 
         # Positionnement
         label.pack()
 
     def __create_pairs(self) -> None:
-        """...
+        """Crée la liste des appariements, calculés en arrière-plan avec une barre de progression et un bouton
+        d'annulation.
         """
         # Style
         # NEEDS TTK
 
-        def matching(fencers: ...):
-            pairings, has_bye = [], []
-            groups = []
-            for _, group in groupby(sorted(fencers, key=lambda x: x["wins"], reverse=True), key=lambda x: x["wins"]):
-                groups.append(list(group))
-            for group_id, group in enumerate(groups):
-                group.sort(key=lambda x: (x["wins"], x["indice"], x["score"]), reverse=True)
-                strong, weak = group[:len(group)//2], group[len(group)//2:]
-                for fencer in strong:
-                    i = strong.index(fencer)
-                    opponents = weak[i:] + weak[:i]  # TO CHANGE BY A DISTANCE WITH ALL OPPONENTS
-                    for opponent in opponents:
-                        if fencer["id"] not in opponent["memory"]:
-                            pairings.append((fencer, opponent))
-                            strong.pop(i)
-                            weak.remove(opponent)
-                            group.remove(fencer)
-                            group.remove(opponent)
-                            break
-                # NOT NEEDED WHEN DISTANCE WITH ALL OPPONENTS
-                for fencer in weak:
-                    i = weak.index(fencer)
-                    opponents = strong[i:] + strong[:i]
-                    for opponent in opponents:
-                        if fencer["id"] not in opponent["memory"]:
-                            pairings.append((fencer, opponent))
-                            weak.pop(i)
-                            strong.remove(opponent)
-                            group.remove(fencer)
-                            group.remove(opponent)
-                            break
-                for fencer in group:
-                    if group_id < len(groups) - 1:
-                        groups[group_id+1].append(fencer)
-                    else:
-                        has_bye.append(fencer)
-            print(pairings)
-            print(has_bye)
-
-            return pairings, has_bye
-
-        pairs, has_bye = matching(self.parent.tournament_fencers)
-        self.pairings = [(d[0]["id"], d[1]["id"]) for d in pairs]
-        self.has_bye = [d["id"] for d in has_bye]
-
-        pairings_listbox = tk.Listbox(self, width=50)
-        pairings_listbox.pack()
-        pairings_listbox.delete(0, tk.END)
-        for pair in pairs:
-            participant1, participant2 = pair
-            pairings_listbox.insert(tk.END, f"{participant1["name"]} vs {participant2["name"]}")
-        for participant in has_bye:
-            pairings_listbox.insert(tk.END, f"{participant["name"]} est exempté")
+        # Widgets
+        self.pairings_listbox = tk.Listbox(self, width=50)
+        self.pairings_listbox.pack()
+        self.progressbar = ttk.Progressbar(self, mode="indeterminate", length=300)
+        self.progressbar.pack()
+        self.progressbar.start()
+        self.cancel_button = tk.Button(self, text="Annuler", command=self.cancel_pairing)
+        self.cancel_button.pack()
+        self.bind("<Destroy>", lambda event: self.cancelled.set() if event.widget is self else None)
+
+        # Appariement, sur l'instantané immuable de la compétition plutôt que sur les tireurs/équipes
+        snapshot = self.tournament.snapshot
+        self.generation = snapshot.generation
+        self.worker = Thread(target=self.__run_pairing, args=(snapshot,), name="RoundProperties.pairing", daemon=True)
+        self.worker.start()
+        self.after(POLL_INTERVAL, self.__poll_pairing)
+
+    def __create_scores(self) -> None:
+        """Crée la grille de saisie des scores, remplie à la réception des appariements, et la feuille de scores
+        permettant de saisir toute la ronde d'un coup.
+        """
+        # Grille, défilante
+        score_label = tk.Label(self, text="Entrer les scores pour la prochaine ronde :")
+        score_label.pack()
+        frame = tk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True)
+        canvas = tk.Canvas(frame, height=300, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        self.score_grid = tk.Frame(canvas)
+        self.score_grid.bind("<Configure>", lambda event: canvas.configure(scrollregion=canvas.bbox(tk.ALL)))
+        canvas.create_window((0, 0), window=self.score_grid, anchor=tk.NW)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Feuille de scores
+        sheet_label = tk.Label(self, text="Ou coller la feuille de la ronde "
+                                          "([table] score1 score2, une ligne par table) :")
+        sheet_label.pack()
+        self.sheet_text = tk.Text(self, width=50, height=5)
+        self.sheet_text.pack()
+        self.sheet_button = tk.Button(self, text="Remplir depuis la feuille", command=self.fill_from_sheet,
+                                      state=tk.DISABLED)
+        self.sheet_button.pack()
+
+        # Envoi
+        self.submit_button = tk.Button(self, text="Envoyer Scores", command=self.submit_scores, state=tk.DISABLED)
+        self.submit_button.pack()
+
+    def __run_pairing(self, snapshot: TournamentSnapshot) -> None:
+        """Calcule les appariements, et transmet le résultat à la fenêtre par la file de messages.
+
+        :param snapshot: Instantané de la compétition.
+        """
+        try:
+            result = pair_snapshot(snapshot)
+        except Exception as error:
+            self.messages.put(("error", error))
+        else:
+            if not self.cancelled.is_set():
+                self.messages.put(("result", *result))
+
+    def __poll_pairing(self) -> None:
+        """Traite les messages de l'appariement depuis la boucle Tk, jusqu'à la réception du résultat.
+        """
+        if self.cancelled.is_set():
+            return
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except Empty:
+                self.after(POLL_INTERVAL, self.__poll_pairing)
+                return
+            if message[0] == "error":
+                self.progressbar.stop()
+                self.progressbar.pack_forget()
+                self.cancel_button.pack_forget()
+                mb.showerror("Erreur", f"L'appariement a échoué : {message[1]}", parent=self)
+                return
+            else:
+                _, pairs, exempted = message
+                self.__show_pairs(pairs, exempted)
+                return
+
+    def __show_pairs(self, pairs: list[tuple[int, int]], exempted: int | None) -> None:
+        """Ajoute la ronde appariée à la compétition, remplit la liste des appariements et autorise l'envoi des scores.
+
+        :param pairs: Couples d'indices des tireurs/équipes dans le registre.
+        :param exempted: Indice du tireur/équipe exempté.e, ou `None`.
+        """
+        self.progressbar.stop()
+        self.progressbar.pack_forget()
+        self.cancel_button.pack_forget()
+
+        # Ronde, ajoutée à la compétition si elle n'a pas changé pendant l'appariement
+        tournament = self.tournament
+        if tournament.snapshot.generation != self.generation:
+            mb.showerror("Erreur", "La compétition a changé pendant l'appariement : relancez la ronde.", parent=self)
+            self.destroy()
+            return
+        registry = tournament.registry
+        self.matches = [Match(tournament.maximum_score, tournament.draws_are_allowed,
+                              participant1=registry[index1], participant2=registry[index2])
+                        for index1, index2 in pairs]
+        self.byes = [] if exempted is None else [Match(tournament.maximum_score, tournament.draws_are_allowed,
+                                                       participant1=registry[exempted])]
+        try:
+            tournament.check_pairing()
+            tournament.add_round(Round(len(tournament.rounds) + 1, tournament.maximum_score,
+                                       tournament.draws_are_allowed, set(tournament.participants),
+                                       matches=self.matches + self.byes))
+        except ValueError as error:
+            mb.showerror("Erreur", f"Impossible d'ajouter la ronde : {error}", parent=self)
+            self.destroy()
+            return
+        self.versions = [match.version for match in self.matches]
+
+        snapshot = tournament.snapshot
+        names = [(participant_name(snapshot.registry[index1]), participant_name(snapshot.registry[index2]))
+                 for index1, index2 in pairs]
+        self.pairings_listbox.delete(0, tk.END)
+        for name1, name2 in names:
+            self.pairings_listbox.insert(tk.END, f"{name1} vs {name2}")
+        if exempted is not None:
+            self.pairings_listbox.insert(tk.END, f"{participant_name(snapshot.registry[exempted])} est exempté")
+
+        # Grille de saisie, une ligne par table
+        for table, (name1, name2) in enumerate(names, 1):
+            entry1 = tk.Entry(self.score_grid, width=5, justify=tk.CENTER)
+            entry2 = tk.Entry(self.score_grid, width=5, justify=tk.CENTER)
+            tk.Label(self.score_grid, text=f"{table}.").grid(row=table, column=0, sticky=tk.E)
+            tk.Label(self.score_grid, text=name1).grid(row=table, column=1, sticky=tk.E)
+            entry1.grid(row=table, column=2)
+            entry2.grid(row=table, column=3)
+            tk.Label(self.score_grid, text=name2).grid(row=table, column=4, sticky=tk.W)
+            self.score_entries.append((entry1, entry2))
+        self.sheet_button.configure(state=tk.NORMAL)
+        self.submit_button.configure(state=tk.NORMAL)
+
+    def cancel_pairing(self) -> None:
+        """Annule l'appariement en cours et ferme la fenêtre.
+        """
+        self.cancelled.set()
+        self.destroy()
 
     def __create_remains(self) -> None:
         score_label = tk.Label(self, text="Entrer les scores pour la prochaine ronde:")
@@ -124,117 +258,57 @@ class RoundProperties(tk.Toplevel):
         submit_button = tk.Button(self, text="Envoyer Scores", command=self.submit_scores)
         submit_button.pack()
 
-    def submit_scores(self):
-        matchs = self.score_entry.get().split()
-        if len(matchs) != len(self.pairings):
-            mb.showerror("Error", "Number of scores entered does not match the number of pairings.")
-            return
-
-        for i, ids in enumerate(self.pairings):
-            wis1, wis2 = matchs[i].split("#")
-            w1, i1, s1 = wis1.split(",")
-            w2, i2, s2 = wis2.split(",")
-            for j, d in enumerate(self.parent.tournament_fencers):
-                a_done, b_done = False, False
-                if d["id"] == ids[0]:
-                    d["wins"] += int(w1)
-                    d["indice"] += int(i1)
-                    d["score"] += int(s1)
-                    d["memory"].add(ids[1])
-                    a_done = True
-                elif d["id"] == ids[1]:
-                    d["wins"] += int(w2)
-                    d["indice"] += int(i2)
-                    d["score"] += int(s2)
-                    d["memory"].add(ids[0])
-                    b_done = True
-                if a_done and b_done:
-                    break
-
-        for ids in self.has_bye:
-            for j, d in enumerate(self.parent.tournament_fencers):
-                if d["id"] == ids:
-                    d["wins"] += 1
-                    break
-
-        self.parent.rounds_id += 1
-        self.score_entry.delete(0, tk.END)
-        mb.showinfo("Success", f"Scores envoyés avec succès pour la ronde n°{self.parent.rounds_id-1}")
-
-        print(self.parent.tournament_fencers)
-        self.destroy()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    def show_score_errors(self, errors: list[str]) -> None:
+        """Affiche toutes les erreurs de saisie des scores dans une seule fenêtre.
 
+        :param errors: Erreurs de saisie.
+        """
+        message = "\n".join(errors[:MAX_SCORE_ERRORS])
+        if len(errors) > MAX_SCORE_ERRORS:
+            message += f"\n… et {len(errors) - MAX_SCORE_ERRORS} autre(s) erreur(s)."
+        mb.showerror("Erreur", message, parent=self)
 
+    def fill_from_sheet(self) -> None:
+        """Remplit la grille de saisie depuis la feuille de scores de la ronde.
+        """
+        scores, errors = parse_sheet(self.sheet_text.get("1.0", tk.END), len(self.score_entries))
+        for table, bout in scores.items():
+            for entry, score in zip(self.score_entries[table - 1], bout):
+                entry.delete(0, tk.END)
+                entry.insert(0, f"{score.status or ''}{score.touches}")
+        if errors:
+            self.show_score_errors(errors)
 
+    def submit_scores(self):
+        """Vérifie toute la grille, puis soumet les résultats à la compétition, match par match.
+        """
+        # Lecture et vérification de toute la grille, avant toute modification de la compétition
+        results: list[tuple[Score, Score]] = []
+        errors: list[str] = []
+        for table, (match, (entry1, entry2)) in enumerate(zip(self.matches, self.score_entries), 1):
+            try:
+                score1, score2 = parse_bout(entry1.get(), entry2.get())
+                if not match.is_validated:
+                    self.tournament.check_result(match, score1, score2)
+                results.append((score1, score2))
+            except ValueError as error:
+                errors.append(f"Table {table} : {error}".rstrip(".") + ".")
+        if errors:
+            self.show_score_errors(errors)
+            return
 
+        # Soumission, par comparaison de la version de chaque match à celle de la grille
+        for table, (match, version, (score1, score2)) in enumerate(zip(self.matches, self.versions, results), 1):
+            try:
+                self.versions[table - 1] = self.tournament.submit_result(match, score1, score2, version=version)
+            except (MatchConflictError, ValueError) as error:
+                errors.append(f"Table {table} : {error}".rstrip(".") + ".")
+        for match in self.byes:
+            if not match.is_validated:
+                self.tournament.validate_match(match)
+        if errors:
+            self.show_score_errors(errors)
+            return
 
+        mb.showinfo("Success", f"Scores envoyés avec succès pour la ronde n°{len(self.tournament.rounds)}")
+        self.destroy()
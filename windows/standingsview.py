@@ -0,0 +1,321 @@
+import tkinter as tk
+from tkinter.ttk import Frame, Scrollbar, Style, Treeview
+
+from competition.fencer import Fencer
+from competition.journal import Event
+from competition.standings import ChangeSet, Ranking, Standing
+from competition.team import Team
+from competition.tournament import Tournament
+
+
+#: Colonnes du classement : identifiant, intitulé et largeur
+COLUMNS: tuple[tuple[str, str, int], ...] = (("rank", "Rang", 70),
+                                             ("name", "Nom", 320),
+                                             ("club", "Club", 200),
+                                             ("victories", "V", 70),
+                                             ("indicator", "Ind.", 80),
+                                             ("touches_scored", "TP", 70),
+                                             ("touches_received", "TR", 70))
+
+#: Hauteur d'une ligne, en pixels
+ROW_HEIGHT: int = 28
+
+
+def standing_values(standing: Standing) -> tuple[int, str, str, str, int, int, int]:
+    """
+    Valeurs d'une ligne du classement.
+
+    :param standing: Ligne du classement.
+    :return: Valeurs des colonnes.
+    """
+    participant = standing.participant
+    if isinstance(participant, Fencer):
+        name: str = f"{participant.lastname} {participant.firstname}"
+        club: str = participant.club or ""
+    else:
+        name: str = participant.name
+        club: str = ""
+    return (standing.rank, name, club, f"{standing.victories:g}", standing.indicator, standing.touches_scored,
+            standing.touches_received)
+
+
+class StandingsView(Frame):
+    """
+    Tableau virtualisé du classement d'une compétition.
+
+    Seules les lignes visibles existent dans le `Treeview` : leurs valeurs sont remplacées au défilement à partir du
+    classement, quel que soit le nombre de participants.
+
+    Le tableau suit le journal de la compétition : les changements de chaque opération sont cumulés jusqu'à un unique
+    rafraîchissement, au repos de la boucle Tk, qui ne replace que les participants modifiés et ne réécrit que les
+    cellules visibles qui ont changé.
+
+    :param master: Widget parent.
+    :param Tournament tournament: Compétition classée.
+    :param str style: Style du tableau.
+    """
+    #: Compétition classée
+    _tournament: Tournament
+    #: Classement affiché
+    _ranking: Ranking
+    #: Indice de la première ligne visible
+    _first: int
+    #: Tireur/Équipe sélectionné.e
+    _selected: Fencer | Team | None
+    #: Parité et valeurs affichées, par ligne du `Treeview`
+    _values: list[tuple[int, tuple] | None]
+    #: Changements en attente de rafraîchissement
+    _pending: ChangeSet | None
+    #: Rafraîchissement programmé
+    _after_id: str | None
+    #: Tableau
+    _tree: Treeview
+    #: Barre de défilement
+    _scrollbar: Scrollbar
+
+    def __init__(self, master: tk.Misc, tournament: Tournament, *,
+                 style: str = "Standings.Treeview") -> None:
+        """
+        Initialise un nouveau tableau.
+        """
+        super().__init__(master)
+
+        # Classement
+        self._tournament = tournament
+        self._ranking = Ranking()
+        self._first = 0
+        self._selected = None
+        self._values = list()
+
+        # Rafraîchissements
+        self._pending = None
+        self._after_id = None
+        tournament.journal.subscribe(self._on_journal)
+
+        # Widgets
+        self._create_table(style)
+
+    @property
+    def tournament(self) -> Tournament:
+        return self._tournament
+
+    @property
+    def ranking(self) -> Ranking:
+        return self._ranking
+
+    @property
+    def first(self) -> int:
+        return self._first
+
+    @property
+    def visible_rows(self) -> int:
+        """
+        Nombre de lignes que la hauteur actuelle du tableau permet d'afficher.
+        """
+        height: int = self._tree.winfo_height()
+        if height <= 1:
+            return int(self._tree.cget("height"))
+        return max(1, height // ROW_HEIGHT - 1)
+
+    @property
+    def selected(self) -> Standing | None:
+        """
+        Ligne sélectionnée du classement.
+        """
+        position: int | None = None if self._selected is None else self._ranking.position(self._selected)
+        if position is None:
+            return None
+        return self._ranking.standing(position)
+
+    def _create_table(self, style: str) -> None:
+        """
+        Crée le tableau et sa barre de défilement.
+        """
+        # Style
+        Style().configure(style, rowheight=ROW_HEIGHT)
+
+        # Tableau
+        self._tree = Treeview(self, columns=tuple(column for column, _, _ in COLUMNS), show="headings",
+                              selectmode="browse", style=style, height=20)
+        for column, heading, width in COLUMNS:
+            self._tree.heading(column, text=heading)
+            self._tree.column(column, width=width, stretch=(column == "name"),
+                              anchor=tk.W if column in ("name", "club") else tk.E)
+        self._tree.tag_configure("1", background="#E8E8E8")
+
+        # Barre de défilement
+        self._scrollbar = Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        # Évènements
+        self._tree.bind("<Configure>", lambda event: self._render())
+        self._tree.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self._tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self._tree.bind("<Button-5>", lambda event: self.scroll(3))
+        self._tree.bind("<Prior>", lambda event: self.scroll(-self.visible_rows) or "break")
+        self._tree.bind("<Next>", lambda event: self.scroll(self.visible_rows) or "break")
+        self._tree.bind("<Home>", lambda event: self.scroll_to(0) or "break")
+        self._tree.bind("<End>", lambda event: self.scroll_to(len(self._ranking)) or "break")
+        self._tree.bind("<Up>", lambda event: self._move_selection(-1) or "break")
+        self._tree.bind("<Down>", lambda event: self._move_selection(1) or "break")
+        self._tree.bind("<<TreeviewSelect>>", lambda event: self._on_select())
+
+        # Positionnements
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def destroy(self) -> None:
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._tournament.journal.unsubscribe(self._on_journal)
+        super().destroy()
+
+    def refresh(self) -> None:
+        """
+        Recalcule entièrement le classement depuis la compétition et met à jour les lignes visibles.
+        """
+        self._ranking.reset(self._tournament.participants)
+        self._render()
+
+    def apply(self, changes: ChangeSet) -> None:
+        """
+        Cumule des changements du classement, appliqués au prochain rafraîchissement.
+
+        :param changes: Changements du classement.
+        """
+        self._pending = changes if self._pending is None else self._pending.merge(changes)
+        if self._after_id is None:
+            self._after_id = self.after_idle(self._flush)
+
+    def _on_journal(self, operation: str, event: Event | tuple[Event, ...] | None) -> None:
+        """
+        Abonnement au journal de la compétition.
+
+        :param operation: Opération du journal.
+        :param event: Événement concerné, s'il existe, ou événements du lot.
+        """
+        self.apply(ChangeSet.from_journal(operation, event))
+
+    def _flush(self) -> None:
+        """
+        Applique les changements cumulés depuis le dernier rafraîchissement.
+        """
+        changes: ChangeSet | None = self._pending
+        self._pending = None
+        self._after_id = None
+        if changes is None:
+            return
+        if changes.is_full:
+            self.refresh()
+            return
+        span: tuple[int, int] | None = self._ranking.update(changes.participants, self._tournament.participants)
+        if span is not None:
+            self._render(span)
+
+    def scroll(self, rows: int) -> None:
+        """
+        Fait défiler le tableau.
+
+        :param rows: Nombre de lignes, négatif vers le haut.
+        """
+        self.scroll_to(self._first + rows)
+
+    def scroll_to(self, first: int) -> None:
+        """
+        Fait défiler le tableau jusqu'à une ligne.
+
+        :param first: Indice de la première ligne visible.
+        """
+        first = max(0, min(first, len(self._ranking) - self.visible_rows))
+        if first != self._first:
+            self._first = first
+            self._render()
+
+    def _render(self, span: tuple[int, int] | None = None) -> None:
+        """
+        Ajuste le nombre de lignes du `Treeview` à la hauteur visible, puis y place les valeurs du classement.
+
+        :param span: Positions ``[début, fin[`` des lignes du classement modifiées, ou `None` pour toutes.
+        """
+        tree: Treeview = self._tree
+        size: int = len(self._ranking)
+        visible: int = self.visible_rows
+        first: int = max(0, min(self._first, size - visible))
+        count: int = min(visible, size - first)
+        if (first != self._first) or (span is None):
+            span = (first, first + count)
+        self._first = first
+
+        # Lignes du `Treeview`
+        if len(self._values) > count:
+            tree.delete(*(str(i) for i in range(count, len(self._values))))
+            del self._values[count:]
+        for i in range(len(self._values), count):
+            tree.insert("", tk.END, iid=str(i), tags=(str((first + i) % 2),))
+            self._values.append(None)
+
+        # Cellules modifiées des lignes visibles
+        for row in range(max(span[0], first), min(span[1], first + count)):
+            i: int = row - first
+            values: tuple = standing_values(self._ranking.standing(row))
+            displayed: tuple[int, tuple] | None = self._values[i]
+            if displayed is None:
+                tree.item(str(i), values=values, tags=(str(row % 2),))
+            else:
+                for (column, _, _), old, new in zip(COLUMNS, displayed[1], values):
+                    if old != new:
+                        tree.set(str(i), column, new)
+                if displayed[0] != row % 2:
+                    tree.item(str(i), tags=(str(row % 2),))
+            self._values[i] = (row % 2, values)
+
+        # Sélection, qui suit le tireur/équipe sélectionné.e
+        position: int | None = None if self._selected is None else self._ranking.position(self._selected)
+        selection: tuple[str, ...] = ()
+        if (position is not None) and (first <= position < first + count):
+            selection = (str(position - first),)
+        if tree.selection() != selection:
+            tree.selection_set(selection)
+
+        # Barre de défilement
+        if size:
+            self._scrollbar.set(first / size, (first + count) / size)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action: str, value: str, unit: str | None = None) -> None:
+        """
+        Commande de la barre de défilement.
+
+        :param action: ``'moveto'`` ou ``'scroll'``.
+        :param value: Fraction du classement, ou nombre d'unités.
+        :param unit: ``'units'`` ou ``'pages'``, pour ``'scroll'``.
+        """
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self._ranking)))
+        elif action == "scroll":
+            self.scroll(int(value) * (self.visible_rows if unit == "pages" else 1))
+
+    def _on_select(self) -> None:
+        """
+        Mémorise la ligne sélectionnée dans le classement, indépendamment des lignes du `Treeview`.
+        """
+        selection: tuple[str, ...] = self._tree.selection()
+        if selection and (self._first + int(selection[0]) < len(self._ranking)):
+            self._selected = self._ranking.standing(self._first + int(selection[0])).participant
+
+    def _move_selection(self, rows: int) -> None:
+        """
+        Déplace la sélection, en faisant défiler le tableau si nécessaire.
+
+        :param rows: Nombre de lignes, négatif vers le haut.
+        """
+        if not len(self._ranking):
+            return
+        position: int | None = None if self._selected is None else self._ranking.position(self._selected)
+        selected: int = max(0, min((self._first if position is None else position) + rows, len(self._ranking) - 1))
+        self._selected = self._ranking.standing(selected).participant
+        if selected < self._first:
+            self.scroll_to(selected)
+        elif selected >= self._first + self.visible_rows:
+            self.scroll_to(selected - self.visible_rows + 1)
+        self._render()
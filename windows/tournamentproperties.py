@@ -6,49 +6,16 @@ from tkinter.ttk import Style, Label, Button, Radiobutton, Checkbutton, Entry, C
 from tkinter import Button as TkButton
 
 from random import randbytes
-from PIL import Image, ImageDraw, ImageFont
-from PIL.ImageTk import PhotoImage
 
 from competition.tournament import Tournament
 
+from windows.rendering import banner_photo, get_color_font
+
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from main import App
-
-
-def get_color_font(color_background: str | tuple[int, int, int]) -> str:
-    """
-    Obtient la couleur hexadécimale de police appropriée, par rapport à la couleur de fond.
+    from PIL.ImageTk import PhotoImage
 
-    :param color_background: Couleur de fond.
-    :return: Couleur de police
-    """
-    # RGB de fond
-    colors: tuple[int, int, int]
-    if isinstance(color_background, str):
-        colors = (int(color_background[1:3], 16), int(color_background[3:5], 16), int(color_background[5:], 16))
-    else:
-        colors = color_background
-
-    # Luminosité de fond
-    lightness: float = 0
-    lightness_factors: tuple[float, float, float] = (0.2126, 0.7152, 0.0722)
-    for i, color in enumerate(colors):
-        color /= 255
-        if color <= 0.04045:
-            color /= 12.92
-        else:
-            color = ((color + 0.055) / 1.055) ** 2.4
-        lightness += lightness_factors[i] * color
-
-    # Police
-    color_font: str
-    if lightness > 0.179:
-        color_font = "#000000"
-    else:
-        color_font = "#ffffff"
-
-    return color_font
+    from main import App
 
 
 class TournamentProperties(tk.Toplevel):
@@ -278,12 +245,8 @@ class TournamentProperties(tk.Toplevel):
                 # Compétition
                 tournament: Tournament = Tournament(**kargs)
 
-                # Étiquette
-                im: Image = Image.new("RGB", (180, 40), self._color_background)
-                draw: ImageDraw = ImageDraw.Draw(im)
-                draw.text((90, 20), tournament.name,
-                          anchor="mm", fill=self._color_font, font=ImageFont.truetype("arial", 20))
-                tag: PhotoImage = PhotoImage(im)
+                # Étiquette, dessinée une seule fois pour un même nom et mêmes couleurs
+                tag: "PhotoImage" = banner_photo(self, tournament.name, self._color_background, self._color_font)
 
                 # Ajout
                 self._parent.add_tournament(tournament, tag)